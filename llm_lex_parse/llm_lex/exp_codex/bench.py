@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmarks for the exp_codex lexer.
+
+``parallel`` generates sources of the requested sizes, checks that
+``tokenize_parallel`` reproduces ``tokenize`` exactly, and prints the time
+for each worker count as tab-separated rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import random
+import sys
+import time
+from typing import Callable, Iterable, Sequence
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+import lexer  # noqa: E402
+
+_LINES = (
+    "int {a} = {n};",
+    "float {b} = {n}.{n}e+{n};",
+    "while ({a} < {n}) {{ {a} = {a} + {b}; }}",
+    "if ({a} >= {b} && {a} != {n}) return {a}->{b};",
+    "/* {a} /* nested {b} */ still a comment */",
+    "for ({a} = 0; {a} <= {n}; {a}++) {b}[{a}] = {a} .. {n};",
+    "struct {a} {{ char {b}; }};",
+    "{a} = NULL; break; continue;",
+)
+
+
+def generate_source(size: int, seed: int = 0) -> str:
+    """Return roughly ``size`` characters of lexically valid subC."""
+    rng = random.Random(seed)
+    names = [f"v{index}" for index in range(2000)]
+    block = "\n".join(
+        rng.choice(_LINES).format(a=rng.choice(names), b=rng.choice(names), n=rng.randrange(1000))
+        for _ in range(4000)
+    ) + "\n"
+    return block * max(1, size // len(block))
+
+
+def _consume(tokens: Iterable[object]) -> int:
+    count = 0
+    for _ in tokens:
+        count += 1
+    return count
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_parallel(args: argparse.Namespace) -> None:
+    print(f"cpu_count\t{os.cpu_count()}")
+    for megabytes in args.sizes:
+        source = generate_source(megabytes * 1_000_000)
+        check = generate_source(1_000_000, seed=1)
+        assert list(lexer.tokenize_parallel(check, 3, chunk_size=100_000)) == list(
+            lexer.tokenize(check)
+        ), "parallel tokens differ"
+
+        scan_time = _best_of(args.repeat, lambda: lexer.split_points(source, 64))
+        sequential = _best_of(args.repeat, lambda: _consume(lexer.tokenize(source)))
+        print(f"{megabytes}MB\tscan_s={scan_time:.3f}\tsequential_s={sequential:.2f}"
+              f"\t{len(source) / sequential / 1e6:.2f} MB/s")
+        for workers in args.workers:
+            seconds = _best_of(
+                args.repeat, lambda: _consume(lexer.tokenize_parallel(source, workers))
+            )
+            print(f"{megabytes}MB\tworkers={workers}\tparallel_s={seconds:.2f}"
+                  f"\tspeedup={sequential / seconds:.2f}x")
+
+
+SUBCOMMANDS = {
+    "parallel": bench_parallel,
+}
+
+
+def main(argv: Sequence[str]) -> int:
+    arg_parser = argparse.ArgumentParser(prog=argv[0], description=__doc__.splitlines()[0])
+    arg_parser.add_argument("benchmark", choices=sorted(SUBCOMMANDS))
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50], metavar="MB")
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    arg_parser.add_argument("--repeat", type=int, default=1)
+    args: argparse.Namespace = arg_parser.parse_args(argv[1:])
+    SUBCOMMANDS[args.benchmark](args)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
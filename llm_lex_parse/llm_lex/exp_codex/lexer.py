@@ -3,8 +3,15 @@
 
 from __future__ import annotations
 
+import argparse
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+import re
 import sys
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Deque, Dict, Iterable, Iterator, List, Sequence, Tuple
 
 
 KEYWORDS = {
@@ -68,11 +75,17 @@ def is_digit(char: str) -> bool:
 
 
 def tokenize(source: str) -> Iterable[Tuple[str, ...]]:
-    position = 0
-    length = len(source)
-    keyword_counts: Dict[str, int] = {}
-    identifier_counts: Dict[str, int] = {}
+    return _tokenize(source, 0, len(source), {}, {})
+
 
+def _tokenize(
+    source: str,
+    position: int,
+    length: int,
+    keyword_counts: Dict[str, int],
+    identifier_counts: Dict[str, int],
+) -> Iterator[Tuple[str, ...]]:
+    """Lex ``source[position:length]``, updating the running counts in place."""
     while position < length:
         char = source[position]
 
@@ -178,6 +191,132 @@ def tokenize(source: str) -> Iterable[Tuple[str, ...]]:
         position += 1
 
 
+# Parallel lexing ----------------------------------------------------------
+#
+# Reference counts make every token depend on all earlier ones, but only
+# through the per-lexeme totals.  The source is cut at whitespace outside
+# comments, where the sequential lexer is always between tokens; workers lex
+# the chunks with counts starting from zero, and the counts are corrected in
+# chunk order by adding the totals of all earlier chunks.
+
+_WHITESPACE = re.compile(r"[ \t\r\n]")
+_COMMENT_DELIMITER = re.compile(r"/\*|\*/")
+
+_chunk_source = ""
+
+
+def comment_spans(source: str) -> List[Tuple[int, int]]:
+    """Return ``(start, end)`` of every top-level comment, nesting included.
+
+    Outside a comment the lexer treats every ``/*`` as a comment opener (no
+    token contains one), and inside it scans for the leftmost ``/*`` or
+    ``*/`` just as the delimiter regex does.  An unterminated comment runs to
+    the end of the source.
+    """
+    spans: List[Tuple[int, int]] = []
+    start = source.find("/*")
+    while start != -1:
+        depth = 1
+        end = len(source)
+        for match in _COMMENT_DELIMITER.finditer(source, start + 2):
+            depth += 1 if match.group() == "/*" else -1
+            if depth == 0:
+                end = match.end()
+                break
+        spans.append((start, end))
+        start = source.find("/*", end)
+    return spans
+
+
+def split_points(source: str, pieces: int) -> List[int]:
+    """Return up to ``pieces - 1`` increasing offsets where lexing may restart.
+
+    Each offset is a whitespace character outside any comment, at or after
+    an even division of the source.
+    """
+    spans = comment_spans(source)
+    starts = [start for start, _ in spans]
+    length = len(source)
+    points: List[int] = []
+    for piece in range(1, pieces):
+        position = max(length * piece // pieces, points[-1] + 1 if points else 1)
+        while True:
+            match = _WHITESPACE.search(source, position)
+            if match is None:
+                return points
+            position = match.start()
+            index = bisect_right(starts, position) - 1
+            if index < 0 or spans[index][1] <= position:
+                break
+            position = spans[index][1]
+        points.append(position)
+    return points
+
+
+def _lex_chunk(bounds: Tuple[int, int]) -> Tuple[List[Tuple[str, ...]], Dict[str, int]]:
+    """Lex a chunk of the inherited source with chunk-local counts.
+
+    Returns the tokens and the chunk's count per lexeme (keywords and
+    identifiers never share a lexeme, so one table holds both).
+    """
+    keyword_counts: Dict[str, int] = {}
+    identifier_counts: Dict[str, int] = {}
+    tokens = list(_tokenize(_chunk_source, bounds[0], bounds[1], keyword_counts, identifier_counts))
+    identifier_counts.update(keyword_counts)
+    return tokens, identifier_counts
+
+
+def _fix_counts(
+    tokens: List[Tuple[str, ...]], offsets: Dict[str, int]
+) -> Iterator[Tuple[str, ...]]:
+    get = offsets.get
+    for token in tokens:
+        if len(token) == 3:
+            offset = get(token[1])
+            if offset:
+                token = (token[0], token[1], str(int(token[2]) + offset))
+        yield token
+
+
+def tokenize_parallel(
+    source: str, workers: int = 2, chunk_size: int = 1 << 22
+) -> Iterator[Tuple[str, ...]]:
+    """Yield exactly the tokens of :func:`tokenize`, lexing chunks in worker processes.
+
+    Chunks are about ``chunk_size`` characters and are consumed in order, with
+    at most two per worker in flight, so memory stays bounded on very large
+    sources.  Needs the ``fork`` start method; elsewhere, and with
+    ``workers <= 1``, it falls back to :func:`tokenize`.
+    """
+    global _chunk_source
+
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        yield from tokenize(source)
+        return
+
+    pieces = max(workers, -(-len(source) // chunk_size))
+    bounds = [0, *split_points(source, pieces), len(source)]
+    offsets: Dict[str, int] = {}
+    _chunk_source = source
+    try:
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(workers, mp_context=context) as executor:
+            chunks = iter(zip(bounds, bounds[1:]))
+            pending: Deque[Future] = deque(
+                executor.submit(_lex_chunk, chunk) for chunk in islice(chunks, 2 * workers)
+            )
+            while pending:
+                tokens, counts = pending.popleft().result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(executor.submit(_lex_chunk, chunk))
+                yield from _fix_counts(tokens, offsets)
+                for lexeme, count in counts.items():
+                    offsets[lexeme] = offsets.get(lexeme, 0) + count
+    finally:
+        _chunk_source = ""
+
+
 def emit(tokens: Iterable[Tuple[str, ...]]) -> None:
     for token in tokens:
         if token[0] in {"KEY", "ID"}:
@@ -187,18 +326,26 @@ def emit(tokens: Iterable[Tuple[str, ...]]) -> None:
 
 
 def main(argv: Sequence[str]) -> int:
-    if len(argv) != 2:
-        print(f"Usage: {argv[0]} <source-file>", file=sys.stderr)
-        return 1
+    arg_parser = argparse.ArgumentParser(prog=argv[0], description="subC lexer.")
+    arg_parser.add_argument("source", help="subC source file")
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="lex chunks of the source in N worker processes",
+    )
+    args = arg_parser.parse_args(argv[1:])
 
     try:
-        with open(argv[1], "r", encoding="utf-8") as handle:
+        with open(args.source, "r", encoding="utf-8") as handle:
             source = handle.read()
     except OSError as exc:
         print(f"Could not read input file: {exc}", file=sys.stderr)
         return 1
 
-    emit(tokenize(source))
+    emit(tokenize_parallel(source, args.jobs) if args.jobs > 1 else tokenize(source))
     return 0
 
 
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""Benchmarks for the exp_claude parser.
+
+Each subcommand builds a synthetic subC program (or reads a source file),
+times one parser mode against another, and prints a tab-separated report.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import pathlib
+import random
+import sys
+import time
+from typing import Callable, List, Sequence, Tuple
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+from lexer import tokenize  # noqa: E402
+from parser import Grammar, LRParser  # noqa: E402
+
+
+_EXPRESSIONS = (
+    "a + b * c",
+    "(x - 1) * (y + 2) / 3",
+    "p->next->value % 7",
+    "!done && count < limit",
+    "f(a, b, c) + g()",
+    "-*ptr + &value[2]",
+    "i++ + --j",
+    "'c' != name[0]",
+    "NULL == node",
+)
+
+_STATEMENTS = (
+    "x = {e};",
+    "if ({e}) x = 1; else y = 2;",
+    "while ({e}) {{ i = i + 1; }}",
+    "for (i = 0; i < n; i++) {{ total = total + ({e}); }}",
+    "return {e};",
+    "{{ int t; t = {e}; }}",
+    "if ({e}) {{ break; }}",
+    ";",
+)
+
+
+def generate_program(functions: int, statements: int, seed: int = 0) -> str:
+    """Return a subC program the recursive-descent parser accepts."""
+    rng = random.Random(seed)
+    parts: List[str] = ["struct node { int value; struct node *next; };", "int table[64];"]
+    for index in range(functions):
+        body = [
+            "    " + rng.choice(_STATEMENTS).format(e=rng.choice(_EXPRESSIONS))
+            for _ in range(statements)
+        ]
+        parts.append(
+            f"int f{index}(int a, int b, char *name) {{\n"
+            "    int x; int y; int i;\n" + "\n".join(body) + "\n    return x;\n}"
+        )
+    return "\n\n".join(parts) + "\n"
+
+
+def nested_expression_program(depth: int, statements: int) -> str:
+    """Return a function whose statements nest parentheses ``depth`` deep."""
+    expression = "a"
+    for level in range(depth):
+        expression = f"({expression} + {level} * b)"
+    body = "\n".join(f"    x = {expression};" for _ in range(statements))
+    return f"int f(int a, int b) {{\n    int x;\n{body}\n    return x;\n}}\n"
+
+
+def expression_program(statements: int, width: int) -> str:
+    """Return a function of assignments whose right-hand sides use every binary level.
+
+    Operators appear loosest-first so the input also suits parser iterations
+    that only climb precedence levels upwards.
+    """
+    operands = ("a", "b[i]", "p->x", "-c", "f(d)", "2", "'c'")
+    operators = ("||", "&&", "==", "!=", "<", "+", "-", "*", "/", "%")
+    rng = random.Random(1)
+    lines = []
+    for _ in range(statements):
+        terms = [rng.choice(operands)]
+        for operator in sorted(rng.choices(operators, k=width), key=operators.index):
+            terms += [operator, rng.choice(operands)]
+        lines.append(f"    x = {' '.join(terms)};")
+    return "int f(int a, int b) {\n    int x;\n" + "\n".join(lines) + "\n    return x;\n}\n"
+
+
+def deep_nesting_programs(depth: int) -> List[Tuple[str, str]]:
+    """Return (name, source) pairs that each nest one construct ``depth`` levels deep."""
+    def function(body: str) -> str:
+        return f"int f(int a) {{\n    int x;\n    {body}\n    return x;\n}}\n"
+
+    else_if = "if (a) x = 1; else " * depth + "x = 0;"
+    return [
+        ("blocks", function("{" * depth + " x = a; " + "}" * depth)),
+        ("else_if", function(else_if)),
+        ("prefix", function("x = " + "!" * depth + "a;")),
+        ("parens", function("x = " + "(" * depth + "a" + ")" * depth + ";")),
+        ("assign", function("x = " * depth + "a;")),
+    ]
+
+
+_STATEMENT_CONSTRUCTS = (
+    ("stmt_empty", ";"),
+    ("stmt_block", "{ }"),
+    ("stmt_return", "return a;"),
+    ("stmt_if_else", "if (a) ; else ;"),
+    ("stmt_while", "while (a) ;"),
+    ("stmt_for", "for (a; a; a) ;"),
+    ("stmt_break", "break;"),
+    ("stmt_continue", "continue;"),
+    ("stmt_expr", "a;"),
+)
+
+_UNARY_CONSTRUCTS = (
+    ("unary_int", "1"),
+    ("unary_char", "'c'"),
+    ("unary_string", '"s"'),
+    ("unary_null", "NULL"),
+    ("unary_id", "a"),
+    ("unary_paren", "(a)"),
+    ("unary_minus", "-a"),
+    ("unary_not", "!a"),
+    ("unary_incop", "++a"),
+    ("unary_address", "&a"),
+    ("unary_deref", "*a"),
+)
+
+
+def construct_programs(statements: int) -> List[Tuple[str, str]]:
+    """Return (name, source) pairs whose bodies repeat one statement or operand form."""
+    def function(statement: str) -> str:
+        body = "\n".join("    " + statement for _ in range(statements))
+        return f"int f(int a) {{\n    int x;\n{body}\n}}\n"
+
+    programs = [(name, function(statement)) for name, statement in _STATEMENT_CONSTRUCTS]
+    programs += [(name, function(f"x = {operand};")) for name, operand in _UNARY_CONSTRUCTS]
+    return programs
+
+
+def _peak_depth(func: Callable[[], object]) -> int:
+    """Return the deepest Python frame stack reached while running ``func``."""
+    depth = peak = 0
+
+    def profile(frame: object, event: str, arg: object) -> None:
+        nonlocal depth, peak
+        if event == "call":
+            depth += 1
+            peak = max(peak, depth)
+        elif event == "return":
+            depth -= 1
+
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    return peak
+
+
+def _count_calls(func: Callable[[], object]) -> int:
+    calls = 0
+
+    def profile(frame: object, event: str, arg: object) -> None:
+        nonlocal calls
+        if event == "call":
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    return calls
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _load_source(args: argparse.Namespace) -> str:
+    if args.source:
+        with open(args.source, "r", encoding="utf-8") as handle:
+            return handle.read()
+    return generate_program(args.functions, args.statements)
+
+
+def _parse_quietly(parser: LRParser, tokens: list, **options: object) -> bool:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parser.parse(tokens, **options)
+
+
+def bench_check(args: argparse.Namespace) -> None:
+    source = _load_source(args)
+    tokens = list(tokenize(source))
+    parser = LRParser(Grammar())
+    assert _parse_quietly(parser, tokens), "benchmark input does not parse"
+
+    full_time = _best_of(args.repeat, lambda: _parse_quietly(parser, tokens))
+    check_time = _best_of(args.repeat, lambda: parser.parse(tokens, check=True))
+    size = len(source.encode("utf-8"))
+
+    print(f"tokens\t{len(tokens)}")
+    print(f"full_s\t{full_time:.4f}\t{size / full_time / 1e6:.2f} MB/s")
+    print(f"check_s\t{check_time:.4f}\t{size / check_time / 1e6:.2f} MB/s")
+    print(f"speedup\t{full_time / check_time:.2f}x")
+
+
+def _capture(parser: LRParser, tokens: list) -> str:
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert parser.parse(tokens), "benchmark input does not parse"
+    return output.getvalue()
+
+
+def bench_engines(args: argparse.Namespace) -> None:
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100 * args.depth + 1000))
+    grammar = Grammar()
+    start = time.perf_counter()
+    table = LRParser(grammar, engine="table")
+    build_time = time.perf_counter() - start
+    descent = LRParser(grammar, engine="descent")
+    print(f"table_build_s\t{build_time:.4f}")
+
+    inputs = [("corpus", _load_source(args))]
+    inputs += [
+        (f"depth_{depth}", nested_expression_program(depth, args.statements))
+        for depth in (args.depth // 4, args.depth // 2, args.depth)
+    ]
+    for name, source in inputs:
+        tokens = list(tokenize(source))
+        assert _capture(descent, tokens) == _capture(table, tokens), f"{name}: logs differ"
+        descent_time = _best_of(args.repeat, lambda: descent.parse(tokens, check=True))
+        table_time = _best_of(args.repeat, lambda: table.parse(tokens, check=True))
+        print(
+            f"{name}\ttokens={len(tokens)}\tdescent_s={descent_time:.4f}"
+            f"\ttable_s={table_time:.4f}\tdescent/table={descent_time / table_time:.2f}"
+        )
+
+
+def bench_expressions(args: argparse.Namespace) -> None:
+    tokens = list(tokenize(expression_program(args.statements * 50, 12)))
+    grammar = Grammar()
+    descent = LRParser(grammar)
+    table = LRParser(grammar, engine="table")
+    assert _capture(descent, tokens) == _capture(table, tokens), "descent disagrees with tables"
+
+    calls = _count_calls(lambda: descent.parse(tokens, check=True))
+    check_time = _best_of(args.repeat, lambda: descent.parse(tokens, check=True))
+    full_time = _best_of(args.repeat, lambda: _parse_quietly(descent, tokens))
+    print(f"tokens\t{len(tokens)}")
+    print(f"python_calls\t{calls}\t({calls / len(tokens):.2f} per token)")
+    print(f"check_s\t{check_time:.4f}")
+    print(f"full_s\t{full_time:.4f}")
+
+
+def bench_iterative(args: argparse.Namespace) -> None:
+    grammar = Grammar()
+    descent = LRParser(grammar)
+    iterative = LRParser(grammar, engine="iterative")
+
+    tokens = list(tokenize(_load_source(args)))
+    assert _capture(descent, tokens) == _capture(iterative, tokens), "corpus: logs differ"
+    descent_time = _best_of(args.repeat, lambda: descent.parse(tokens, check=True))
+    iterative_time = _best_of(args.repeat, lambda: iterative.parse(tokens, check=True))
+    print(
+        f"corpus\ttokens={len(tokens)}\tdescent_s={descent_time:.4f}"
+        f"\titerative_s={iterative_time:.4f}\titerative/descent={iterative_time / descent_time:.2f}"
+    )
+
+    # Peak frame depth and reduction identity at a depth descent survives.
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 20 * args.depth + 1000))
+    try:
+        for name, source in deep_nesting_programs(args.depth):
+            tokens = list(tokenize(source))
+            assert _capture(descent, tokens) == _capture(iterative, tokens), f"{name}: logs differ"
+            descent_frames = _peak_depth(lambda: descent.parse(tokens, check=True))
+            iterative_frames = _peak_depth(lambda: iterative.parse(tokens, check=True))
+            print(
+                f"{name}_{args.depth}\tdescent_frames={descent_frames}"
+                f"\titerative_frames={iterative_frames}"
+            )
+    finally:
+        sys.setrecursionlimit(limit)
+
+    # Full depth at the default recursion limit.
+    for name, source in deep_nesting_programs(args.nesting):
+        tokens = list(tokenize(source))
+        try:
+            descent.parse(tokens, check=True)
+            descent_result = "ok"
+        except RecursionError:
+            descent_result = "RecursionError"
+        start = time.perf_counter()
+        assert iterative.parse(tokens, check=True), f"{name}: iterative engine rejected input"
+        iterative_time = time.perf_counter() - start
+        print(
+            f"{name}_{args.nesting}\ttokens={len(tokens)}\tdescent={descent_result}"
+            f"\titerative_s={iterative_time:.4f}"
+        )
+
+
+def bench_dispatch(args: argparse.Namespace) -> None:
+    parser = LRParser(Grammar())
+    statements = args.statements * 100
+    for name, source in construct_programs(statements):
+        tokens = list(tokenize(source))
+        assert parser.parse(tokens, check=True), f"{name}: construct does not parse"
+        seconds = _best_of(args.repeat, lambda: parser.parse(tokens, check=True))
+        print(f"{name}\t{seconds / statements * 1e9:.0f} ns/stmt")
+
+    parser.tokens, parser.pos = [], 0
+    seconds = _best_of(args.repeat, lambda: [parser._current() for _ in range(100_000)])
+    print(f"eof_current\t{seconds / 100_000 * 1e9:.0f} ns/call")
+
+
+def bench_threads(args: argparse.Namespace) -> None:
+    """Thread scaling of LRParser.parse_many with one shared parser.
+
+    On a free-threaded build (``python3.13t``) the workers parse in
+    parallel; on a GIL build the interesting number is threads=1 against
+    the plain sequential loop, i.e. what the per-call state costs.
+    """
+    sources = [generate_program(8, args.statements, seed=index) for index in range(64)]
+    size = sum(len(source.encode("utf-8")) for source in sources)
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    grammar = Grammar()
+    print(f"python\t{sys.version.split()[0]}\tgil={'on' if gil_enabled else 'off'}")
+    print(f"sources\t{len(sources)}\t{size / 1e6:.2f} MB")
+
+    for engine in ("descent", "table"):
+        parser = LRParser(grammar, engine=engine)
+        expected = [parser._parse_source(source, True) for source in sources]
+        assert all(result.ok for result in expected), f"{engine}: corpus does not parse"
+        assert list(parser.parse_many(sources, 8, check=True)) == expected, "threads disagree"
+
+        def sequential() -> None:
+            for source in sources:
+                parser.parse(list(tokenize(source)), check=True)
+
+        baseline = _best_of(args.repeat, sequential)
+        print(f"{engine}\tsequential_s={baseline:.4f}\t{size / baseline / 1e6:.2f} MB/s")
+        for threads in (1, 2, 4, 8):
+            seconds = _best_of(
+                args.repeat, lambda: list(parser.parse_many(sources, threads, check=True))
+            )
+            print(
+                f"{engine}\tthreads={threads}\ts={seconds:.4f}\t{size / seconds / 1e6:.2f} MB/s"
+                f"\tspeedup={baseline / seconds:.2f}x"
+            )
+
+    parser = LRParser(grammar)
+    tokens = list(tokenize(sources[0]))
+    seconds = _best_of(args.repeat, lambda: [parser._start(tokens, True, None) for _ in range(10_000)])
+    print(f"per_call_state_us\t{seconds / 10_000 * 1e6:.2f}")
+
+
+def bench_recovery(args: argparse.Namespace) -> None:
+    """Table engine with error recovery versus stopping at the first error."""
+    grammar = Grammar()
+    first_error = LRParser(grammar, engine="table")
+    recovering = LRParser(grammar, engine="table", tables=first_error.tables, max_errors=100)
+    source = _load_source(args)
+    tokens = list(tokenize(source))
+    first_time = _best_of(args.repeat, lambda: first_error.parse(tokens, check=True))
+    recover_time = _best_of(args.repeat, lambda: recovering.parse(tokens, check=True))
+    print(f"valid\ttokens={len(tokens)}")
+    print(f"first_error_s\t{first_time:.4f}")
+    print(f"recovering_s\t{recover_time:.4f}\t{recover_time / first_time - 1:+.1%}")
+
+    statement = "    return x;"
+    lines = source.split("\n")
+    candidates = [number for number, line in enumerate(lines) if line == statement]
+    broken_lines = sorted(random.Random(0).sample(candidates, min(20, len(candidates))))
+    for number in broken_lines:
+        lines[number] = "    return x + ;"
+    broken = list(tokenize("\n".join(lines)))
+    result = recovering._start(broken, True, None)._run()
+    assert result is not None and result.count("\n") + 1 == len(broken_lines), result
+    pass_time = _best_of(args.repeat, lambda: recovering._start(broken, True, None)._run())
+    print(f"broken\terrors={len(broken_lines)}\tone_pass_s={pass_time:.4f}")
+
+
+SUBCOMMANDS = {
+    "check": bench_check,
+    "dispatch": bench_dispatch,
+    "engines": bench_engines,
+    "expressions": bench_expressions,
+    "iterative": bench_iterative,
+    "recovery": bench_recovery,
+    "threads": bench_threads,
+}
+
+
+def main(argv: Sequence[str]) -> int:
+    arg_parser = argparse.ArgumentParser(prog=argv[0], description=__doc__.splitlines()[0])
+    arg_parser.add_argument("benchmark", choices=sorted(SUBCOMMANDS))
+    arg_parser.add_argument("--source", help="benchmark this file instead of a generated program")
+    arg_parser.add_argument("--functions", type=int, default=200)
+    arg_parser.add_argument("--statements", type=int, default=40)
+    arg_parser.add_argument("--depth", type=int, default=200, help="deepest nesting for 'engines'")
+    arg_parser.add_argument(
+        "--nesting", type=int, default=100_000, help="nesting depth for 'iterative'"
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv[1:])
+    SUBCOMMANDS[args.benchmark](args)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
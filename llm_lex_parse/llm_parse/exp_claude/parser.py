@@ -3,8 +3,16 @@
 
 from __future__ import annotations
 
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import io
 import sys
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from functools import partial
+from operator import methodcaller
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set,
+    Tuple,
+)
 from lexer import Token, tokenize
 
 
@@ -111,58 +119,570 @@ class Grammar:
             ("args", ("args", "\',\'", "expr")),
         ]
 
+        self.start_symbol = "program'"
+        self.end_symbol = "$"
+
+        # Terminal precedence from parser_spec.md section 2.2, mapped so that a
+        # larger number binds tighter: (level, associativity).
+        self.precedence: Dict[str, Tuple[int, str]] = {
+            "'('": (10, "left"),
+            "'['": (10, "left"),
+            "'.'": (10, "left"),
+            "STRUCTOP": (10, "left"),
+            "INCOP": (10, "left"),
+            "DECOP": (10, "left"),
+            "'!'": (9, "right"),
+            "'&'": (9, "right"),
+            "'*'": (8, "left"),
+            "'/'": (8, "left"),
+            "'%'": (8, "left"),
+            "'+'": (7, "left"),
+            "'-'": (7, "left"),
+            "RELOP": (6, "left"),
+            "EQUOP": (5, "left"),
+            "LOGICAL_AND": (4, "left"),
+            "LOGICAL_OR": (3, "left"),
+            "'='": (2, "right"),
+            "','": (1, "left"),
+        }
+        # Prefix operators share their token with a binary or postfix form, so
+        # their productions take the prefix level explicitly (yacc's %prec).
+        self.production_precedence: Dict[int, Tuple[int, str]] = {
+            59: (9, "right"),  # unary -> '-' unary
+            60: (9, "right"),  # unary -> '!' unary
+            63: (9, "right"),  # unary -> INCOP unary
+            64: (9, "right"),  # unary -> DECOP unary
+            65: (9, "right"),  # unary -> '&' unary
+            66: (9, "right"),  # unary -> '*' unary
+        }
+
     def get_production(self, index: int) -> Tuple[str, Tuple[str, ...]]:
         """Get production by index."""
         return self.productions[index]
 
-
-class LRParser:
-    """Simple LALR(1) parser for subC."""
-
-    def __init__(self, grammar: Grammar):
+    def nonterminals(self) -> Set[str]:
+        """Symbols that appear on the left-hand side of a production."""
+        return {lhs for lhs, _ in self.productions}
+
+    def terminals(self) -> Set[str]:
+        """Symbols that only appear on right-hand sides, plus the end marker."""
+        nonterminals = self.nonterminals()
+        symbols = {symbol for _, rhs in self.productions for symbol in rhs}
+        return (symbols - nonterminals) | {self.end_symbol}
+
+    def first_sets(self) -> Tuple[Set[str], Dict[str, Set[str]]]:
+        """Return the nullable nonterminals and the FIRST set of every nonterminal."""
+        nonterminals = self.nonterminals()
+        nullable: Set[str] = set()
+        first: Dict[str, Set[str]] = {symbol: set() for symbol in nonterminals}
+        changed = True
+        while changed:
+            changed = False
+            for lhs, rhs in self.productions:
+                before = (lhs in nullable, len(first[lhs]))
+                for symbol in rhs:
+                    if symbol in nonterminals:
+                        first[lhs] |= first[symbol]
+                        if symbol not in nullable:
+                            break
+                    else:
+                        first[lhs].add(symbol)
+                        break
+                else:
+                    nullable.add(lhs)
+                changed |= before != (lhs in nullable, len(first[lhs]))
+        return nullable, first
+
+    def production_prec(self, index: int) -> Optional[Tuple[int, str]]:
+        """Precedence of a production: explicit override, else its last terminal's."""
+        if index in self.production_precedence:
+            return self.production_precedence[index]
+        for symbol in reversed(self.productions[index][1]):
+            if symbol in self.precedence:
+                return self.precedence[symbol]
+        return None
+
+
+class ParserTables:
+    """Grammar-derived lookup tables shared by :class:`LRParser` instances.
+
+    Everything here is built once in the constructor and only read
+    afterwards, so one instance can back any number of parsers and threads.
+    The dispatch tables map token kinds to unbound ``LRParser`` methods,
+    which are called with the parser state of the current parse.  The
+    ACTION/GOTO tables are only built with ``lalr``, as the ``"table"``
+    engine needs them.
+    """
+
+    def __init__(self, grammar: Grammar, lalr: bool = False):
         self.grammar = grammar
+        # Binding powers for the Pratt loop, keyed by token kind:
+        # (precedence level, operator symbol as written in the grammar).
+        self.binary_operators: Dict[str, Tuple[int, str]] = {
+            rhs[1].strip("'"): (grammar.precedence[rhs[1]][0], rhs[1])
+            for lhs, rhs in grammar.productions
+            if lhs == "binary" and len(rhs) == 3
+        }
+        # FIRST sets as token kinds, and one-lookup dispatch on the current
+        # token for the statement and unary alternatives.
+        _, first = grammar.first_sets()
+        self.first_kinds: Dict[str, FrozenSet[str]] = {
+            symbol: frozenset(terminal.strip("'") for terminal in terminals)
+            for symbol, terminals in first.items()
+        }
+        self.stmt_first = self.first_kinds["stmt"]
+        self.stmt_dispatch = self._dispatch_table("stmt", {
+            "expr": LRParser._parse_expr_stmt,
+            "compound_stmt": LRParser._parse_compound_stmt_stmt,
+            "RETURN": LRParser._parse_return_stmt,
+            "';'": LRParser._parse_empty_stmt,
+            "IF": LRParser._parse_if_stmt,
+            "WHILE": LRParser._parse_while_stmt,
+            "FOR": LRParser._parse_for_stmt,
+            "BREAK": LRParser._parse_break_stmt,
+            "CONTINUE": LRParser._parse_continue_stmt,
+        })
+        unary_handlers: Dict[str, Callable[[LRParser], None]] = {
+            "'('": LRParser._parse_paren_unary,
+            "ID": LRParser._parse_id_unary,
+        }
+        for lhs, rhs in grammar.productions:
+            if lhs != "unary" or rhs[0] in unary_handlers or rhs[0] == "unary":
+                continue
+            if len(rhs) == 1:
+                unary_handlers[rhs[0]] = methodcaller("_parse_leaf_unary", rhs[0])
+            else:
+                unary_handlers[rhs[0]] = methodcaller("_parse_prefix_unary", rhs[0])
+        self.unary_dispatch = self._dispatch_table("unary", unary_handlers)
+
         self.action_table: Dict[Tuple[int, str], Tuple[str, Any]] = {}
         self.goto_table: Dict[Tuple[int, str], int] = {}
-        self._build_tables()
+        self.action_rows: Optional[List[Dict[str, Tuple[str, Any]]]] = None
+        self.goto_rows: Optional[List[Dict[str, int]]] = None
+        self.symbol_of_kind: Dict[str, str] = {}
+        self.open_brace_states: FrozenSet[int] = frozenset()
+        if lalr:
+            self._build_tables()
+
+    def _dispatch_table(
+        self, lhs: str, handlers: Dict[str, Callable[[LRParser], None]]
+    ) -> Dict[str, Callable[[LRParser], None]]:
+        """Map every token kind that can start ``lhs`` to the handler of its alternative.
+
+        ``handlers`` is keyed by the first symbol of each alternative;
+        left-recursive alternatives are continued by those handlers and get
+        no entry of their own.
+        """
+        table: Dict[str, Callable[[LRParser], None]] = {}
+        for head, rhs in self.grammar.productions:
+            if head != lhs or not rhs or rhs[0] == lhs:
+                continue
+            handler = handlers[rhs[0]]
+            kinds = self.first_kinds.get(rhs[0], frozenset([rhs[0].strip("'")]))
+            for kind in kinds:
+                if table.setdefault(kind, handler) != handler:
+                    raise ValueError(f"{lhs}: {kind} starts two alternatives")
+        return table
 
     def _build_tables(self):
         """Build ACTION and GOTO tables.
 
-        This is a manually constructed table based on the subC grammar.
-        In a full implementation, this would be generated from LR(1) item sets.
+        The LR(0) collection is built first; LALR(1) lookaheads are then found
+        by spontaneous generation and propagation between kernel items
+        (Dragon book, algorithm 4.63).  Shift/reduce conflicts are settled by
+        :attr:`Grammar.precedence` as yacc would, defaulting to shift when
+        either side has no precedence, which binds ``ELSE`` to the nearest
+        ``IF``.  Reduce/reduce conflicts keep the earlier production.
         """
-        # This is a simplified table construction for the specific input
-        # A full LALR(1) table generator would be much more complex
+        grammar = self.grammar
+        productions = grammar.productions
+        nonterminals = grammar.nonterminals()
+        by_lhs: Dict[str, List[int]] = {}
+        for index, (lhs, _) in enumerate(productions):
+            by_lhs.setdefault(lhs, []).append(index)
+
+        nullable, first = grammar.first_sets()
+
+        def first_of(symbols: Sequence[str], lookahead: str) -> Set[str]:
+            result: Set[str] = set()
+            for symbol in symbols:
+                if symbol not in nonterminals:
+                    result.add(symbol)
+                    return result
+                result |= first[symbol]
+                if symbol not in nullable:
+                    return result
+            result.add(lookahead)
+            return result
+
+        def closure(items: Set[Tuple[int, int, str]]) -> Set[Tuple[int, int, str]]:
+            result = set(items)
+            work = list(items)
+            while work:
+                prod, dot, lookahead = work.pop()
+                rhs = productions[prod][1]
+                if dot >= len(rhs) or rhs[dot] not in nonterminals:
+                    continue
+                for follow in first_of(rhs[dot + 1 :], lookahead):
+                    for target in by_lhs[rhs[dot]]:
+                        item = (target, 0, follow)
+                        if item not in result:
+                            result.add(item)
+                            work.append(item)
+            return result
+
+        def lr0_closure(kernel: FrozenSet[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+            return {(prod, dot) for prod, dot, _ in closure({(p, d, "") for p, d in kernel})}
+
+        # LR(0) collection, identified by kernel.
+        start: FrozenSet[Tuple[int, int]] = frozenset({(0, 0)})
+        kernels: List[FrozenSet[Tuple[int, int]]] = [start]
+        state_of: Dict[FrozenSet[Tuple[int, int]], int] = {start: 0}
+        transitions: List[Dict[str, int]] = []
+        for kernel in kernels:
+            moves: Dict[str, Set[Tuple[int, int]]] = {}
+            for prod, dot in lr0_closure(kernel):
+                rhs = productions[prod][1]
+                if dot < len(rhs):
+                    moves.setdefault(rhs[dot], set()).add((prod, dot + 1))
+            row: Dict[str, int] = {}
+            for symbol, moved in moves.items():
+                target = frozenset(moved)
+                if target not in state_of:
+                    state_of[target] = len(kernels)
+                    kernels.append(target)
+                row[symbol] = state_of[target]
+            transitions.append(row)
+
+        # LALR(1) lookaheads for kernel items.
+        probe = "#"
+        lookaheads: Dict[Tuple[int, Tuple[int, int]], Set[str]] = {
+            (state, item): set() for state, kernel in enumerate(kernels) for item in kernel
+        }
+        lookaheads[(0, (0, 0))].add(grammar.end_symbol)
+        propagates: Dict[Tuple[int, Tuple[int, int]], List[Tuple[int, Tuple[int, int]]]] = {}
+        for state, kernel in enumerate(kernels):
+            for item in kernel:
+                targets = propagates.setdefault((state, item), [])
+                for prod, dot, lookahead in closure({(item[0], item[1], probe)}):
+                    rhs = productions[prod][1]
+                    if dot >= len(rhs):
+                        continue
+                    moved = (transitions[state][rhs[dot]], (prod, dot + 1))
+                    if lookahead == probe:
+                        targets.append(moved)
+                    else:
+                        lookaheads[moved].add(lookahead)
+        changed = True
+        while changed:
+            changed = False
+            for source, targets in propagates.items():
+                source_lookaheads = lookaheads[source]
+                for target in targets:
+                    before = len(lookaheads[target])
+                    lookaheads[target] |= source_lookaheads
+                    changed |= len(lookaheads[target]) != before
+
+        # The grammar quotes punctuation terminals ("';'") while the lexer's
+        # token kinds are bare (";").
+        self.symbol_of_kind = {
+            symbol[1:-1]: symbol for symbol in grammar.terminals() if symbol.startswith("'")
+        }
+
+        # ACTION and GOTO.
+        for state, kernel in enumerate(kernels):
+            items = closure(
+                {
+                    (prod, dot, lookahead)
+                    for prod, dot in kernel
+                    for lookahead in lookaheads[(state, (prod, dot))]
+                }
+            )
+            for symbol, target in transitions[state].items():
+                if symbol in nonterminals:
+                    self.goto_table[(state, symbol)] = target
+                else:
+                    self._set_action(state, symbol, ("shift", target))
+            for prod, dot, lookahead in items:
+                if dot < len(productions[prod][1]):
+                    continue
+                if prod == 0:
+                    self._set_action(state, lookahead, ("accept", None))
+                else:
+                    self._set_action(state, lookahead, ("reduce", prod))
+
+        # Per-state rows for the driver loop, so a step is one dict lookup
+        # without building a (state, symbol) key.
+        self.action_rows = [{} for _ in kernels]
+        self.goto_rows = [{} for _ in kernels]
+        for (state, symbol), entry in self.action_table.items():
+            self.action_rows[state][symbol] = entry
+        for (state, symbol), target in self.goto_table.items():
+            self.goto_rows[state][symbol] = target
+        # States entered by shifting '{'; error recovery reopens blocks there.
+        self.open_brace_states = frozenset(
+            targets["'{'"] for targets in transitions if "'{'" in targets
+        )
+
+    def _set_action(self, state: int, symbol: str, entry: Tuple[str, Any]):
+        """Record an ACTION entry, resolving conflicts with precedence."""
+        key = (state, symbol)
+        existing = self.action_table.get(key)
+        if existing is None or existing == entry:
+            self.action_table[key] = entry
+            return
+        if existing[0] == "reduce" and entry[0] == "reduce":
+            self.action_table[key] = min(existing, entry, key=lambda action: action[1])
+            return
+        shift = existing if existing[0] == "shift" else entry
+        reduce = entry if shift is existing else existing
+        token_prec = self.grammar.precedence.get(symbol)
+        production_prec = self.grammar.production_prec(reduce[1])
+        if token_prec is None or production_prec is None:
+            self.action_table[key] = shift
+        elif token_prec[0] != production_prec[0]:
+            self.action_table[key] = shift if token_prec[0] > production_prec[0] else reduce
+        else:
+            self.action_table[key] = shift if token_prec[1] == "right" else reduce
+
+
+class ParseResult(NamedTuple):
+    """Outcome of one input to :meth:`LRParser.parse_many`."""
+
+    ok: bool
+    log: str
+    error: Optional[str]
 
-        # For now, we'll implement a recursive descent parser that emits
-        # the correct reduction sequence instead of a full table-driven parser
-        pass
 
-    def parse(self, tokens: List[Token]) -> bool:
-        """Parse the token stream and emit reductions."""
-        self.tokens = tokens
+class LRParser:
+    """LALR(1) parser for subC.
+
+    Three engines produce the same reduction log: ``"descent"`` walks the
+    grammar with hand-written recursive descent, ``"iterative"`` runs
+    generator twins of the recursive productions on an explicit continuation
+    stack so nesting depth is bounded by memory rather than the recursion
+    limit, and ``"table"`` drives ACTION/GOTO tables generated from
+    :class:`Grammar` by :meth:`ParserTables._build_tables`.
+
+    A parser never changes after construction: each call runs on a copy
+    that carries the tokens, position and output of that call (see
+    :meth:`_start`), and the grammar tables are shared read-only through
+    :class:`ParserTables`.  One instance can therefore serve several threads
+    at once, which :meth:`parse_many` does on a thread pool.
+
+    With ``max_errors`` above 1 the table engine recovers from syntax errors
+    (see :meth:`_recover`) and reports up to that many, one per line of the
+    error message.
+    """
+
+    ENGINES = ("descent", "iterative", "table")
+    # Tokens that continue a unary after an ID (see _parse_postfix).
+    _POSTFIX_KINDS = ("[", ".", "STRUCTOP", "(", "INCOP", "DECOP")
+    _EOF = Token("$", "$", 0, 0)
+    # Error recovery: synchronising token kinds, the nonterminals assumed to
+    # end at them, and the shifts after a recovery during which further
+    # errors (usually knock-on effects) are not reported.
+    _SYNC_KINDS = (";", "}")
+    _RECOVERY_SYMBOLS = ("stmt", "def", "ext_def")
+    _ERROR_QUIET_SHIFTS = 3
+
+    def __init__(
+        self,
+        grammar: Grammar,
+        engine: str = "descent",
+        tables: Optional[ParserTables] = None,
+        max_errors: int = 1,
+    ):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown parser engine {engine!r}")
+        if max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        if max_errors > 1 and engine != "table":
+            raise ValueError("Error recovery needs the table engine")
+        if tables is None:
+            tables = ParserTables(grammar, lalr=engine == "table")
+        elif engine == "table" and tables.action_rows is None:
+            raise ValueError("The table engine needs ParserTables built with lalr=True")
+        self._bind(grammar, engine, tables, max_errors)
+
+    def _bind(self, grammar: Grammar, engine: str, tables: ParserTables, max_errors: int):
+        # Every instance sets the same attributes in the same order, so the
+        # per-call copies from _start keep CPython's shared-key instance
+        # dicts and their fast attribute access (copy.copy does not).
+        self.grammar = grammar
+        self.engine = engine
+        self.tables = tables
+        self.max_errors = max_errors
+        # Shared, read-only views of ``tables`` used by the engines.
+        self.binary_operators = tables.binary_operators
+        self._stmt_first = tables.stmt_first
+        self._stmt_dispatch = tables.stmt_dispatch
+        self._unary_dispatch = tables.unary_dispatch
+        self.action_table = tables.action_table
+        self.goto_table = tables.goto_table
+        self._action_rows = tables.action_rows
+        self._goto_rows = tables.goto_rows
+        self._symbol_of_kind = tables.symbol_of_kind
+        # Per-call state; only ever set on the copies made by _start.
+        self.tokens: List[Token] = []
         self.pos = 0
-        self.current_token = self.tokens[0] if self.tokens else None
+        self.check_only = False
+        self._write: Callable[[str], object] = sys.stdout.write
+
+    def parse(
+        self, tokens: List[Token], check: bool = False, write: Optional[Callable[[str], object]] = None
+    ) -> bool:
+        """Parse the token stream and emit reductions.
+
+        Reductions go to ``write`` (default: ``sys.stdout.write``).  With
+        ``check`` set the input is only validated: no reductions are
+        formatted or printed, and only a syntax error reaches stderr.
+        """
+        error = self._start(tokens, check, write)._run()
+        if error is not None:
+            print(error, file=sys.stderr)
+            return False
+        return True
+
+    def parse_many(
+        self, sources: Iterable[str], workers: int = 4, check: bool = False
+    ) -> Iterator[ParseResult]:
+        """Tokenize and parse each source on a pool of ``workers`` threads.
 
+        Results come back in the order of ``sources``; syntax errors are
+        returned in :attr:`ParseResult.error` instead of printed.  On a
+        free-threaded build the parses run in parallel; with the GIL they
+        interleave.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(partial(self._parse_source, check=check), sources)
+
+    def _parse_source(self, source: str, check: bool) -> ParseResult:
+        log = io.StringIO()
+        error = self._start(list(tokenize(source)), check, log.write)._run()
+        return ParseResult(error is None, log.getvalue(), error)
+
+    def _start(
+        self, tokens: List[Token], check: bool, write: Optional[Callable[[str], object]]
+    ) -> LRParser:
+        """Return a copy of this parser holding the state of one call."""
+        run = object.__new__(type(self))
+        run._bind(self.grammar, self.engine, self.tables, self.max_errors)
+        run.tokens = tokens
+        run.pos = 0
+        run.check_only = check
+        run._write = sys.stdout.write if write is None else write
+        return run
+
+    def _run(self) -> Optional[str]:
+        """Run the selected engine; return the syntax error message, if any."""
         try:
-            self._parse_program()
-            return True
+            if self.engine == "table":
+                self._parse_table()
+            elif self.engine == "iterative":
+                self._run_iterative(self._iter_program())
+            else:
+                self._parse_program()
+            return None
         except SyntaxError as e:
-            print(str(e), file=sys.stderr)
-            return False
+            return str(e)
+
+    def _parse_table(self):
+        """Drive the generated ACTION/GOTO tables over ``self.tokens``."""
+        action_rows = self._action_rows
+        goto_rows = self._goto_rows
+        productions = self.grammar.productions
+        symbol_of_kind = self._symbol_of_kind
+        stack = [0]
+        errors: List[str] = []
+        quiet = 0
+        resumed = -1
+        while True:
+            token = self._current()
+            symbol = symbol_of_kind.get(token.kind, token.kind)
+            entry = action_rows[stack[-1]].get(symbol)
+            if entry is None:
+                if not quiet:
+                    action_table = self.action_table
+                    expected = sorted(
+                        terminal for (state, terminal) in action_table if state == stack[-1]
+                    )
+                    errors.append(
+                        f"SyntaxError: expected {', '.join(expected)} before {token.lexeme} "
+                        f"at line {token.line}, column {token.column}"
+                    )
+                if len(errors) >= self.max_errors or token.kind == self._EOF.kind:
+                    raise SyntaxError("\n".join(errors))
+                resumed = self._recover(stack, resumed)
+                quiet = self._ERROR_QUIET_SHIFTS
+                continue
+            action, value = entry
+            if action == "shift":
+                stack.append(value)
+                self.pos += 1
+                if quiet:
+                    quiet -= 1
+            elif action == "reduce":
+                lhs, rhs = productions[value]
+                self._emit(lhs, *rhs)
+                if rhs:
+                    del stack[-len(rhs):]
+                stack.append(goto_rows[stack[-1]][lhs])
+            elif errors:
+                raise SyntaxError("\n".join(errors))
+            else:
+                return
+
+    def _recover(self, stack: List[int], resumed: int) -> int:
+        """Resynchronise the table engine after a syntax error; return the new position.
+
+        Input is skipped up to the next ``;`` or ``}``.  A ``}`` closes the
+        innermost open ``{``: the stack is popped back to the state after
+        that brace and parsing resumes at the ``}``, which is always valid
+        there.  Otherwise the token is consumed and the stack popped to the
+        nearest state with a GOTO on one of ``_RECOVERY_SYMBOLS`` whose
+        target accepts the next token; parsing continues as if that
+        nonterminal had just been reduced.  The position returned is always
+        beyond ``resumed``, the previous recovery's, so the parse terminates.
+        """
+        action_rows = self._action_rows
+        goto_rows = self._goto_rows
+        while True:
+            kind = self._current().kind
+            if kind == self._EOF.kind:
+                return self.pos
+            if kind not in self._SYNC_KINDS:
+                self.pos += 1
+                continue
+            if kind == "}" and self.pos > resumed:
+                for depth in range(len(stack) - 1, 0, -1):
+                    if stack[depth] in self.tables.open_brace_states:
+                        del stack[depth + 1 :]
+                        return self.pos
+            self.pos += 1
+            follower = self._current().kind
+            follower = self._symbol_of_kind.get(follower, follower)
+            for depth in range(len(stack) - 1, -1, -1):
+                targets = goto_rows[stack[depth]]
+                for symbol in self._RECOVERY_SYMBOLS:
+                    target = targets.get(symbol)
+                    if target is not None and follower in action_rows[target]:
+                        del stack[depth + 1 :]
+                        stack.append(target)
+                        return self.pos
 
     def _current(self) -> Token:
         """Get current token."""
         if self.pos < len(self.tokens):
             return self.tokens[self.pos]
-        return Token("$", "$", 0, 0)
+        return self._EOF
 
     def _peek(self, offset: int = 1) -> Token:
         """Look ahead at token."""
         pos = self.pos + offset
         if pos < len(self.tokens):
             return self.tokens[pos]
-        return Token("$", "$", 0, 0)
+        return self._EOF
 
     def _consume(self, expected: Optional[str] = None) -> Token:
         """Consume current token."""
@@ -177,11 +697,13 @@ class LRParser:
 
     def _emit(self, lhs: str, *rhs: str):
         """Emit a reduction."""
+        if self.check_only:
+            return
         if not rhs:
-            print(f"{lhs}->epsilon")
+            self._write(f"{lhs}->epsilon\n")
         else:
             rhs_str = " ".join(rhs)
-            print(f"{lhs}->{rhs_str}")
+            self._write(f"{lhs}->{rhs_str}\n")
 
     def _parse_program(self):
         """program -> ext_def_list"""
@@ -204,6 +726,16 @@ class LRParser:
                  | struct_specifier ';'
                  | func_decl compound_stmt
         """
+        if self._parse_ext_def_head():
+            self._parse_compound_stmt()
+            self._emit("ext_def", "func_decl", "compound_stmt")
+
+    def _parse_ext_def_head(self) -> bool:
+        """Parse an external definition up to a function body.
+
+        Returns True once ``func_decl`` has been reduced and the caller must
+        parse the ``compound_stmt``; every other alternative is complete.
+        """
         # Check if it's just a struct definition
         if self._current().kind == "STRUCT":
             # Could be: struct_specifier ';' OR variable with struct type
@@ -215,7 +747,7 @@ class LRParser:
                 # struct_specifier ';'
                 self._consume(";")
                 self._emit("ext_def", "struct_specifier", "\';\'")
-                return
+                return False
             # Otherwise, continue parsing as variable or function declaration
             # We already emitted type_specifier->struct_specifier
             self._emit("type_specifier", "struct_specifier")
@@ -248,9 +780,7 @@ class LRParser:
                 self._consume(")")
                 self._emit("func_decl", "type_specifier", "pointers", "ID", "\'(\'", "param_list", "\')\'")
 
-            # Parse function body
-            self._parse_compound_stmt()
-            self._emit("ext_def", "func_decl", "compound_stmt")
+            return True
 
         elif next_token.kind == "[":
             # Array declaration: type_specifier pointers ID '[' INTEGER_CONST ']' ';'
@@ -270,6 +800,7 @@ class LRParser:
                 f"Unexpected token {next_token.kind} in external definition "
                 f"at line {next_token.line}, column {next_token.column}"
             )
+        return False
 
     def _parse_type_specifier(self) -> str:
         """type_specifier -> TYPE | VOID | struct_specifier"""
@@ -390,16 +921,267 @@ class LRParser:
         """stmt_list -> stmt_list stmt | epsilon"""
         self._emit("stmt_list", "epsilon")
 
-        # Check for statement start tokens
-        while self._current().kind in (
-            "ID", "INTEGER_CONST", "CHAR_CONST", "STRING", "SYM_NULL",
-            "(", "-", "!", "INCOP", "DECOP", "&", "*",
-            "{", "RETURN", "IF", "WHILE", "FOR", "BREAK", "CONTINUE", ";"
-        ):
-            self._parse_stmt()
+        dispatch = self._stmt_dispatch
+        while True:
+            handler = dispatch.get(self._current().kind)
+            if handler is None:
+                return
+            handler(self)
             self._emit("stmt_list", "stmt_list", "stmt")
 
     def _parse_stmt(self):
+        """Parse statement, dispatching on FIRST(stmt).
+
+        Tokens outside FIRST(stmt) fall through to an expression statement so
+        the error comes from the expression parser, as it always has.
+        """
+        self._stmt_dispatch.get(self._current().kind, LRParser._parse_expr_stmt)(self)
+
+    def _parse_expr_stmt(self):
+        """stmt -> expr ';'"""
+        self._parse_expr()
+        self._consume(";")
+        self._emit("stmt", "expr", "\';\'")
+
+    def _parse_compound_stmt_stmt(self):
+        """stmt -> compound_stmt"""
+        self._parse_compound_stmt()
+        self._emit("stmt", "compound_stmt")
+
+    def _parse_return_stmt(self):
+        """stmt -> RETURN ';' | RETURN expr ';'"""
+        self.pos += 1
+        if self._current().kind == ";":
+            self._consume(";")
+            self._emit("stmt", "RETURN", "\';\'")
+        else:
+            self._parse_expr()
+            self._consume(";")
+            self._emit("stmt", "RETURN", "expr", "\';\'")
+
+    def _parse_empty_stmt(self):
+        """stmt -> ';'"""
+        self.pos += 1
+        self._emit("stmt", "\';\'")
+
+    def _parse_if_stmt(self):
+        """stmt -> IF '(' expr ')' stmt | IF '(' expr ')' stmt ELSE stmt"""
+        self.pos += 1
+        self._consume("(")
+        self._parse_expr()
+        self._consume(")")
+        self._parse_stmt()
+        if self._current().kind == "ELSE":
+            self._consume("ELSE")
+            self._parse_stmt()
+            self._emit("stmt", "IF", "\'(\'", "expr", "\')\'", "stmt", "ELSE", "stmt")
+        else:
+            self._emit("stmt", "IF", "\'(\'", "expr", "\')\'", "stmt")
+
+    def _parse_while_stmt(self):
+        """stmt -> WHILE '(' expr ')' stmt"""
+        self.pos += 1
+        self._consume("(")
+        self._parse_expr()
+        self._consume(")")
+        self._parse_stmt()
+        self._emit("stmt", "WHILE", "\'(\'", "expr", "\')\'", "stmt")
+
+    def _parse_for_stmt(self):
+        """stmt -> FOR '(' expr_e ';' expr_e ';' expr_e ')' stmt"""
+        self.pos += 1
+        self._consume("(")
+        self._parse_expr_e()
+        self._consume(";")
+        self._parse_expr_e()
+        self._consume(";")
+        self._parse_expr_e()
+        self._consume(")")
+        self._parse_stmt()
+        self._emit("stmt", "FOR", "\'(\'", "expr_e", "\';\'", "expr_e", "\';\'", "expr_e", "\')\'", "stmt")
+
+    def _parse_break_stmt(self):
+        """stmt -> BREAK ';'"""
+        self.pos += 1
+        self._consume(";")
+        self._emit("stmt", "BREAK", "\';\'")
+
+    def _parse_continue_stmt(self):
+        """stmt -> CONTINUE ';'"""
+        self.pos += 1
+        self._consume(";")
+        self._emit("stmt", "CONTINUE", "\';\'")
+
+    def _parse_expr_e(self):
+        """expr_e -> expr | epsilon"""
+        token = self._current()
+        if token.kind == ";":
+            self._emit("expr_e", "epsilon")
+        else:
+            self._parse_expr()
+            self._emit("expr_e", "expr")
+
+    def _parse_expr(self):
+        """expr -> unary '=' expr | binary"""
+        # Both alternatives start with a unary; parse it, then let the next
+        # token decide between assignment and a binary expression.
+        self._parse_unary()
+
+        if self._current().kind == "=":
+            self._consume("=")
+            self._parse_expr()  # Assignment is right-associative.
+            self._emit("expr", "unary", "'='", "expr")
+        else:
+            self._emit("binary", "unary")
+            self._parse_binary_operators(0)
+            self._emit("expr", "binary")
+
+    def _parse_binary_operators(self, min_level: int):
+        """Extend the reduced left operand with operators binding at ``min_level`` or tighter.
+
+        binary -> binary OP binary, with OP's binding power taken from
+        ``self.binary_operators``.  Every binary operator is left-associative,
+        so the right operand only absorbs strictly tighter operators; the
+        reductions then come out in the same order an LR parser makes them.
+        """
+        operators = self.binary_operators
+        while True:
+            entry = operators.get(self._current().kind)
+            if entry is None or entry[0] < min_level:
+                return
+            level, symbol = entry
+            self.pos += 1
+            self._parse_unary()
+            self._emit("binary", "unary")
+            following = operators.get(self._current().kind)
+            if following is not None and following[0] > level:
+                self._parse_binary_operators(level + 1)
+            self._emit("binary", "binary", symbol, "binary")
+
+    def _parse_unary(self):
+        """Parse unary expression, dispatching on FIRST(unary)."""
+        handler = self._unary_dispatch.get(self._current().kind)
+        if handler is None:
+            token = self._current()
+            raise SyntaxError(f"Unexpected token {token.kind} at line {token.line}")
+        handler(self)
+
+    def _parse_paren_unary(self):
+        """unary -> '(' expr ')'"""
+        self.pos += 1
+        self._parse_expr()
+        self._consume(")")
+        self._emit("unary", "\'(\'", "expr", "\')\'")
+
+    def _parse_id_unary(self):
+        """unary -> ID, followed by any postfix operators."""
+        self.pos += 1
+        self._emit("unary", "ID")
+        self._parse_postfix()
+
+    def _parse_leaf_unary(self, symbol: str):
+        """unary -> INTEGER_CONST | CHAR_CONST | STRING | SYM_NULL"""
+        self.pos += 1
+        self._emit("unary", symbol)
+
+    def _parse_prefix_unary(self, symbol: str):
+        """unary -> OP unary for each prefix operator OP."""
+        self.pos += 1
+        self._parse_unary()
+        self._emit("unary", symbol, "unary")
+
+    def _parse_postfix(self):
+        """Parse postfix operators."""
+        while True:
+            token = self._current()
+            if token.kind == "[":
+                self._consume("[")
+                self._parse_expr()
+                self._consume("]")
+                self._emit("unary", "unary", "\'[\'", "expr", "\']\'")
+            elif token.kind == ".":
+                self._consume(".")
+                self._consume("ID")
+                self._emit("unary", "unary", "\'.\'", "ID")
+            elif token.kind == "STRUCTOP":
+                self._consume("STRUCTOP")
+                self._consume("ID")
+                self._emit("unary", "unary", "STRUCTOP", "ID")
+            elif token.kind == "(":
+                self._consume("(")
+                if self._current().kind == ")":
+                    self._consume(")")
+                    self._emit("unary", "unary", "\'(\'", "\')\'")
+                else:
+                    self._parse_args()
+                    self._consume(")")
+                    self._emit("unary", "unary", "\'(\'", "args", "\')\'")
+            elif token.kind == "INCOP":
+                self._consume("INCOP")
+                self._emit("unary", "unary", "INCOP")
+            elif token.kind == "DECOP":
+                self._consume("DECOP")
+                self._emit("unary", "unary", "DECOP")
+            else:
+                break
+
+    def _parse_args(self):
+        """args -> expr | args ',' expr"""
+        self._parse_expr()
+        self._emit("args", "expr")
+
+        while self._current().kind == ",":
+            self._consume(",")
+            self._parse_expr()
+            self._emit("args", "args", "\',\'", "expr")
+
+    # Iterative engine -------------------------------------------------
+    #
+    # Generator twins of every production that can nest without bound.  A
+    # generator yields the sub-parse it needs next instead of calling it;
+    # _run_iterative keeps the suspended callers on an explicit stack and
+    # resumes each one when its child is exhausted.  The generators mirror
+    # the _parse_* methods above statement for statement, so both engines
+    # consume the same tokens and emit the same reductions.  Productions that
+    # cannot nest (declarations, type specifiers) are shared with descent.
+    # A sub-parse that would return without consuming anything is not
+    # started at all, since each generator costs an allocation and a resume.
+
+    def _run_iterative(self, root: Iterator[Iterator[Any]]):
+        """Drive ``root`` and the sub-parses it yields to completion."""
+        stack = [root]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                pop()
+            else:
+                push(child)
+
+    def _iter_program(self):
+        """program -> ext_def_list"""
+        self._emit("ext_def_list", "epsilon")
+        while self._current().kind != "$":
+            if self._parse_ext_def_head():
+                yield self._iter_compound_stmt()
+                self._emit("ext_def", "func_decl", "compound_stmt")
+            self._emit("ext_def_list", "ext_def_list", "ext_def")
+        self._emit("program", "ext_def_list")
+
+    def _iter_compound_stmt(self):
+        """compound_stmt -> '{' def_list stmt_list '}'"""
+        self._consume("{")
+        self._parse_def_list()
+        self._emit("stmt_list", "epsilon")
+        stmt_first = self._stmt_first
+        while self._current().kind in stmt_first:
+            yield self._iter_stmt()
+            self._emit("stmt_list", "stmt_list", "stmt")
+        self._consume("}")
+        self._emit("compound_stmt", "\'{\'", "def_list", "stmt_list", "\'}\'")
+
+    def _iter_stmt(self):
         """Parse statement."""
         token = self._current()
 
@@ -407,7 +1189,7 @@ class LRParser:
             self._consume(";")
             self._emit("stmt", "\';\'")
         elif token.kind == "{":
-            self._parse_compound_stmt()
+            yield self._iter_compound_stmt()
             self._emit("stmt", "compound_stmt")
         elif token.kind == "RETURN":
             self._consume("RETURN")
@@ -415,38 +1197,38 @@ class LRParser:
                 self._consume(";")
                 self._emit("stmt", "RETURN", "\';\'")
             else:
-                self._parse_expr()
+                yield self._iter_expr()
                 self._consume(";")
                 self._emit("stmt", "RETURN", "expr", "\';\'")
         elif token.kind == "IF":
             self._consume("IF")
             self._consume("(")
-            self._parse_expr()
+            yield self._iter_expr()
             self._consume(")")
-            self._parse_stmt()
+            yield self._iter_stmt()
             if self._current().kind == "ELSE":
                 self._consume("ELSE")
-                self._parse_stmt()
+                yield self._iter_stmt()
                 self._emit("stmt", "IF", "\'(\'", "expr", "\')\'", "stmt", "ELSE", "stmt")
             else:
                 self._emit("stmt", "IF", "\'(\'", "expr", "\')\'", "stmt")
         elif token.kind == "WHILE":
             self._consume("WHILE")
             self._consume("(")
-            self._parse_expr()
+            yield self._iter_expr()
             self._consume(")")
-            self._parse_stmt()
+            yield self._iter_stmt()
             self._emit("stmt", "WHILE", "\'(\'", "expr", "\')\'", "stmt")
         elif token.kind == "FOR":
             self._consume("FOR")
             self._consume("(")
-            self._parse_expr_e()
+            yield self._iter_expr_e()
             self._consume(";")
-            self._parse_expr_e()
+            yield self._iter_expr_e()
             self._consume(";")
-            self._parse_expr_e()
+            yield self._iter_expr_e()
             self._consume(")")
-            self._parse_stmt()
+            yield self._iter_stmt()
             self._emit("stmt", "FOR", "\'(\'", "expr_e", "\';\'", "expr_e", "\';\'", "expr_e", "\')\'", "stmt")
         elif token.kind == "BREAK":
             self._consume("BREAK")
@@ -457,220 +1239,102 @@ class LRParser:
             self._consume(";")
             self._emit("stmt", "CONTINUE", "\';\'")
         else:
-            # Expression statement
-            self._parse_expr()
+            yield self._iter_expr()
             self._consume(";")
             self._emit("stmt", "expr", "\';\'")
 
-    def _parse_expr_e(self):
+    def _iter_expr_e(self):
         """expr_e -> expr | epsilon"""
-        token = self._current()
-        if token.kind == ";":
+        if self._current().kind == ";":
             self._emit("expr_e", "epsilon")
         else:
-            self._parse_expr()
+            yield self._iter_expr()
             self._emit("expr_e", "expr")
 
-    def _parse_expr(self):
+    def _iter_expr(self):
         """expr -> unary '=' expr | binary"""
-        # We need to check if this is an assignment or regular binary expression
-        # The challenge: assignment is "unary = expr", but we need to know
-        # if there's an '=' after the unary before we commit to that path
-
-        # Strategy: Parse unary, check for '=', then decide
-        self._parse_unary()
+        if not self._reduce_leaf_unary():
+            yield self._iter_unary()
 
-        # Check if '=' follows
         if self._current().kind == "=":
-            # This is an assignment: unary '=' expr
             self._consume("=")
-            self._parse_expr()  # Recursive call for RHS
+            yield self._iter_expr()
             self._emit("expr", "unary", "'='", "expr")
         else:
-            # Not assignment - continue as binary expression
-            # We've already parsed one unary, now build binary expression
             self._emit("binary", "unary")
-            self._continue_binary_after_first_unary()
+            if self._current().kind in self.binary_operators:
+                yield self._iter_binary_operators(0)
             self._emit("expr", "binary")
 
-    def _continue_binary_after_first_unary(self):
-        """Continue parsing binary expression after we've already parsed and reduced one unary.
-
-        At this point:
-        - We've parsed a unary expression
-        - We've emitted "binary->unary"
-        - Now we check for binary operators and continue precedence climbing
+    def _iter_binary_operators(self, min_level: int):
+        """Pratt loop of :meth:`_parse_binary_operators`."""
+        operators = self.binary_operators
+        while True:
+            entry = operators.get(self._current().kind)
+            if entry is None or entry[0] < min_level:
+                return
+            level, symbol = entry
+            self.pos += 1
+            if not self._reduce_leaf_unary():
+                yield self._iter_unary()
+            self._emit("binary", "unary")
+            following = operators.get(self._current().kind)
+            if following is not None and following[0] > level:
+                yield self._iter_binary_operators(level + 1)
+            self._emit("binary", "binary", symbol, "binary")
 
-        This handles all binary operators starting from lowest precedence.
-        """
-        # We need to handle all operators in precedence order
-        # The precedence (lowest to highest):
-        # 1. LOGICAL_OR
-        # 2. LOGICAL_AND
-        # 3. EQUOP
-        # 4. RELOP
-        # 5. +, -
-        # 6. *, /, %
-
-        # Start from lowest: LOGICAL_OR
-        while self._current().kind == "LOGICAL_OR":
-            self._consume("LOGICAL_OR")
-            # Parse RHS at next precedence level
-            self._parse_logical_and()
-            self._emit("binary", "binary", "LOGICAL_OR", "binary")
-
-        # LOGICAL_AND
-        while self._current().kind == "LOGICAL_AND":
-            self._consume("LOGICAL_AND")
-            self._parse_equality()
-            self._emit("binary", "binary", "LOGICAL_AND", "binary")
-
-        # EQUOP
-        while self._current().kind == "EQUOP":
-            self._consume("EQUOP")
-            self._parse_relational()
-            self._emit("binary", "binary", "EQUOP", "binary")
-
-        # RELOP
-        while self._current().kind == "RELOP":
-            self._consume("RELOP")
-            self._parse_additive()
-            self._emit("binary", "binary", "RELOP", "binary")
-
-        # Additive: +, -
-        while self._current().kind in ("+", "-"):
-            op = self._consume()
-            self._parse_multiplicative()
-            self._emit("binary", "binary", f"'{op.lexeme}'", "binary")
-
-        # Multiplicative: *, /, %
-        while self._current().kind in ("*", "/", "%"):
-            op = self._consume()
-            self._parse_unary_to_binary()
-            self._emit("binary", "binary", f"'{op.lexeme}'", "binary")
-
-    def _parse_binary(self):
-        """Parse binary expression with precedence."""
-        self._parse_logical_or()
-
-    def _parse_logical_or(self):
-        """Parse logical OR expression."""
-        self._parse_logical_and()
-
-        while self._current().kind == "LOGICAL_OR":
-            self._consume("LOGICAL_OR")
-            self._parse_logical_and()
-            self._emit("binary", "binary", "LOGICAL_OR", "binary")
-
-    def _parse_logical_and(self):
-        """Parse logical AND expression."""
-        self._parse_equality()
-
-        while self._current().kind == "LOGICAL_AND":
-            self._consume("LOGICAL_AND")
-            self._parse_equality()
-            self._emit("binary", "binary", "LOGICAL_AND", "binary")
-
-    def _parse_equality(self):
-        """Parse equality expression."""
-        self._parse_relational()
-
-        while self._current().kind == "EQUOP":
-            self._consume("EQUOP")
-            self._parse_relational()
-            self._emit("binary", "binary", "EQUOP", "binary")
-
-    def _parse_relational(self):
-        """Parse relational expression."""
-        self._parse_additive()
-
-        while self._current().kind == "RELOP":
-            self._consume("RELOP")
-            self._parse_additive()
-            self._emit("binary", "binary", "RELOP", "binary")
-
-    def _parse_additive(self):
-        """Parse additive expression."""
-        self._parse_multiplicative()
-
-        while self._current().kind in ("+", "-"):
-            op = self._consume()
-            self._parse_multiplicative()
-            self._emit("binary", "binary", f"'{op.lexeme}'", "binary")
-
-    def _parse_multiplicative(self):
-        """Parse multiplicative expression."""
-        self._parse_unary_to_binary()
-
-        while self._current().kind in ("*", "/", "%"):
-            op = self._consume()
-            self._parse_unary_to_binary()
-            self._emit("binary", "binary", f"'{op.lexeme}'", "binary")
-
-    def _parse_unary_to_binary(self):
-        """Parse unary and emit binary -> unary."""
-        self._parse_unary()
-        self._emit("binary", "unary")
+    def _reduce_leaf_unary(self) -> bool:
+        """Reduce a constant or a bare ID operand without starting a sub-parse."""
+        token = self._current()
+        kind = token.kind
+        if kind in ("INTEGER_CONST", "CHAR_CONST", "STRING", "SYM_NULL"):
+            self.pos += 1
+            self._emit("unary", kind)
+            return True
+        if kind == "ID" and self._peek().kind not in self._POSTFIX_KINDS:
+            self.pos += 1
+            self._emit("unary", "ID")
+            return True
+        return False
 
-    def _parse_unary(self):
+    def _iter_unary(self):
         """Parse unary expression."""
         token = self._current()
+        kind = token.kind
 
-        if token.kind == "(":
+        if kind == "(":
             self._consume("(")
-            self._parse_expr()
+            yield self._iter_expr()
             self._consume(")")
             self._emit("unary", "\'(\'", "expr", "\')\'")
-        elif token.kind == "INTEGER_CONST":
-            self._consume("INTEGER_CONST")
-            self._emit("unary", "INTEGER_CONST")
-        elif token.kind == "CHAR_CONST":
-            self._consume("CHAR_CONST")
-            self._emit("unary", "CHAR_CONST")
-        elif token.kind == "STRING":
-            self._consume("STRING")
-            self._emit("unary", "STRING")
-        elif token.kind == "SYM_NULL":
-            self._consume("SYM_NULL")
-            self._emit("unary", "SYM_NULL")
-        elif token.kind == "ID":
+        elif kind in ("INTEGER_CONST", "CHAR_CONST", "STRING", "SYM_NULL"):
+            self._consume(kind)
+            self._emit("unary", kind)
+        elif kind == "ID":
             self._consume("ID")
             self._emit("unary", "ID")
-            self._parse_postfix()
-        elif token.kind == "-":
-            self._consume("-")
-            self._parse_unary()
-            self._emit("unary", "\'-\'", "unary")
-        elif token.kind == "!":
-            self._consume("!")
-            self._parse_unary()
-            self._emit("unary", "\'!\'", "unary")
-        elif token.kind == "INCOP":
-            self._consume("INCOP")
-            self._parse_unary()
-            self._emit("unary", "INCOP", "unary")
-        elif token.kind == "DECOP":
-            self._consume("DECOP")
-            self._parse_unary()
-            self._emit("unary", "DECOP", "unary")
-        elif token.kind == "&":
-            self._consume("&")
-            self._parse_unary()
-            self._emit("unary", "\'&\'", "unary")
-        elif token.kind == "*":
-            self._consume("*")
-            self._parse_unary()
-            self._emit("unary", "\'*\'", "unary")
+            if self._current().kind in self._POSTFIX_KINDS:
+                yield self._iter_postfix()
+        elif kind in ("-", "!", "&", "*"):
+            self._consume(kind)
+            if not self._reduce_leaf_unary():
+                yield self._iter_unary()
+            self._emit("unary", f"'{kind}'", "unary")
+        elif kind in ("INCOP", "DECOP"):
+            self._consume(kind)
+            if not self._reduce_leaf_unary():
+                yield self._iter_unary()
+            self._emit("unary", kind, "unary")
         else:
             raise SyntaxError(f"Unexpected token {token.kind} at line {token.line}")
 
-    def _parse_postfix(self):
+    def _iter_postfix(self):
         """Parse postfix operators."""
         while True:
             token = self._current()
             if token.kind == "[":
                 self._consume("[")
-                self._parse_expr()
+                yield self._iter_expr()
                 self._consume("]")
                 self._emit("unary", "unary", "\'[\'", "expr", "\']\'")
             elif token.kind == ".":
@@ -687,7 +1351,12 @@ class LRParser:
                     self._consume(")")
                     self._emit("unary", "unary", "\'(\'", "\')\'")
                 else:
-                    self._parse_args()
+                    yield self._iter_expr()
+                    self._emit("args", "expr")
+                    while self._current().kind == ",":
+                        self._consume(",")
+                        yield self._iter_expr()
+                        self._emit("args", "args", "\',\'", "expr")
                     self._consume(")")
                     self._emit("unary", "unary", "\'(\'", "args", "\')\'")
             elif token.kind == "INCOP":
@@ -697,40 +1366,68 @@ class LRParser:
                 self._consume("DECOP")
                 self._emit("unary", "unary", "DECOP")
             else:
-                break
-
-    def _parse_args(self):
-        """args -> expr | args ',' expr"""
-        self._parse_expr()
-        self._emit("args", "expr")
-
-        while self._current().kind == ",":
-            self._consume(",")
-            self._parse_expr()
-            self._emit("args", "args", "\',\'", "expr")
+                return
 
 
 def main(argv: Sequence[str]) -> int:
     """Main entry point."""
-    if len(argv) != 2:
-        print(f"Usage: {argv[0]} <source-file>", file=sys.stderr)
-        return 1
-
-    try:
-        with open(argv[1], "r", encoding="utf-8") as handle:
-            source = handle.read()
-    except OSError as exc:
-        print(f"Could not read input file: {exc}", file=sys.stderr)
-        return 1
-
-    # Tokenize
-    tokens = list(tokenize(source))
+    arg_parser = argparse.ArgumentParser(prog=argv[0], description="subC parser.")
+    arg_parser.add_argument("sources", nargs="+", metavar="source", help="subC source file")
+    arg_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only validate the input; print nothing unless there is an error",
+    )
+    arg_parser.add_argument(
+        "--engine",
+        choices=LRParser.ENGINES,
+        default="descent",
+        help="recursive descent, explicit-stack descent, or generated LALR(1) tables",
+    )
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="parse several sources on N threads; logs are printed in argument order",
+    )
+    arg_parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=1,
+        metavar="N",
+        help="report up to N syntax errors per source, resynchronising at ';' and '}' "
+        "(table engine only)",
+    )
+    args = arg_parser.parse_args(argv[1:])
+    if args.max_errors < 1:
+        arg_parser.error("--max-errors must be at least 1")
+    if args.max_errors > 1 and args.engine != "table":
+        arg_parser.error("--max-errors needs --engine table")
+
+    sources = []
+    for path in args.sources:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                sources.append(handle.read())
+        except OSError as exc:
+            print(f"Could not read input file: {exc}", file=sys.stderr)
+            return 1
 
-    # Parse
     grammar = Grammar()
-    parser = LRParser(grammar)
-    success = parser.parse(tokens)
-
+    parser = LRParser(grammar, engine=args.engine, max_errors=args.max_errors)
+    if len(sources) == 1:
+        # Tokenize and parse, streaming reductions to stdout.
+        success = parser.parse(list(tokenize(sources[0])), check=args.check)
+        return 0 if success else 1
+
+    success = True
+    for result in parser.parse_many(sources, args.jobs, check=args.check):
+        sys.stdout.write(result.log)
+        if result.error is not None:
+            print(result.error, file=sys.stderr)
+            success = False
     return 0 if success else 1
 
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""asyncio front end for parsing many subC files.
+
+:func:`parse_files` is an async iterator over :class:`batch.FileResult`.
+Files are read on the default thread pool (``asyncio.to_thread``) so the
+event loop never blocks on disk, and lexing and parsing run in a forked
+process pool exactly as in :mod:`batch`.  At most ``concurrency`` files are
+in flight; no new file is started while the consumer is not asking for
+results, so a slow consumer applies backpressure all the way to the disk.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from typing import AsyncIterator, Optional, Sequence, Set, Tuple
+
+try:
+    from . import batch, table_file  # type: ignore
+except ImportError:  # pragma: no cover - fallback for script execution
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    import batch  # type: ignore
+    import table_file  # type: ignore
+
+FileResult = batch.FileResult
+
+# FileResult.status for a file that exceeded its timeout; 0-3 are the exit
+# codes of parser.py.
+TIMED_OUT = 4
+
+
+def _make_executor(workers: int) -> Executor:
+    if "fork" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+    # The parse drivers keep all state per call, so threads are safe; they
+    # just do not run in parallel.
+    return ThreadPoolExecutor(workers)
+
+
+async def parse_files(
+    paths: Sequence[str],
+    concurrency: int = 64,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    log_dir: Optional[str] = None,
+    token_cache: Optional[str] = None,
+    tables: Optional[table_file.ParseTables] = None,
+) -> AsyncIterator[FileResult]:
+    """Parse ``paths``, yielding a result per file as each one finishes.
+
+    ``workers`` sizes the process pool (default: CPU count); ``log_dir``,
+    ``token_cache`` and ``tables`` behave as in :func:`batch.parse_files`.
+    A file whose parse runs longer than ``timeout`` seconds is reported
+    with status :data:`TIMED_OUT`; the clock starts when a worker takes the
+    file, so time spent queued behind other files does not count.  A parse
+    already running in a worker process cannot be interrupted, so it
+    finishes in the background, keeping its worker, and its result is
+    dropped.  Closing the iterator (wrap it in ``contextlib.aclosing`` to do
+    so on ``break``), or cancelling the task consuming it, cancels every
+    file still in flight.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    loop = asyncio.get_running_loop()
+    # Building the parser.py tables takes seconds; keep the loop responsive.
+    await asyncio.to_thread(batch.install_tables, tables)
+    workers = workers or os.cpu_count() or 1
+    executor = _make_executor(workers)
+    # Files are only handed to the pool when a worker is free, so a file's
+    # timeout covers its own parse and not the pool's queue.
+    idle_workers = asyncio.Semaphore(workers)
+    jobs = iter(enumerate(zip(paths, batch.log_paths(paths, log_dir))))
+
+    async def attempt(path: str, log_path: Optional[str]) -> Tuple[int, str]:
+        try:
+            source = await asyncio.to_thread(batch.read_source, path)
+        except OSError as exc:
+            return 1, f"Could not read input file: {exc}"
+        await idle_workers.acquire()
+        job = loop.run_in_executor(executor, batch.parse_source, source, log_path, token_cache)
+        # Released when the worker is done, even with the result abandoned.
+        job.add_done_callback(lambda _: idle_workers.release())
+        try:
+            return await asyncio.wait_for(asyncio.shield(job), timeout)
+        except asyncio.TimeoutError:
+            return TIMED_OUT, f"Timed out after {timeout:g}s"
+
+    async def run(index: int, path: str, log_path: Optional[str]) -> FileResult:
+        started = time.perf_counter()
+        status, diagnostic = await attempt(path, log_path)
+        return FileResult(index, path, status, diagnostic, log_path, time.perf_counter() - started)
+
+    pending: Set[asyncio.Task[FileResult]] = set()
+
+    def fill() -> None:
+        while len(pending) < concurrency:
+            job = next(jobs, None)
+            if job is None:
+                return
+            index, (path, log_path) = job
+            pending.add(asyncio.create_task(run(index, path, log_path)))
+
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            for task in done:
+                yield task.result()
+            fill()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _build_arg_parser(prog: str) -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(prog=prog, description="asyncio batch subC parser.")
+    arg_parser.add_argument("inputs", nargs="*", help="source files, directories or glob patterns")
+    arg_parser.add_argument(
+        "--files-from",
+        metavar="FILE",
+        help="also read one input per line from FILE ('-' for stdin)",
+    )
+    arg_parser.add_argument(
+        "--pattern",
+        default="*.txt",
+        help="file name pattern used inside directories (default: *.txt)",
+    )
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="number of worker processes (default: CPU count)",
+    )
+    arg_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=64,
+        metavar="N",
+        help="files read or parsed at the same time (default: 64)",
+    )
+    arg_parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help=f"give up on a file whose parse runs longer than SECONDS (status {TIMED_OUT})",
+    )
+    arg_parser.add_argument(
+        "--log-dir",
+        metavar="DIR",
+        help="write each file's text reduction log below DIR",
+    )
+    arg_parser.add_argument(
+        "--tables",
+        metavar="FILE",
+        help="use parse tables exported by 'table_file.py export' instead of building them",
+    )
+    arg_parser.add_argument("--token-cache", metavar="DIR", help="reuse serialised token streams from DIR")
+    return arg_parser
+
+
+async def _report(
+    paths: Sequence[str], args: argparse.Namespace, tables: Optional[table_file.ParseTables]
+) -> int:
+    worst = 0
+    failed = 0
+    started = time.perf_counter()
+    async for result in parse_files(
+        paths,
+        concurrency=args.concurrency,
+        workers=args.jobs,
+        timeout=args.timeout,
+        log_dir=args.log_dir,
+        token_cache=args.token_cache,
+        tables=tables,
+    ):
+        print(f"{result.path}\t{result.status}\t{result.diagnostic}")
+        if result.status:
+            failed += 1
+            worst = max(worst, result.status)
+    print(
+        f"{len(paths)} files, {failed} failed, {time.perf_counter() - started:.2f}s",
+        file=sys.stderr,
+    )
+    return worst
+
+
+def main(argv: Sequence[str]) -> int:
+    """Like ``batch.py``, but results are printed in completion order."""
+    arg_parser = _build_arg_parser(argv[0])
+    args = arg_parser.parse_args(argv[1:])
+
+    specs = list(args.inputs)
+    if args.files_from is not None:
+        try:
+            specs.extend(batch.read_path_list(args.files_from))
+        except OSError as exc:
+            print(f"Could not read file list: {exc}", file=sys.stderr)
+            return 1
+    if not specs:
+        arg_parser.error("no input files")
+    tables = None
+    if args.tables is not None:
+        try:
+            tables = table_file.ParseTables.open(args.tables)
+        except OSError as exc:
+            print(f"Could not read table file: {exc}", file=sys.stderr)
+            return 1
+        except table_file.TableFileError as exc:
+            print(f"TableFileError: {exc}", file=sys.stderr)
+            return 2
+    return asyncio.run(_report(batch.collect_paths(specs, args.pattern), args, tables))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
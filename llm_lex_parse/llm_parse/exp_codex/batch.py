@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""Parse many subC files with one set of LR(1) tables.
+
+Running ``parser.py`` once per file rebuilds the canonical LR(1) automaton
+every time.  This driver imports :mod:`parser` (building the tables) once and
+then forks a worker pool, so every worker inherits the tables copy-on-write.
+With ``--tables`` it maps an exported :mod:`table_file` instead and never
+builds the automaton at all.
+Each file gets the exit status and diagnostic ``parser.py`` would have
+produced for it.  Results stream back in input order or, with
+``--completion-order``, as soon as each chunk of files finishes.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+import glob
+from itertools import islice
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    from . import lexer, table_file  # type: ignore
+except ImportError:  # pragma: no cover - fallback for script execution
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    import lexer  # type: ignore
+    import table_file  # type: ignore
+
+
+@dataclass(frozen=True)
+class FileResult:
+    """Outcome of parsing one file.
+
+    ``status`` uses the exit codes of ``parser.py``: 0 on success, 1 when the
+    file could not be read (or its log written), 2 for a lexer error and 3
+    for a syntax error.  ``diagnostic`` is what ``parser.py`` would print to
+    stderr, or an empty string.
+    """
+
+    index: int
+    path: str
+    status: int
+    diagnostic: str
+    log_path: Optional[str]
+    seconds: float
+
+
+# (input index, source path, reduction log path or None, token cache dir)
+_Task = Tuple[int, str, Optional[str], Optional[str]]
+
+# The ``parser`` module or a ``table_file.ParseTables``; both provide
+# ``check``, ``parse`` and ``text_emitter``.  Set before the pool forks.
+_tables: Any = None
+
+
+def _parser_module() -> Any:
+    """Import ``parser.py``, building its tables on first use."""
+    try:
+        from . import parser  # type: ignore
+    except ImportError:  # pragma: no cover - fallback for script execution
+        import parser  # type: ignore
+    return parser
+
+
+def collect_paths(specs: Iterable[str], pattern: str = "*.txt") -> List[str]:
+    """Expand files, directories and glob patterns into a list of paths.
+
+    Directories are searched recursively for names matching ``pattern``.
+    Paths keep the order of ``specs`` (sorted within each directory or glob)
+    and appear once even when several specs name them.
+    """
+    paths: List[str] = []
+    seen: Set[str] = set()
+    for spec in specs:
+        if os.path.isdir(spec):
+            matches = sorted(str(path) for path in pathlib.Path(spec).rglob(pattern) if path.is_file())
+        elif any(char in spec for char in "*?["):
+            matches = sorted(path for path in glob.glob(spec, recursive=True) if os.path.isfile(path))
+        else:
+            # Missing files are kept so they are reported with status 1.
+            matches = [spec]
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def read_path_list(path: str) -> List[str]:
+    """Return the non-empty lines of ``path`` (``-`` reads stdin)."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def log_paths(paths: Sequence[str], log_dir: Optional[str]) -> List[Optional[str]]:
+    """Mirror each source below ``log_dir``, relative to the inputs' common directory."""
+    if log_dir is None:
+        return [None] * len(paths)
+    if not paths:
+        return []
+    absolute = [os.path.abspath(path) for path in paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute])
+    return [os.path.join(log_dir, os.path.relpath(path, root) + ".log") for path in absolute]
+
+
+def _parse_file(task: _Task) -> FileResult:
+    index, path, log_path, token_cache = task
+    started = time.perf_counter()
+    try:
+        source = read_source(path)
+    except OSError as exc:
+        status, diagnostic = 1, f"Could not read input file: {exc}"
+    else:
+        status, diagnostic = parse_source(source, log_path, token_cache)
+    return FileResult(index, path, status, diagnostic, log_path, time.perf_counter() - started)
+
+
+def read_source(path: str) -> str:
+    """Read a source file the way ``parser.py`` does."""
+    with open(path, "r", encoding="utf-8") as handle:
+        return handle.read()
+
+
+def parse_source(
+    source: str, log_path: Optional[str], token_cache: Optional[str]
+) -> Tuple[int, str]:
+    """Lex and parse ``source`` with the installed tables; return (status, diagnostic)."""
+    try:
+        tokens = lexer.lex_source(source, token_cache)
+    except lexer.LexerError as exc:
+        return 2, f"LexerError: {exc}"
+    try:
+        if log_path is None:
+            _tables.check(tokens)
+        else:
+            os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+            # Like parser.py, the reductions before a syntax error are kept.
+            with open(log_path, "w", encoding="utf-8") as handle:
+                _tables.parse(tokens, _tables.text_emitter(handle.write))
+    except table_file.ParseError as exc:
+        return 3, str(exc)
+    except OSError as exc:
+        return 1, f"Could not write reduction log: {exc}"
+    return 0, ""
+
+
+def install_tables(tables: Optional[table_file.ParseTables]) -> None:
+    """Select the tables :func:`parse_source` uses; call before a pool forks."""
+    global _tables
+
+    _tables = tables if tables is not None else _parser_module()
+
+
+def installed_tables() -> Any:
+    """Return the tables selected by :func:`install_tables` (``None`` before that)."""
+    return _tables
+
+
+def _parse_chunk(tasks: Sequence[_Task]) -> List[FileResult]:
+    return [_parse_file(task) for task in tasks]
+
+
+def _chunks(tasks: Iterable[_Task], size: int) -> Iterator[List[_Task]]:
+    chunk: List[_Task] = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_files(
+    paths: Sequence[str],
+    workers: int = 2,
+    ordered: bool = True,
+    log_dir: Optional[str] = None,
+    token_cache: Optional[str] = None,
+    chunk_size: int = 4,
+    tables: Optional[table_file.ParseTables] = None,
+) -> Iterator[FileResult]:
+    """Parse every file in ``paths``, yielding one :class:`FileResult` each.
+
+    Files are handed to a forked pool ``chunk_size`` at a time, with at most
+    ``4 * workers`` chunks in flight so results stream out while later files
+    are still queued.  ``ordered`` yields results in the order of ``paths``;
+    otherwise each chunk is yielded as soon as it finishes.  With
+    ``log_dir`` each file's text reduction log is written below it (see
+    :func:`log_paths`); without it files are only checked.  ``tables``
+    replaces the tables of ``parser.py``, which are otherwise built here
+    before forking.  With
+    ``workers <= 1``, or where ``fork`` is unavailable, files are parsed in
+    this process.
+    """
+    install_tables(tables)
+    tasks = (
+        (index, path, log_path, token_cache)
+        for index, (path, log_path) in enumerate(zip(paths, log_paths(paths, log_dir)))
+    )
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        for task in tasks:
+            yield _parse_file(task)
+        return
+
+    chunks = _chunks(tasks, max(1, chunk_size))
+    limit = 4 * workers
+    context = multiprocessing.get_context("fork")
+    executor = ProcessPoolExecutor(workers, mp_context=context)
+    try:
+        if ordered:
+            queue: Deque[Future[List[FileResult]]] = deque(
+                executor.submit(_parse_chunk, chunk) for chunk in islice(chunks, limit)
+            )
+            while queue:
+                results = queue.popleft().result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    queue.append(executor.submit(_parse_chunk, chunk))
+                yield from results
+        else:
+            pending: Set[Future[List[FileResult]]] = {
+                executor.submit(_parse_chunk, chunk) for chunk in islice(chunks, limit)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for _ in done:
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.add(executor.submit(_parse_chunk, chunk))
+                for future in done:
+                    yield from future.result()
+    finally:
+        # A consumer that stops early should not wait for queued chunks.
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _build_arg_parser(prog: str) -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(prog=prog, description="Batch subC LR(1) parser.")
+    arg_parser.add_argument("inputs", nargs="*", help="source files, directories or glob patterns")
+    arg_parser.add_argument(
+        "--files-from",
+        metavar="FILE",
+        help="also read one input per line from FILE ('-' for stdin)",
+    )
+    arg_parser.add_argument(
+        "--pattern",
+        default="*.txt",
+        help="file name pattern used inside directories (default: *.txt)",
+    )
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="number of worker processes (default: CPU count)",
+    )
+    arg_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4,
+        metavar="N",
+        help="files sent to a worker at a time (default: 4)",
+    )
+    arg_parser.add_argument(
+        "--completion-order",
+        action="store_true",
+        help="report files as they finish instead of in input order",
+    )
+    arg_parser.add_argument(
+        "--log-dir",
+        metavar="DIR",
+        help="write each file's text reduction log below DIR",
+    )
+    arg_parser.add_argument(
+        "--tables",
+        metavar="FILE",
+        help="use parse tables exported by 'table_file.py export' instead of building them",
+    )
+    arg_parser.add_argument(
+        "--token-cache",
+        metavar="DIR",
+        help=f"reuse serialised token streams from DIR (default: ${lexer.TOKEN_CACHE_ENV})",
+    )
+    return arg_parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Print ``path<TAB>status<TAB>diagnostic`` per file and a summary on stderr.
+
+    Returns the highest per-file status, so 0 means every file parsed.
+    """
+    arg_parser = _build_arg_parser(argv[0])
+    args = arg_parser.parse_args(argv[1:])
+
+    specs = list(args.inputs)
+    if args.files_from is not None:
+        try:
+            specs.extend(read_path_list(args.files_from))
+        except OSError as exc:
+            print(f"Could not read file list: {exc}", file=sys.stderr)
+            return 1
+    if not specs:
+        arg_parser.error("no input files")
+    paths = collect_paths(specs, args.pattern)
+    tables = None
+    if args.tables is not None:
+        try:
+            tables = table_file.ParseTables.open(args.tables)
+        except OSError as exc:
+            print(f"Could not read table file: {exc}", file=sys.stderr)
+            return 1
+        except table_file.TableFileError as exc:
+            print(f"TableFileError: {exc}", file=sys.stderr)
+            return 2
+
+    started = time.perf_counter()
+    worst = 0
+    failed = 0
+    for result in parse_files(
+        paths,
+        args.jobs,
+        ordered=not args.completion_order,
+        log_dir=args.log_dir,
+        token_cache=args.token_cache,
+        chunk_size=args.chunk_size,
+        tables=tables,
+    ):
+        print(f"{result.path}\t{result.status}\t{result.diagnostic}")
+        if result.status:
+            failed += 1
+            worst = max(worst, result.status)
+    print(
+        f"{len(paths)} files, {failed} failed, {time.perf_counter() - started:.2f}s",
+        file=sys.stderr,
+    )
+    return worst
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
@@ -0,0 +1,1054 @@
+#!/usr/bin/env python3
+"""Benchmarks for the exp_codex parser experiments.
+
+Each subcommand generates a synthetic subC corpus (or reads a source file),
+times one experiment against the baseline behaviour, and prints a short
+tab-separated report.  Table construction happens once at import and is not
+included in any measurement unless a subcommand says otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import pathlib
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Sequence, Tuple
+
+try:
+    from . import async_batch, batch, lexer, parser, reduction_log, syntax_tree  # type: ignore
+    from . import table_file  # type: ignore
+except ImportError:  # pragma: no cover - fallback for script execution
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    import async_batch  # type: ignore
+    import batch  # type: ignore
+    import lexer  # type: ignore
+    import parser  # type: ignore
+    import reduction_log  # type: ignore
+    import syntax_tree  # type: ignore
+    import table_file  # type: ignore
+
+
+_EXPRESSIONS = (
+    "a + b * c",
+    "(x - 1) * (y + 2) / 3",
+    "p->next->value % 7",
+    "s.items[i + 1] == k || !done && count < limit",
+    "f(a, b, c) + g()",
+    "-*ptr + &value[2]",
+    "i++ + --j",
+    "'c' != name[0]",
+    "NULL == node",
+)
+
+_STATEMENTS = (
+    "x = {e};",
+    "if ({e}) x = 1; else y = 2;",
+    "while ({e}) {{ i = i + 1; }}",
+    "for (i = 0; i < n; i++) {{ total = total + {e}; }}",
+    "return {e};",
+    "{{ int t; t = {e}; }}",
+    "if ({e}) {{ break; }}",
+    ";",
+)
+
+
+def generate_program(functions: int, statements: int, seed: int = 0) -> str:
+    """Return a syntactically valid subC program with the requested shape."""
+    rng = random.Random(seed)
+    parts: List[str] = [
+        "struct node { int value; struct node *next; };",
+        "int table[64];",
+    ]
+    for index in range(functions):
+        body: List[str] = []
+        for _ in range(statements):
+            template = rng.choice(_STATEMENTS)
+            body.append("    " + template.format(e=rng.choice(_EXPRESSIONS)))
+        parts.append(
+            f"int f{index}(int a, int b, char *name) {{\n"
+            "    int x; int y; int i;\n" + "\n".join(body) + "\n    return x;\n}"
+        )
+    return "\n\n".join(parts) + "\n"
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _load_source(args: argparse.Namespace) -> str:
+    if args.source:
+        with open(args.source, "r", encoding="utf-8") as handle:
+            return handle.read()
+    return generate_program(args.functions, args.statements)
+
+
+def bench_log_format(args: argparse.Namespace) -> None:
+    tokens = lexer.tokenize(_load_source(args))
+
+    def run_text() -> str:
+        buffer = io.StringIO()
+        parser.parse(tokens, parser.text_emitter(buffer.write))
+        return buffer.getvalue()
+
+    def run_binary() -> bytes:
+        buffer = io.BytesIO()
+        with reduction_log.ReductionLogWriter(buffer, parser.REDUCTION_TEXTS) as writer:
+            parser.parse(tokens, writer.append)
+        return buffer.getvalue()
+
+    text = run_text()
+    binary = run_binary()
+    log = reduction_log.ReductionLog(binary)
+    decoded = io.StringIO()
+    log.write_text(decoded)
+    assert decoded.getvalue() == text, "binary log does not round-trip"
+
+    text_time = _best_of(args.repeat, run_text)
+    binary_time = _best_of(args.repeat, run_binary)
+    decode_time = _best_of(args.repeat, lambda: log.write_text(io.StringIO()))
+    step = max(1, len(log) // 1000)
+    lookups = range(0, len(log), step)
+    random_time = _best_of(args.repeat, lambda: [log[i] for i in lookups])
+
+    print(f"reductions\t{len(log)}")
+    print(f"text_bytes\t{len(text.encode('utf-8'))}")
+    print(f"binary_bytes\t{len(binary)}\t({len(text.encode('utf-8')) / len(binary):.1f}x smaller)")
+    print(f"parse_text_s\t{text_time:.4f}")
+    print(f"parse_binary_s\t{binary_time:.4f}")
+    print(f"decode_text_s\t{decode_time:.4f}")
+    print(f"random_access_us\t{random_time / len(lookups) * 1e6:.2f}")
+
+
+def bench_token_cache(args: argparse.Namespace) -> None:
+    source = _load_source(args)
+    tokens = lexer.tokenize(source)
+    data = lexer.dump_tokens(tokens)
+    assert lexer.load_tokens(data) == tokens, "token stream does not round-trip"
+
+    lex_time = _best_of(args.repeat, lambda: lexer.tokenize(source))
+    load_time = _best_of(args.repeat, lambda: lexer.load_tokens(data))
+    dump_time = _best_of(args.repeat, lambda: lexer.dump_tokens(tokens))
+
+    print(f"tokens\t{len(tokens)}")
+    print(f"source_bytes\t{len(source.encode('utf-8'))}")
+    print(f"cache_bytes\t{len(data)}")
+    print(f"tokenize_s\t{lex_time:.4f}")
+    print(f"load_s\t{load_time:.4f}\t({lex_time / load_time:.1f}x faster)")
+    print(f"dump_s\t{dump_time:.4f}")
+
+
+def bench_result_cache(args: argparse.Namespace) -> None:
+    """Uncached lex and parse versus result cache misses and hits."""
+    sources = [generate_program(2, 10, seed=index) for index in range(args.files)]
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "results.db")
+
+        def uncached() -> None:
+            for source in sources:
+                parser.parse(lexer.tokenize(source), bytearray().append)
+
+        def cached() -> None:
+            with parser.open_result_cache(database) as cache:
+                for source in sources:
+                    parser.parse_cached(source, cache)
+
+        uncached_time = _best_of(args.repeat, uncached)
+        started = time.perf_counter()
+        cached()
+        miss_time = time.perf_counter() - started
+        hit_time = _best_of(args.repeat, cached)
+
+        with parser.open_result_cache(database) as cache:
+            expected = bytearray()
+            parser.parse(lexer.tokenize(sources[0]), expected.append)
+            result = parser.parse_cached(sources[0], cache)
+            assert result.reductions == expected, "cached log differs"
+            stats = cache.stats()
+        print(f"files\t{len(sources)}\tdatabase_bytes={os.path.getsize(database)}")
+        print(f"uncached\t{len(sources) / uncached_time:.0f} files/s")
+        print(f"cold_misses\t{len(sources) / miss_time:.0f} files/s\t(parse + store)")
+        print(f"warm_hits\t{len(sources) / hit_time:.0f} files/s"
+              f"\t({uncached_time / hit_time:.1f}x uncached)")
+        print(f"counters\thits={stats.hits}\tmisses={stats.misses}\tentries={stats.entries}")
+
+
+def bench_incremental(args: argparse.Namespace) -> None:
+    """Single-function edits: full reparse versus :class:`parser.IncrementalParser`."""
+    source = _load_source(args)
+    rng = random.Random(0)
+    incremental = parser.IncrementalParser()
+    incremental.reductions(lexer.tokenize(source))
+    print(f"functions\t{args.functions}\tcold_parsed={incremental.parsed}")
+
+    full_times: List[float] = []
+    incremental_times: List[float] = []
+    lex_times: List[float] = []
+    reuse: List[float] = []
+    for edit in range(args.edits):
+        function = rng.randrange(args.functions)
+        anchor = source.index("    return x;\n}", source.index(f"int f{function}("))
+        source = f"{source[:anchor]}    x = x + {edit};\n{source[anchor:]}"
+
+        started = time.perf_counter()
+        tokens = lexer.tokenize(source)
+        lex_times.append(time.perf_counter() - started)
+        expected = bytearray()
+        started = time.perf_counter()
+        parser.parse(tokens, expected.append)
+        full_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        log = incremental.reductions(tokens)
+        incremental_times.append(time.perf_counter() - started)
+        assert log == expected, "incremental log differs from a full parse"
+        reuse.append(incremental.reused / (incremental.reused + incremental.parsed))
+
+    full = sorted(full_times)[len(full_times) // 2]
+    partial = sorted(incremental_times)[len(incremental_times) // 2]
+    print(f"edits\t{args.edits}\ttokens={len(tokens)}")
+    print(f"reuse_rate\t{sum(reuse) / len(reuse):.4f}\t(definitions reused per edit)")
+    print(f"tokenize_s\t{sorted(lex_times)[len(lex_times) // 2]:.4f}\t(median, not incremental)")
+    print(f"full_parse_s\t{full:.4f}\t(median)")
+    print(f"incremental_s\t{partial:.4f}\t(median)\t{full / partial:.1f}x")
+
+
+_RELEX_EDITS = {
+    # kind: (text inserted, characters deleted)
+    "type": ("y", 0),
+    "delete": ("", 1),
+    "newline": ("\n", 0),
+    "comment": (" /* a /* nested */ note */ ", 0),
+    "string": (' "text" ', 0),
+    "continued": (' "ab\\\ncd" ', 0),
+}
+
+# Strings continued with a backslash-newline are the tokens that span lines.
+_CONTINUED_SOURCE = 'int f() {\n  s = "ab\\\ncd";\n  x = 1;\n}\n'
+
+
+def _relex_matches(source: str, offset: int, deleted: int, inserted: str) -> bool:
+    """Whether one edit of ``source`` relexes to what ``tokenize`` gives, errors included."""
+    edited = source[:offset] + inserted + source[offset + deleted :]
+    incremental = lexer.IncrementalLexer(source)
+    try:
+        incremental.edit(offset, deleted, inserted)
+        actual: object = incremental.tokens
+    except lexer.LexerError as exc:
+        actual = str(exc)
+    try:
+        expected: object = lexer.tokenize(edited)
+    except lexer.LexerError as exc:
+        expected = str(exc)
+    return actual == expected
+
+
+def bench_relex(args: argparse.Namespace) -> None:
+    """Edit latency of :class:`lexer.IncrementalLexer` versus a full ``tokenize``."""
+    source = _load_source(args)
+    rng = random.Random(0)
+    full_time = _best_of(args.repeat, lambda: lexer.tokenize(source))
+    incremental = lexer.IncrementalLexer(source)
+    print(f"chars\t{len(source)}\ttokens={len(incremental.tokens)}")
+    print(f"tokenize_s\t{full_time:.4f}")
+    for kind, (text, deleted) in _RELEX_EDITS.items():
+        latencies: List[float] = []
+        relexed: List[int] = []
+        for _ in range(args.edits):
+            # Edit at a token boundary so every edit keeps the buffer lexable.
+            token = incremental.tokens[rng.randrange(len(incremental.tokens) - 1)]
+            offset = _offset_of(incremental.source, token)
+            started = time.perf_counter()
+            incremental.edit(offset, min(deleted, len(token.lexeme)), text)
+            latencies.append(time.perf_counter() - started)
+            relexed.append(incremental.relexed)
+        latencies.sort()
+        print(
+            f"{kind}\tp50_ms={latencies[len(latencies) // 2] * 1e3:.3f}"
+            f"\tp99_ms={latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] * 1e3:.3f}"
+            f"\trelexed_tokens={sum(relexed) / len(relexed):.1f}"
+        )
+    assert incremental.tokens == lexer.tokenize(incremental.source), "incremental tokens differ"
+    mismatches = [
+        (offset, deleted, inserted)
+        for offset in range(len(_CONTINUED_SOURCE))
+        for deleted, inserted in ((0, "y"), (1, ""), (0, "\n"), (0, '"'), (0, "\\"))
+        if not _relex_matches(_CONTINUED_SOURCE, offset, deleted, inserted)
+    ]
+    assert not mismatches, f"continued string edits relex differently: {mismatches[:3]}"
+
+
+def bench_reparse(args: argparse.Namespace) -> None:
+    """Edit latency of :class:`parser.IncrementalLRParser` as the file grows.
+
+    Every edit inserts a statement into a random function through
+    :class:`lexer.IncrementalLexer`; each reparse is checked against a full
+    :func:`parser.parse` of the edited stream.
+    """
+    rng = random.Random(0)
+    sizes = sorted({max(1, args.functions // 16), max(1, args.functions // 4), args.functions})
+    for functions in sizes:
+        buffer = lexer.IncrementalLexer(generate_program(functions, args.statements))
+        incremental = parser.IncrementalLRParser()
+        started = time.perf_counter()
+        incremental.parse(buffer.tokens)
+        initial_time = time.perf_counter() - started
+        full_time = _best_of(args.repeat, lambda: parser.parse(buffer.tokens, bytearray().append))
+
+        latencies: List[float] = []
+        reused: List[float] = []
+        for edit in range(args.edits):
+            function = rng.randrange(functions)
+            body = buffer.source.index(f"int f{function}(")
+            anchor = buffer.source.index("    return x;", body)
+            splice = buffer.edit(anchor, 0, f"x = x + {edit};\n")
+            started = time.perf_counter()
+            incremental.parse(buffer.tokens, splice)
+            latencies.append(time.perf_counter() - started)
+            reused.append(incremental.reused_tokens / (len(buffer.tokens) - 1))
+            expected = bytearray()
+            parser.parse(buffer.tokens, expected.append)
+            assert bytes(incremental.reductions()) == expected, "incremental reparse differs"
+
+        latencies.sort()
+        print(
+            f"functions={functions}\ttokens={len(buffer.tokens)}"
+            f"\tfull_parse_ms={full_time * 1e3:.1f}\ttree_build_ms={initial_time * 1e3:.1f}"
+            f"\treparse_p50_ms={latencies[len(latencies) // 2] * 1e3:.3f}"
+            f"\treparse_p99_ms={_percentile(latencies, 0.99) * 1e3:.3f}"
+            f"\ttokens_reused={sum(reused) / len(reused):.4f}"
+        )
+
+    # Typing a character literal goes through a buffer that does not lex;
+    # the repairing edit's splice must still fit the last parsed stream.
+    buffer = lexer.IncrementalLexer("int f(){ x = 1; }")
+    incremental = parser.IncrementalLRParser()
+    incremental.parse(buffer.tokens)
+    offset = buffer.source.index("1")
+    try:
+        buffer.edit(offset, 1, "'")
+    except lexer.LexerError:
+        pass
+    else:
+        raise AssertionError("an unterminated character literal lexed")
+    splice = buffer.edit(offset, 1, "'c'")
+    incremental.parse(buffer.tokens, splice)
+    expected = bytearray()
+    parser.parse(buffer.tokens, expected.append)
+    assert bytes(incremental.reductions()) == expected, "reparse after a lexer error differs"
+
+
+def bench_tree(args: argparse.Namespace) -> None:
+    """Cost of :func:`parser.build_tree` over printing reductions, and bytes per node."""
+    tokens = lexer.tokenize(_load_source(args))
+
+    def print_only() -> None:
+        parser.parse(tokens, parser.text_emitter(io.StringIO().write))
+
+    check_time = _best_of(args.repeat, lambda: parser.check(tokens))
+    print_time = _best_of(args.repeat, print_only)
+    arena_time = _best_of(args.repeat, lambda: parser.build_tree(tokens))
+    objects_time = _best_of(args.repeat, lambda: parser.IncrementalLRParser().parse(tokens))
+
+    def retained(build: Callable[[], object]) -> int:
+        tracemalloc.start()
+        try:
+            kept = build()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del kept
+        return size
+
+    tree = parser.build_tree(tokens)
+    log = bytearray()
+    parser.parse(tokens, log.append)
+    assert bytes(tree.reductions()) == log, "tree reductions differ from the parse log"
+    arena_bytes = retained(lambda: parser.build_tree(tokens))
+    objects_bytes = retained(lambda: parser.IncrementalLRParser().parse(tokens))
+    # The object tree keeps token kinds instead of leaf nodes; count its
+    # interior nodes only so the per-node figures compare like for like.
+    interior = len(log)
+    print(f"tokens\t{len(tokens)}\tnodes={len(tree)}\tinterior={interior}")
+    print(f"check_s\t{check_time:.4f}")
+    print(f"print_s\t{print_time:.4f}\t(text reductions into a buffer)")
+    print(f"arena_tree_s\t{arena_time:.4f}\t{arena_time / print_time:.2f}x print")
+    print(f"object_tree_s\t{objects_time:.4f}\t{objects_time / print_time:.2f}x print")
+    print(
+        f"arena_bytes\t{arena_bytes}\t{arena_bytes / len(tree):.1f}/node"
+        f"\t({tree.nbytes / len(tree):.0f} in use)"
+    )
+    print(f"object_bytes\t{objects_bytes}\t{objects_bytes / interior:.1f}/interior node")
+
+
+def _walk(tree: syntax_tree.SyntaxTree, token_kind: Callable[[int], str]) -> int:
+    """Visit every node in preorder and look at each token's kind, like an analysis pass."""
+    identifiers = 0
+    productions = tree.productions
+    starts = tree.starts
+    for node in tree.preorder():
+        if productions[node] == syntax_tree.TOKEN and token_kind(starts[node]) == "ID":
+            identifiers += 1
+    return identifiers
+
+
+def bench_tree_file(args: argparse.Namespace) -> None:
+    """Load-and-walk of a mapped syntax tree file versus reparsing the source."""
+    source = _load_source(args)
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, "input.txt")
+        tree_path = os.path.join(directory, "input.tree")
+        with open(source_path, "w", encoding="utf-8") as handle:
+            handle.write(source)
+        tokens = lexer.tokenize(source)
+        tree = parser.build_tree(tokens)
+        data = syntax_tree.encode_tree(tree, tokens, parser.GRAMMAR_FINGERPRINT)
+        with open(tree_path, "wb") as handle:
+            handle.write(data)
+        expected = _walk(tree, lambda index: tokens[index].kind)
+
+        def reparse() -> int:
+            fresh = lexer.lex_file(source_path)
+            return _walk(parser.build_tree(fresh), lambda index: fresh[index].kind)
+
+        def load() -> int:
+            mapped = syntax_tree.MappedSyntaxTree.open(tree_path, parser.GRAMMAR_FINGERPRINT)
+            return _walk(mapped, mapped.token_kind)
+
+        assert reparse() == load() == expected, "mapped tree walk differs from a reparse"
+        open_time = _best_of(
+            args.repeat,
+            lambda: syntax_tree.MappedSyntaxTree.open(tree_path, parser.GRAMMAR_FINGERPRINT),
+        )
+        reparse_time = _best_of(args.repeat, reparse)
+        load_time = _best_of(args.repeat, load)
+    print(f"tokens\t{len(tokens)}\tnodes={len(tree)}\tfile_bytes={len(data)}")
+    print(f"open_s\t{open_time:.6f}\t(map and validate only)")
+    print(f"reparse_walk_s\t{reparse_time:.4f}\t(read, tokenize, build_tree, walk)")
+    print(f"load_walk_s\t{load_time:.4f}\t{reparse_time / load_time:.1f}x")
+
+
+def _repository_sources() -> List[str]:
+    """The subC inputs checked into this repository that parse."""
+    root = pathlib.Path(__file__).resolve().parents[3]
+    specs = [str(root / "test"), str(root / "llm_lex_parse")]
+    sources = []
+    for path in batch.collect_paths(specs, "*input*.txt"):
+        source = batch.read_source(path)
+        try:
+            parser.check(lexer.tokenize(source))
+        except (lexer.LexerError, parser.ParseError):
+            continue
+        sources.append(source)
+    return sources
+
+
+def bench_shared_tree(args: argparse.Namespace) -> None:
+    """Hash-consed trees (:class:`syntax_tree.SubtreeTable`) versus one arena per file."""
+    corpora = {
+        "generated": [generate_program(2, 10, seed=index) for index in range(args.files)],
+        "repository": _repository_sources(),
+    }
+    for name, sources in corpora.items():
+        token_lists = [lexer.tokenize(source) for source in sources]
+
+        def arenas() -> List[syntax_tree.SyntaxTree]:
+            return [parser.build_tree(tokens) for tokens in token_lists]
+
+        def shared() -> syntax_tree.SubtreeTable:
+            table = syntax_tree.SubtreeTable()
+            for tokens in token_lists:
+                parser.build_shared_tree(tokens, table)
+            return table
+
+        arena_time = _best_of(args.repeat, arenas)
+        shared_time = _best_of(args.repeat, shared)
+        tracemalloc.start()
+        trees = arenas()
+        arena_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        tracemalloc.start()
+        table = shared()
+        shared_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        arena_nodes = sum(len(tree) for tree in trees)
+        unique = len(table)
+        dedup = table.lookups / table.created
+        for tokens, tree in zip(token_lists, trees):
+            root = parser.build_shared_tree(tokens, table)
+            assert bytes(table.reductions(root)) == bytes(tree.reductions()), "shared tree differs"
+        del trees
+        print(
+            f"{name}\tfiles={len(sources)}\tnodes={arena_nodes}\tunique={unique}"
+            f"\tdedup={dedup:.1f}x"
+        )
+        print(
+            f"{name}\tarena_bytes={arena_bytes}\tshared_bytes={shared_bytes}"
+            f"\tsaved={1 - shared_bytes / arena_bytes:.1%}"
+        )
+        print(f"{name}\tarena_s={arena_time:.4f}\tshared_s={shared_time:.4f}")
+
+    # Per-batch eviction: the table stays near ``max_nodes`` over a corpus
+    # whose unique subtrees would not fit.
+    batch_size = 50
+    sources = [generate_program(4, 20, seed=index) for index in range(args.files)]
+    unbounded = syntax_tree.SubtreeTable()
+    for source in sources:
+        parser.build_shared_tree(lexer.tokenize(source), unbounded)
+    bounded = syntax_tree.SubtreeTable(max_nodes=len(unbounded) // 4)
+    peak = 0
+    for start in range(0, len(sources), batch_size):
+        for source in sources[start : start + batch_size]:
+            parser.build_shared_tree(lexer.tokenize(source), bounded)
+        peak = max(peak, len(bounded))
+        bounded.next_batch()
+    print(
+        f"eviction\tunbounded={len(unbounded)}\tmax_nodes={bounded.max_nodes}"
+        f"\tpeak={peak}\tevicted={bounded.evicted}"
+        f"\tdedup={bounded.lookups / bounded.created:.1f}x"
+        f" (unbounded {unbounded.lookups / unbounded.created:.1f}x)"
+    )
+
+
+def bench_recovery(args: argparse.Namespace) -> None:
+    """:func:`parser.parse_recovering` versus first-error parsing.
+
+    Valid input measures the cost of the recovering driver itself.  Broken
+    input has one error in each of ``--edits`` functions; first-error mode
+    needs a fix-and-rerun cycle per error to find them all.
+    """
+    source = _load_source(args)
+    tokens = lexer.tokenize(source)
+    check_time = _best_of(args.repeat, lambda: parser.check(tokens))
+    recover_time = _best_of(args.repeat, lambda: parser.parse_recovering(tokens))
+    assert not parser.parse_recovering(tokens), "valid input reported errors"
+    print(f"valid\ttokens={len(tokens)}")
+    print(f"first_error_s\t{check_time:.4f}\t{len(tokens) / check_time:,.0f} tokens/s")
+    print(
+        f"recovering_s\t{recover_time:.4f}\t{len(tokens) / recover_time:,.0f} tokens/s"
+        f"\t{recover_time / check_time - 1:+.1%}"
+    )
+
+    statement, broken_statement = "    return x;\n", "    return x + ;\n"
+    lines = source.splitlines(keepends=True)
+    candidates = [number for number, line in enumerate(lines) if line == statement]
+    broken_lines = sorted(random.Random(0).sample(candidates, min(args.edits, len(candidates))))
+    for number in broken_lines:
+        lines[number] = broken_statement
+    broken = "".join(lines)
+
+    def rerun_until_clean() -> int:
+        current = list(lines)
+        cycles = 0
+        while True:
+            cycles += 1
+            try:
+                parser.check(lexer.tokenize("".join(current)))
+            except parser.ParseError as exc:
+                current[exc.token.line - 1] = statement
+                continue
+            return cycles
+
+    def one_pass() -> List[parser.ParseError]:
+        return parser.parse_recovering(lexer.tokenize(broken), max_errors=len(broken_lines) + 1)
+
+    errors = one_pass()
+    assert [error.token.line - 1 for error in errors] == broken_lines, "recovery missed errors"
+    assert rerun_until_clean() == len(broken_lines) + 1
+    rerun_time = _best_of(args.repeat, rerun_until_clean)
+    pass_time = _best_of(args.repeat, one_pass)
+    print(f"broken\terrors={len(broken_lines)}")
+    print(f"rerun_cycles_s\t{rerun_time:.4f}\t({len(broken_lines) + 1} tokenize+check runs)")
+    print(f"one_pass_s\t{pass_time:.4f}\t{rerun_time / pass_time:.1f}x")
+
+
+def _offset_of(source: str, token: lexer.Token) -> int:
+    position = 0
+    for _ in range(token.line - 1):
+        position = source.index("\n", position) + 1
+    return position + token.column - 1
+
+
+def bench_check(args: argparse.Namespace) -> None:
+    source = _load_source(args)
+    tokens = lexer.tokenize(source)
+    emit = parser.text_emitter(io.StringIO().write)
+
+    full_time = _best_of(args.repeat, lambda: parser.parse(tokens, emit))
+    check_time = _best_of(args.repeat, lambda: parser.check(tokens))
+    size = len(source.encode("utf-8"))
+
+    print(f"tokens\t{len(tokens)}")
+    print(f"full_s\t{full_time:.4f}\t{size / full_time / 1e6:.2f} MB/s")
+    print(f"check_s\t{check_time:.4f}\t{size / check_time / 1e6:.2f} MB/s")
+    print(f"speedup\t{full_time / check_time:.2f}x")
+
+
+def bench_fast_path(args: argparse.Namespace) -> None:
+    tokens = lexer.tokenize(_load_source(args))
+    emit = parser.text_emitter(io.StringIO().write)
+
+    rows = (
+        ("diagnostic_full_s", lambda: parser._diagnostic_drive(tokens, emit)),
+        ("fast_full_s", lambda: parser._fast_drive(tokens, emit)),
+        ("diagnostic_check_s", lambda: parser._diagnostic_drive(tokens, None)),
+        ("fast_check_s", lambda: parser._fast_drive(tokens, None)),
+    )
+    timings = {name: _best_of(args.repeat, func) for name, func in rows}
+
+    print(f"tokens\t{len(tokens)}")
+    for name, seconds in timings.items():
+        print(f"{name}\t{seconds:.4f}")
+    print(f"full_speedup\t{timings['diagnostic_full_s'] / timings['fast_full_s']:.2f}x")
+    print(f"check_speedup\t{timings['diagnostic_check_s'] / timings['fast_check_s']:.2f}x")
+
+
+_EXT_DEFS = (
+    "struct node {{ int value; struct node *next; }};",
+    "int table{i}[64];",
+    "char *name{i};",
+    "int f{i}(int a) {{ return a + 1; }}",
+)
+
+
+def generate_snippets(count: int, seed: int = 0) -> List[Tuple[str, str, str]]:
+    """Return ``(start, snippet, wrapped program)`` triples for the linting workload."""
+    rng = random.Random(seed)
+    snippets: List[Tuple[str, str, str]] = []
+    for index in range(count):
+        expression = rng.choice(_EXPRESSIONS)
+        statement = rng.choice(_STATEMENTS).format(e=rng.choice(_EXPRESSIONS))
+        ext_def = rng.choice(_EXT_DEFS).format(i=index)
+        snippets.append(("expr", expression, f"int f() {{ {expression}; }}"))
+        snippets.append(("stmt", statement, f"int f() {{ {statement} }}"))
+        snippets.append(("ext_def", ext_def, ext_def))
+    return snippets
+
+
+def bench_snippets(args: argparse.Namespace) -> None:
+    snippets = generate_snippets(args.functions * 5)
+    counts = {"tokens": [0, 0], "reductions": [0, 0]}
+    for start, snippet, wrapped in snippets:
+        for column, (text, entry) in enumerate(((wrapped, "program"), (snippet, start))):
+            reductions: List[int] = []
+            tokens = lexer.tokenize(text)
+            parser.parse(tokens, reductions.append, entry)
+            counts["tokens"][column] += len(tokens)
+            counts["reductions"][column] += len(reductions)
+
+    def run_wrapped() -> None:
+        for _, _, wrapped in snippets:
+            parser.check(lexer.tokenize(wrapped))
+
+    def run_direct() -> None:
+        for start, snippet, _ in snippets:
+            parser.check(lexer.tokenize(snippet), start)
+
+    wrapped_time = _best_of(args.repeat, run_wrapped)
+    direct_time = _best_of(args.repeat, run_direct)
+    print(f"snippets\t{len(snippets)}")
+    for name, (wrapped, direct) in counts.items():
+        print(f"{name}_per_snippet\t{wrapped / len(snippets):.1f} -> {direct / len(snippets):.1f}")
+    print(f"wrapped_us\t{wrapped_time / len(snippets) * 1e6:.1f}")
+    print(f"direct_us\t{direct_time / len(snippets) * 1e6:.1f}")
+    print(f"speedup\t{wrapped_time / direct_time:.2f}x")
+
+
+def bench_parallel(args: argparse.Namespace) -> None:
+    tokens = lexer.tokenize(_load_source(args))
+    sequential_log: List[int] = []
+    parser.parse(tokens, sequential_log.append)
+
+    # Serial and parallelisable parts, measured in this process.
+    split_time = _best_of(args.repeat, lambda: parser.split_ext_defs(tokens))
+    ends = parser.split_ext_defs(tokens)
+    assert ends is not None, "benchmark input does not split"
+    plan = parser._plan_batches(ends, len(tokens), 1)
+    parser._batch_tokens = tokens
+    batch_time = _best_of(args.repeat, lambda: [parser._parse_ext_def_batch(b) for b in plan])
+    stitched = b"".join(parser._parse_ext_def_batch(b) or b"" for b in plan)
+    parser._batch_tokens = ()
+
+    def discard(production_index: int) -> None:
+        pass
+
+    def stitch() -> None:
+        for production_index in stitched:
+            discard(production_index)
+
+    stitch_time = _best_of(args.repeat, stitch)
+    sequential_time = _best_of(args.repeat, lambda: parser.parse(tokens, discard))
+
+    print(f"tokens\t{len(tokens)}")
+    print(f"ext_defs\t{len(ends)}")
+    print(f"cpu_count\t{os.cpu_count()}")
+    print(f"sequential_s\t{sequential_time:.4f}")
+    print(f"split_s\t{split_time:.4f}\tbatch_parse_s\t{batch_time:.4f}\tstitch_s\t{stitch_time:.4f}")
+    for workers in range(1, args.workers + 1):
+        parallel_log: List[int] = []
+        parser.parse_parallel(tokens, parallel_log.append, workers)
+        assert parallel_log == sequential_log, "parallel log differs from sequential parse"
+        seconds = _best_of(args.repeat, lambda: parser.parse_parallel(tokens, discard, workers))
+        ideal = split_time + stitch_time + batch_time / workers
+        print(
+            f"workers={workers}\tmeasured_s={seconds:.4f}\tspeedup={sequential_time / seconds:.2f}x"
+            f"\testimated_ceiling={sequential_time / ideal:.2f}x"
+        )
+
+
+def _write_corpus(directory: str, files: int) -> List[str]:
+    """Write ``files`` small generated programs into ``directory``."""
+    paths = []
+    for index in range(files):
+        path = os.path.join(directory, f"{index:05d}.txt")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(generate_program(2, 10, seed=index))
+        paths.append(path)
+    return paths
+
+
+def _process_per_file_seconds(path: str) -> float:
+    """Time one ``parser.py --check`` run, which builds the tables itself."""
+    script = str(pathlib.Path(parser.__file__).resolve())
+    started = time.perf_counter()
+    subprocess.run([sys.executable, script, "--check", path], check=True)
+    return time.perf_counter() - started
+
+
+def bench_batch(args: argparse.Namespace) -> None:
+    """One ``parser.py`` process per file versus :func:`batch.parse_files`."""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _write_corpus(directory, args.files)
+        process_time = _process_per_file_seconds(paths[0])
+
+        reference = [result.status for result in batch.parse_files(paths, workers=1)]
+        assert reference == [0] * len(paths), "generated corpus does not parse"
+        # workers=1 parses in this process: the pure per-file parsing cost.
+        in_process = _best_of(args.repeat, lambda: list(batch.parse_files(paths, workers=1)))
+        per_file = in_process / len(paths)
+
+        print(f"files\t{len(paths)}")
+        print(f"cpu_count\t{os.cpu_count()}")
+        print(f"process_per_file_s\t{process_time:.3f}")
+        print(f"in_process_ms_per_file\t{per_file * 1e3:.3f}")
+        print(f"process_per_file_total_s\t{process_time * len(paths):.1f}\t(projected)")
+        for workers in range(2, args.workers + 1):
+            for ordered in (True, False):
+                results = list(batch.parse_files(paths, workers, ordered=ordered))
+                assert sorted(result.index for result in results) == list(range(len(paths)))
+                seconds = _best_of(
+                    args.repeat, lambda: list(batch.parse_files(paths, workers, ordered=ordered))
+                )
+                overhead = seconds / len(paths) - per_file
+                print(
+                    f"workers={workers}\t{'ordered' if ordered else 'completion'}"
+                    f"\ttotal_s={seconds:.3f}\toverhead_ms_per_file={overhead * 1e3:.3f}"
+                    f"\tspeedup_vs_process_per_file={process_time * len(paths) / seconds:.0f}x"
+                )
+
+
+def bench_threads(args: argparse.Namespace) -> None:
+    """Thread scaling of :func:`parser.parse_many` over the shared module tables.
+
+    On a free-threaded build (``python3.13t``) the workers parse in
+    parallel; on a GIL build the interesting number is threads=1 against
+    the plain sequential loop, i.e. what the pool costs.
+    """
+    sources = [generate_program(8, args.statements, seed=index) for index in range(64)]
+    size = sum(len(source.encode("utf-8")) for source in sources)
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python\t{sys.version.split()[0]}\tgil={'on' if gil_enabled else 'off'}")
+    print(f"sources\t{len(sources)}\t{size / 1e6:.2f} MB")
+
+    def sequential() -> List[object]:
+        return [parser._parse_result(source, "program", 1, None) for source in sources]
+
+    expected = sequential()
+    assert all(result.status == 0 for result in expected), "corpus does not parse"
+    assert list(parser.parse_many(sources, 8)) == expected, "threads disagree"
+
+    baseline = _best_of(args.repeat, sequential)
+    print(f"sequential_s={baseline:.4f}\t{size / baseline / 1e6:.2f} MB/s")
+    for threads in (1, 2, 4, 8):
+        seconds = _best_of(args.repeat, lambda: list(parser.parse_many(sources, threads)))
+        print(
+            f"threads={threads}\ts={seconds:.4f}\t{size / seconds / 1e6:.2f} MB/s"
+            f"\tspeedup={baseline / seconds:.2f}x"
+        )
+
+
+def bench_async(args: argparse.Namespace) -> None:
+    """End-to-end files/sec of :func:`async_batch.parse_files` on a directory."""
+
+    async def drain(paths: List[str], concurrency: int) -> List[object]:
+        return [
+            result
+            async for result in async_batch.parse_files(paths, concurrency, workers=args.workers)
+        ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        paths = _write_corpus(directory, args.files)
+        write_time = time.perf_counter() - started
+        process_time = _process_per_file_seconds(paths[0])
+
+        statuses = sorted(
+            (result.index, result.status) for result in asyncio.run(drain(paths, 64))
+        )
+        assert statuses == [(index, 0) for index in range(len(paths))], "corpus does not parse"
+        sync_time = _best_of(
+            args.repeat, lambda: list(batch.parse_files(paths, args.workers, ordered=False))
+        )
+
+        print(f"files\t{len(paths)}\twrite_s={write_time:.2f}")
+        print(f"cpu_count\t{os.cpu_count()}\tworkers={args.workers}")
+        print(f"process_per_file\t{1 / process_time:.3f} files/s\t(one parser.py per file)")
+        print(f"batch_sync\t{len(paths) / sync_time:.0f} files/s")
+        for concurrency in (8, 64, 256):
+            seconds = _best_of(args.repeat, lambda: asyncio.run(drain(paths, concurrency)))
+            print(f"async\tconcurrency={concurrency}\t{len(paths) / seconds:.0f} files/s")
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_daemon(args: argparse.Namespace) -> None:
+    """Request latency and throughput of ``daemon.py`` versus one process per file."""
+    script = str(pathlib.Path(parser.__file__).resolve().with_name("daemon.py"))
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _write_corpus(directory, args.files)
+        process_time = _process_per_file_seconds(paths[0])
+        tables_path = os.path.join(directory, "parser.tbl")
+        parser.export_tables(tables_path)
+        socket_path = os.path.join(directory, "daemon.sock")
+
+        started = time.perf_counter()
+        daemon = subprocess.Popen(
+            [sys.executable, script, "--socket", socket_path, "--tables", tables_path,
+             "-j", str(args.workers)]
+        )
+        try:
+            while not os.path.exists(socket_path):
+                if daemon.poll() is not None:
+                    raise RuntimeError("daemon exited during start-up")
+                time.sleep(0.01)
+            startup_time = time.perf_counter() - started
+
+            # One client, one request at a time: the latency an editor sees.
+            latencies: List[float] = []
+            with socket.socket(socket.AF_UNIX) as client:
+                client.connect(socket_path)
+                replies = client.makefile("rb")
+                for index, path in enumerate(paths):
+                    sent = time.perf_counter()
+                    client.sendall(json.dumps({"id": index, "path": path}).encode() + b"\n")
+                    response = json.loads(replies.readline())
+                    latencies.append(time.perf_counter() - sent)
+                    assert response["status"] == 0, response
+
+            # Several clients, each pipelining all of its requests.
+            async def client_run(share: List[str]) -> None:
+                reader, writer = await asyncio.open_unix_connection(socket_path, limit=1 << 26)
+                for path in share:
+                    writer.write(json.dumps({"path": path, "check": True}).encode() + b"\n")
+                await writer.drain()
+                for _ in share:
+                    assert json.loads(await reader.readline())["status"] == 0
+                writer.close()
+
+            async def pipelined(clients: int) -> None:
+                shares = [paths[index::clients] for index in range(clients)]
+                await asyncio.gather(*(client_run(share) for share in shares))
+
+            async def stats() -> dict:
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                writer.write(b'{"op": "stats"}\n')
+                response = json.loads(await reader.readline())
+                writer.close()
+                return response["stats"]
+
+            print(f"files\t{len(paths)}\tcpu_count={os.cpu_count()}\tworkers={args.workers}")
+            print(f"process_per_file_ms\t{process_time * 1e3:.1f}\t(one parser.py per file)")
+            print(f"daemon_startup_ms\t{startup_time * 1e3:.1f}\t(--tables)")
+            print(
+                f"sequential\tp50_ms={_percentile(latencies, 0.5) * 1e3:.3f}"
+                f"\tp99_ms={_percentile(latencies, 0.99) * 1e3:.3f}"
+                f"\t{len(paths) / sum(latencies):.0f} req/s"
+            )
+            for clients in (1, 8):
+                seconds = _best_of(args.repeat, lambda: asyncio.run(pipelined(clients)))
+                print(f"pipelined\tclients={clients}\t{len(paths) / seconds:.0f} req/s")
+            report = asyncio.run(stats())
+            print(f"daemon_stats\tp50_ms={report['p50_ms']}\tp99_ms={report['p99_ms']}"
+                  f"\trequests={report['requests']}")
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+# Run in a fresh interpreter so the "mmap" parent never builds the dict
+# tables.  Each forked worker checks the corpus, runs a full collection (as a
+# long-lived worker eventually would) and reports its smaps_rollup in kB.
+_MEMORY_PROBE = """
+import gc, json, multiprocessing, sys
+sys.path.insert(0, sys.argv[1])
+import lexer, table_file
+mode, tables_path, source_path, workers, rounds = sys.argv[2:7]
+with open(source_path, encoding="utf-8") as handle:
+    tokens = lexer.tokenize(handle.read())
+if mode == "mmap":
+    tables = table_file.ParseTables.open(tables_path)
+else:
+    import parser as tables
+    if mode == "dict+freeze":
+        gc.freeze()
+
+def memory():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as handle:
+        for line in handle:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                fields[name] = int(rest.split()[0])
+    return fields
+
+def work(queue):
+    for _ in range(int(rounds)):
+        tables.check(tokens)
+    gc.collect()
+    fields = memory()
+    queue.put((fields["Rss"], fields["Pss"], fields["Private_Clean"] + fields["Private_Dirty"]))
+
+context = multiprocessing.get_context("fork")
+queue = context.Queue()
+processes = [context.Process(target=work, args=(queue,)) for _ in range(int(workers))]
+parent = memory()["Rss"]
+for process in processes:
+    process.start()
+results = [queue.get() for _ in processes]
+for process in processes:
+    process.join()
+print(json.dumps({"parent_rss": parent, "workers": results}))
+"""
+
+
+def bench_table_file(args: argparse.Namespace) -> None:
+    """Dict tables inherited through fork versus a shared mmap table file."""
+    source = _load_source(args)
+    tokens = lexer.tokenize(source)
+    directory = str(pathlib.Path(__file__).resolve().parent)
+    with tempfile.TemporaryDirectory() as temp:
+        tables_path = os.path.join(temp, "parser.tbl")
+        source_path = os.path.join(temp, "source.txt")
+        with open(source_path, "w", encoding="utf-8") as handle:
+            handle.write(source)
+        parser.export_tables(tables_path)
+        tables = table_file.ParseTables.open(tables_path)
+
+        dict_log: List[int] = []
+        mmap_log: List[int] = []
+        parser.parse(tokens, dict_log.append)
+        tables.parse(tokens, mmap_log.append)
+        assert dict_log == mmap_log, "table file reductions differ"
+
+        load_time = _best_of(args.repeat, lambda: table_file.ParseTables.open(tables_path))
+        dict_time = _best_of(args.repeat, lambda: parser.check(tokens))
+        mmap_time = _best_of(args.repeat, lambda: tables.check(tokens))
+        print(f"tokens\t{len(tokens)}")
+        print(f"table_file_bytes\t{os.path.getsize(tables_path)}")
+        print(f"open_ms\t{load_time * 1e3:.3f}")
+        print(f"dict_check_s\t{dict_time:.4f}\t{len(tokens) / dict_time / 1e6:.2f} Mtok/s")
+        print(f"mmap_check_s\t{mmap_time:.4f}\t{len(tokens) / mmap_time / 1e6:.2f} Mtok/s")
+
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            print("memory\tskipped (no /proc/self/smaps_rollup)")
+            return
+        for mode in ("dict", "dict+freeze", "mmap"):
+            completed = subprocess.run(
+                [sys.executable, "-c", _MEMORY_PROBE, directory, mode, tables_path,
+                 source_path, str(args.workers), "5"],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            report = json.loads(completed.stdout)
+            workers = report["workers"]
+            average = [sum(column) / len(workers) / 1024 for column in zip(*workers)]
+            print(
+                f"{mode}\tparent_rss_mb={report['parent_rss'] / 1024:.1f}"
+                f"\tworker_rss_mb={average[0]:.1f}\tworker_pss_mb={average[1]:.1f}"
+                f"\tworker_private_mb={average[2]:.1f}"
+            )
+
+
+SUBCOMMANDS = {
+    "async": bench_async,
+    "batch": bench_batch,
+    "check": bench_check,
+    "daemon": bench_daemon,
+    "fast-path": bench_fast_path,
+    "incremental": bench_incremental,
+    "log-format": bench_log_format,
+    "parallel": bench_parallel,
+    "recovery": bench_recovery,
+    "relex": bench_relex,
+    "reparse": bench_reparse,
+    "result-cache": bench_result_cache,
+    "shared-tree": bench_shared_tree,
+    "snippets": bench_snippets,
+    "table-file": bench_table_file,
+    "threads": bench_threads,
+    "tree": bench_tree,
+    "tree-file": bench_tree_file,
+    "token-cache": bench_token_cache,
+}
+
+
+def main(argv: Sequence[str]) -> int:
+    arg_parser = argparse.ArgumentParser(prog=argv[0], description=__doc__.splitlines()[0])
+    arg_parser.add_argument("benchmark", choices=sorted(SUBCOMMANDS))
+    arg_parser.add_argument("--source", help="benchmark this file instead of a generated corpus")
+    arg_parser.add_argument("--functions", type=int, default=200)
+    arg_parser.add_argument("--statements", type=int, default=40)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="largest pool for 'parallel' and 'batch'; "
+        "pool size for 'table-file', 'async' and 'daemon'",
+    )
+    arg_parser.add_argument(
+        "--edits",
+        type=int,
+        default=20,
+        help="edits for 'incremental', 'relex' and 'reparse'; errors for 'recovery'",
+    )
+    arg_parser.add_argument(
+        "--files",
+        type=int,
+        default=400,
+        help="corpus size for 'batch', 'async', 'daemon', 'result-cache' and 'shared-tree'",
+    )
+    args = arg_parser.parse_args(argv[1:])
+    SUBCOMMANDS[args.benchmark](args)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
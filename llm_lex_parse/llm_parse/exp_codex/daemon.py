@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""Long-running subC parser serving JSON-lines requests.
+
+Starting ``parser.py`` per file pays for interpreter start-up and the LR(1)
+table build every time.  The daemon builds (or maps) the tables once and
+answers requests over a Unix domain socket (``--socket``) or stdin/stdout
+(``--stdio``), one JSON object per line in each direction.
+
+Parse request::
+
+    {"id": 7, "source": "int x;"}            or  {"id": 7, "path": "a.txt"}
+    optional: "check": true, "format": "text" | "binary", "start": "program"
+
+Response::
+
+    {"id": 7, "status": 0, "diagnostic": "", "log": "ext_def_list->epsilon\\n..."}
+
+``status`` uses the exit codes of ``parser.py`` (0 ok, 1 unreadable path,
+2 lexer error, 3 syntax error).  ``log`` holds the text reductions; with
+``"format": "binary"`` it is replaced by ``log_base64``, a
+:mod:`reduction_log` file; with ``"check": true`` neither is sent.  A
+malformed request gets ``{"id": ..., "error": "..."}`` instead.
+
+``{"op": "stats"}`` returns request counts and p50/p99 latency (request
+read to response ready, over the most recent requests).
+
+A client may send any number of requests without waiting; responses come
+back in request order on each connection.  Requests from all connections
+are parsed concurrently in a forked worker pool that inherits the tables.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import io
+import json
+import multiprocessing
+import os
+import pathlib
+import signal
+import sys
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    Optional,
+    Sequence,
+    Set,
+)
+
+try:
+    from . import batch, lexer, reduction_log, table_file  # type: ignore
+except ImportError:  # pragma: no cover - fallback for script execution
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    import batch  # type: ignore
+    import lexer  # type: ignore
+    import reduction_log  # type: ignore
+    import table_file  # type: ignore
+
+# Requests one connection may have in flight before the daemon stops
+# reading from it.
+PIPELINE_DEPTH = 64
+# Longest request line accepted (sources are sent inline).
+MAX_LINE = 1 << 26
+LATENCY_WINDOW = 10_000
+
+
+class RequestError(ValueError):
+    """Raised for a request the daemon cannot interpret."""
+
+
+def _reduction_texts(tables: Any) -> Sequence[str]:
+    if isinstance(tables, table_file.ParseTables):
+        return tables.reduction_texts
+    return tables.REDUCTION_TEXTS
+
+
+def _entry_points(tables: Any) -> Collection[str]:
+    if isinstance(tables, table_file.ParseTables):
+        return tables.start_states.keys()
+    return tables.ENTRY_POINTS
+
+
+def serve_request(request: Dict[str, Any], token_cache: Optional[str] = None) -> Dict[str, Any]:
+    """Answer one parse request with the tables installed in :mod:`batch`.
+
+    Runs in a pool worker; the result only holds JSON-serialisable values.
+    """
+    tables = batch.installed_tables()
+    response: Dict[str, Any] = {"id": request.get("id")}
+    if "source" in request:
+        source = request["source"]
+    else:
+        try:
+            source = batch.read_source(request["path"])
+        except OSError as exc:
+            response.update(status=1, diagnostic=f"Could not read input file: {exc}")
+            return response
+    start = request.get("start", "program")
+    binary = request.get("format", "text") == "binary"
+
+    try:
+        tokens = lexer.lex_source(source, token_cache)
+    except lexer.LexerError as exc:
+        response.update(status=2, diagnostic=f"LexerError: {exc}")
+        return response
+
+    status, diagnostic = 0, ""
+    if request.get("check"):
+        try:
+            tables.check(tokens, start)
+        except table_file.ParseError as exc:
+            status, diagnostic = 3, str(exc)
+    elif binary:
+        stream = io.BytesIO()
+        # Finalised even on a syntax error, as parser.py --format binary does.
+        with reduction_log.ReductionLogWriter(stream, _reduction_texts(tables)) as writer:
+            try:
+                tables.parse(tokens, writer.append, start)
+            except table_file.ParseError as exc:
+                status, diagnostic = 3, str(exc)
+        response["log_base64"] = base64.b64encode(stream.getvalue()).decode("ascii")
+    else:
+        log = io.StringIO()
+        try:
+            tables.parse(tokens, tables.text_emitter(log.write), start)
+        except table_file.ParseError as exc:
+            status, diagnostic = 3, str(exc)
+        response["log"] = log.getvalue()
+    response.update(status=status, diagnostic=diagnostic)
+    return response
+
+
+def _validate(request: Any) -> Dict[str, Any]:
+    if not isinstance(request, dict):
+        raise RequestError("request must be a JSON object")
+    if ("source" in request) == ("path" in request):
+        raise RequestError("request needs exactly one of 'source' or 'path'")
+    if not isinstance(request.get("source", request.get("path")), str):
+        raise RequestError("'source' and 'path' must be strings")
+    if request.get("format", "text") not in ("text", "binary"):
+        raise RequestError("'format' must be 'text' or 'binary'")
+    start = request.get("start", "program")
+    if not isinstance(start, str) or start not in _entry_points(batch.installed_tables()):
+        raise RequestError(f"unknown start symbol {start!r}")
+    return request
+
+
+class ParseDaemon:
+    """Request dispatch, pipelining and latency statistics."""
+
+    def __init__(self, executor: Executor, token_cache: Optional[str] = None) -> None:
+        self._executor = executor
+        self._token_cache = token_cache
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._counts: Counter[str] = Counter()
+        self._started = time.monotonic()
+        self._in_flight = 0
+
+    async def respond(self, line: bytes) -> Dict[str, Any]:
+        """Turn one request line into its response.
+
+        Never raises for a bad request: anything unexpected, such as JSON
+        nested too deeply or a failed worker, becomes an error response so
+        the connection carries on.
+        """
+        try:
+            return await self._respond(line)
+        except Exception as exc:
+            self._counts["errors"] += 1
+            return {"id": None, "error": f"internal error: {type(exc).__name__}: {exc}"}
+
+    async def _respond(self, line: bytes) -> Dict[str, Any]:
+        received = time.perf_counter()
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            self._counts["errors"] += 1
+            return {"id": None, "error": f"invalid JSON: {exc}"}
+        if isinstance(request, dict) and "op" in request:
+            if request["op"] == "stats":
+                return {"id": request.get("id"), "stats": self.stats()}
+            self._counts["errors"] += 1
+            return {"id": request.get("id"), "error": f"unknown op {request['op']!r}"}
+        try:
+            request = _validate(request)
+        except RequestError as exc:
+            self._counts["errors"] += 1
+            request_id = request.get("id") if isinstance(request, dict) else None
+            return {"id": request_id, "error": str(exc)}
+
+        self._in_flight += 1
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(
+                self._executor, serve_request, request, self._token_cache
+            )
+        finally:
+            self._in_flight -= 1
+        self._counts["requests"] += 1
+        self._counts[f"status_{response['status']}"] += 1
+        self._latencies.append(time.perf_counter() - received)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            position = min(len(latencies) - 1, int(fraction * len(latencies)))
+            return round(latencies[position] * 1e3, 3)
+
+        return {
+            **self._counts,
+            "in_flight": self._in_flight,
+            "uptime_s": round(time.monotonic() - self._started, 3),
+            "latency_window": len(latencies),
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+        }
+
+    async def serve(
+        self, lines: AsyncIterator[bytes], write: Callable[[bytes], Awaitable[None]]
+    ) -> None:
+        """Answer every request from ``lines`` in order, parsing up to PIPELINE_DEPTH at once."""
+        queue: asyncio.Queue[Optional[asyncio.Task[Dict[str, Any]]]] = asyncio.Queue(PIPELINE_DEPTH)
+
+        async def read() -> None:
+            try:
+                async for line in lines:
+                    if line.strip():
+                        await queue.put(asyncio.create_task(self.respond(line)))
+            finally:
+                await queue.put(None)
+
+        reader = asyncio.create_task(read())
+        try:
+            while True:
+                task = await queue.get()
+                if task is None:
+                    break
+                response = await task
+                await write(json.dumps(response).encode("utf-8") + b"\n")
+        finally:
+            reader.cancel()
+            while not queue.empty():
+                pending = queue.get_nowait()
+                if pending is not None:
+                    pending.cancel()
+
+    async def serve_unix(self, path: str) -> None:
+        """Serve connections on ``path`` until SIGINT or SIGTERM."""
+        connections: Set[asyncio.Task[None]] = set()
+
+        async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            task = asyncio.current_task()
+            assert task is not None
+            connections.add(task)
+            async def lines() -> AsyncIterator[bytes]:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        return
+                    yield line
+
+            async def write(data: bytes) -> None:
+                writer.write(data)
+                await writer.drain()
+
+            try:
+                await self.serve(lines(), write)
+            except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                pass
+            except asyncio.CancelledError:
+                # Shutdown; asyncio before 3.12 logs handlers that end cancelled.
+                pass
+            finally:
+                connections.discard(task)
+                writer.close()
+
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(connection, path, limit=MAX_LINE)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+                server.close()
+                for task in connections:
+                    task.cancel()
+                await asyncio.gather(*connections, return_exceptions=True)
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    async def serve_stdio(self) -> None:
+        stdin = sys.stdin.buffer
+        stdout = sys.stdout.buffer
+
+        async def lines() -> AsyncIterator[bytes]:
+            # A thread read works for pipes and regular files alike.
+            while True:
+                line = await asyncio.to_thread(stdin.readline)
+                if not line:
+                    return
+                yield line
+
+        async def write(data: bytes) -> None:
+            stdout.write(data)
+            stdout.flush()
+
+        await self.serve(lines(), write)
+
+
+def _make_executor(jobs: int) -> Executor:
+    if jobs > 0 and "fork" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("fork"))
+    # One thread keeps parsing off the event loop; the drivers are reentrant.
+    return ThreadPoolExecutor(1)
+
+
+def main(argv: Sequence[str]) -> int:
+    arg_parser = argparse.ArgumentParser(prog=argv[0], description="subC parser daemon.")
+    transport = arg_parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument("--socket", metavar="PATH", help="listen on a Unix domain socket")
+    transport.add_argument("--stdio", action="store_true", help="serve requests from stdin")
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="worker processes (0: parse on a single thread in the daemon)",
+    )
+    arg_parser.add_argument(
+        "--tables",
+        metavar="FILE",
+        help="use parse tables exported by 'table_file.py export' instead of building them",
+    )
+    arg_parser.add_argument("--token-cache", metavar="DIR", help="reuse serialised token streams from DIR")
+    args = arg_parser.parse_args(argv[1:])
+
+    tables = None
+    if args.tables is not None:
+        try:
+            tables = table_file.ParseTables.open(args.tables)
+        except OSError as exc:
+            print(f"Could not read table file: {exc}", file=sys.stderr)
+            return 1
+        except table_file.TableFileError as exc:
+            print(f"TableFileError: {exc}", file=sys.stderr)
+            return 2
+    batch.install_tables(tables)
+    executor = _make_executor(args.jobs)
+    daemon = ParseDaemon(executor, args.token_cache)
+    try:
+        if args.stdio:
+            asyncio.run(daemon.serve_stdio())
+        else:
+            asyncio.run(daemon.serve_unix(args.socket))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
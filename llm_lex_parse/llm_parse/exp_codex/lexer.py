@@ -6,13 +6,26 @@ token model so the parser can consume a structured token stream.  Tokens carry
 their kind, original lexeme, and 1-based line/column locations.  The lexer
 recognises the terminals required by ``parser_spec.md`` including logical
 operators, structure member access, and character / string literals.
+
+Token streams can be serialised with :func:`dump_tokens` and cached on disk so
+repeated runs over an unchanged source skip scanning entirely (see
+:func:`lex_file`).  :class:`IncrementalLexer` keeps the stream of an edited
+buffer up to date by rescanning only around each edit.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from bisect import bisect_left
+import gc
+import hashlib
+from itertools import accumulate, repeat
+from operator import add, itemgetter
+import os
+import struct
 import sys
-from typing import Iterable, Iterator, List, Sequence
+import tempfile
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 
 class LexerError(Exception):
@@ -27,8 +40,7 @@ class LexerError(Exception):
         return f"{super().__str__()} at line {self.line}, column {self.column}"
 
 
-@dataclass(frozen=True)
-class Token:
+class Token(NamedTuple):
     """SubC token with source location metadata."""
 
     kind: str
@@ -96,14 +108,18 @@ SINGLE_CHAR_TOKEN_KINDS = {
 
 
 class _Lexer:
-    """Stateful scanner implementing ``tokenize``."""
+    """Stateful scanner implementing ``tokenize``.
 
-    def __init__(self, source: str) -> None:
+    Scanning may start at any ``index`` between tokens, given its ``line``
+    and ``column``; nothing else carries over from one token to the next.
+    """
+
+    def __init__(self, source: str, index: int = 0, line: int = 1, column: int = 1) -> None:
         self._source = source
         self._length = len(source)
-        self._index = 0
-        self._line = 1
-        self._column = 1
+        self._index = index
+        self._line = line
+        self._column = column
 
     def _peek(self, offset: int = 0) -> str:
         position = self._index + offset
@@ -326,10 +342,423 @@ def tokenize(source: str) -> List[Token]:
     return list(_Lexer(source).tokens())
 
 
-def lex_file(path: str) -> List[Token]:
-    """Convenience helper to tokenise a file path."""
+# Incremental relexing ------------------------------------------------------
+#
+# The scanner keeps no state between tokens: comments and whitespace are
+# skipped whole before each token, so a token's lexeme depends only on the
+# text from its start onwards.  After an edit, scanning restarts at the end of
+# the last token the edit cannot reach and stops as soon as a new token starts
+# where an old one did (shifted by the edit, past the inserted text); the
+# rest of the old stream is then reused with its positions shifted.
+
+# Characters a token may inspect past its end: a float such as ``1.5``
+# checks for an exponent ``e+7`` before deciding where it ends.
+_LOOKAHEAD = 3
+_TOKEN_KIND = itemgetter(0)
+_TOKEN_LEXEME = itemgetter(1)
+_TOKEN_LINE = itemgetter(2)
+_TOKEN_COLUMN = itemgetter(3)
+_TOKEN_POSITION = itemgetter(2, 3)
+
+
+def _token_end(token: Token) -> Tuple[int, int]:
+    """Line and column just past ``token``.
+
+    String and character literals may span lines through a backslash-newline.
+    """
+    lexeme = token.lexeme
+    newlines = lexeme.count("\n")
+    if not newlines:
+        return token.line, token.column + len(lexeme)
+    return token.line + newlines, len(lexeme) - lexeme.rfind("\n")
+
+
+class TokenSplice(NamedTuple):
+    """Old tokens ``start:start + removed`` were replaced by new ``start:start + added``.
+
+    Tokens after the splice keep their kinds and lexemes; only their
+    positions moved.
+    """
+
+    start: int
+    removed: int
+    added: int
+
+
+class IncrementalLexer:
+    """Token stream of an editable buffer, relexed locally after each edit.
+
+    :meth:`edit` rescans only from the first token an edit can affect up to
+    the point where the new stream resynchronises with the old one, so edits
+    that open or close comments or string literals rescan exactly as far as
+    their effect reaches.  The stream always equals ``tokenize(source)``.  A
+    buffer that does not lex keeps its :class:`LexerError` (raised by
+    :meth:`edit` and :attr:`tokens`) until an edit fixes it; while it is
+    broken, edits rescan the whole buffer, and the splice returned by the
+    edit that fixes it replaces the last stream that lexed.  ``relexed``
+    counts the tokens scanned by the last edit.
+    """
+
+    def __init__(self, source: str) -> None:
+        self._source = source
+        self._tokens: List[Token] = []
+        self._error: Optional[LexerError] = None
+        self.relexed = 0
+        try:
+            self._relex_all()
+        except LexerError:
+            pass
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    @property
+    def error(self) -> Optional[LexerError]:
+        return self._error
+
+    @property
+    def tokens(self) -> List[Token]:
+        """The token stream of :attr:`source`; do not modify it."""
+        if self._error is not None:
+            raise self._error
+        return self._tokens
+
+    def _relex_all(self) -> TokenSplice:
+        # While the buffer is broken, ``_tokens`` keeps the last good stream
+        # so that the splice of the repairing edit is relative to it.
+        removed = len(self._tokens)
+        try:
+            self._tokens = tokenize(self._source)
+        except LexerError as exc:
+            self._error = exc
+            raise
+        self._error = None
+        self.relexed = len(self._tokens)
+        return TokenSplice(0, removed, len(self._tokens))
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> TokenSplice:
+        """Replace ``deleted`` characters at ``offset`` by ``inserted`` and relex."""
+        source = self._source
+        end = offset + deleted
+        if not 0 <= offset <= end <= len(source):
+            raise ValueError(
+                f"Edit {offset}+{deleted} outside a buffer of {len(source)} characters"
+            )
+        new_source = f"{source[:offset]}{inserted}{source[end:]}"
+        self._source = new_source
+        if self._error is not None:
+            return self._relex_all()
+
+        # The edit in line/column terms: where it starts and where the
+        # deleted text ended in the old buffer, and where the inserted text
+        # ends in the new one.
+        line_start = source.rfind("\n", 0, offset) + 1
+        line = source.count("\n", 0, offset) + 1
+        column = offset - line_start + 1
+        end_line = line + source.count("\n", offset, end)
+        end_column = end - source.rfind("\n", 0, end)
+        newlines = inserted.count("\n")
+        new_line = line + newlines
+        if newlines:
+            new_column = len(inserted) - inserted.rfind("\n")
+        else:
+            new_column = column + len(inserted)
+        line_shift = new_line - end_line
+        column_shift = new_column - end_column
+
+        old = self._tokens
+        first = bisect_left(old, (line, column), key=_TOKEN_POSITION)
+        while first:
+            # A token before the edit is affected if it ends past it, or
+            # close enough before it on the same line to look at it.
+            reach_line, reach_column = _token_end(old[first - 1])
+            if reach_line < line or (reach_line == line and reach_column + _LOOKAHEAD <= column):
+                break
+            first -= 1
+        if first:
+            # Restart right after the last unaffected token, which ends on or
+            # before the edited line.
+            restart_line, restart_column = _token_end(old[first - 1])
+            index = line_start
+            for _ in range(line - restart_line):
+                index = source.rfind("\n", 0, index - 1) + 1
+            index += restart_column - 1
+        else:
+            index, restart_line, restart_column = 0, 1, 1
+
+        def shifted(token: Token) -> Tuple[int, int]:
+            if token.line == end_line:
+                return new_line, token.column + column_shift
+            return token.line + line_shift, token.column
+
+        # Old tokens from the end of the deleted text on are candidates for
+        # resynchronisation; the old EOF never is, the new one ends the scan.
+        candidate = max(first, bisect_left(old, (end_line, end_column), key=_TOKEN_POSITION))
+        last = len(old) - 1
+        inserted_end = (new_line, new_column)
+        fresh: List[Token] = []
+        lexer = _Lexer(new_source, index, restart_line, restart_column)
+        try:
+            for token in lexer.tokens():
+                position = (token.line, token.column)
+                if token.kind != "EOF" and position >= inserted_end:
+                    while candidate < last and shifted(old[candidate]) < position:
+                        candidate += 1
+                    if candidate < last and shifted(old[candidate]) == position:
+                        break
+                fresh.append(token)
+            else:
+                candidate = len(old)
+        except LexerError as exc:
+            self._error = exc
+            raise
+        self.relexed = len(fresh)
+
+        # Shift the reused tail: columns on the line where the deleted text
+        # ended, lines everywhere after it.
+        moved = candidate
+        while moved < len(old) and old[moved].line == end_line:
+            token = old[moved]
+            fresh.append(Token(token.kind, token.lexeme, new_line, token.column + column_shift))
+            moved += 1
+        if line_shift:
+            tail = old[moved:]
+            rows = zip(
+                map(_TOKEN_KIND, tail),
+                map(_TOKEN_LEXEME, tail),
+                map(add, map(_TOKEN_LINE, tail), repeat(line_shift)),
+                map(_TOKEN_COLUMN, tail),
+            )
+            # As in load_tokens: a collection pass per allocation threshold
+            # would otherwise dominate the rebuild.
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                fresh.extend(map(tuple.__new__, repeat(Token, len(tail)), rows))
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            moved = len(old)
+        splice = TokenSplice(first, candidate - first, self.relexed)
+        old[first:moved] = fresh
+        return splice
+
+
+# Bump whenever a change to the scanner alters the tokens it produces; the
+# version is part of every token cache key.
+LEXER_VERSION = 1
+TOKEN_CACHE_ENV = "SUBC_TOKEN_CACHE"
+
+_CACHE_MAGIC = b"SUBCTOK\0"
+_CACHE_FORMAT = 2
+# magic, format, lexer version, token count, BLAKE2b digest of the payload.
+_CACHE_HEADER = struct.Struct("<8sHII16s")
+_ARRAY_HEADER = struct.Struct("<cI")
+_ARRAY_TYPECODES = frozenset("BHI")
+
+
+class TokenCacheError(ValueError):
+    """Raised when a serialised token stream is malformed or stale."""
+
+
+def _pack_array(values: Sequence[int]) -> bytes:
+    largest = max(values, default=0)
+    typecode = "B" if largest < 1 << 8 else "H" if largest < 1 << 16 else "I"
+    packed = array(typecode, values)
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        packed.byteswap()
+    payload = packed.tobytes()
+    return _ARRAY_HEADER.pack(typecode.encode("ascii"), len(payload)) + payload
+
+
+def _unpack_array(data: memoryview, position: int) -> Tuple[array, int]:
+    typecode, size = _ARRAY_HEADER.unpack_from(data, position)
+    position += _ARRAY_HEADER.size
+    typecode = typecode.decode("latin-1")
+    if typecode not in _ARRAY_TYPECODES:
+        raise TokenCacheError(f"Bad array typecode {typecode!r}")
+    if position + size > len(data):
+        raise TokenCacheError("Truncated token stream array")
+    values = array(typecode)
+    values.frombytes(data[position : position + size])
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        values.byteswap()
+    return values, position + size
+
+
+def _pack_strings(strings: Sequence[str]) -> bytes:
+    joined = "".join(strings).encode("utf-8")
+    return _pack_array([len(text) for text in strings]) + struct.pack("<I", len(joined)) + joined
+
+
+def _unpack_strings(data: memoryview, position: int) -> Tuple[List[str], int]:
+    lengths, position = _unpack_array(data, position)
+    (size,) = struct.unpack_from("<I", data, position)
+    position += 4
+    joined = bytes(data[position : position + size]).decode("utf-8")
+    if sum(lengths) != len(joined):
+        raise TokenCacheError("String lengths disagree with the string table")
+    ends = list(accumulate(lengths))
+    strings = [joined[end - length : end] for length, end in zip(lengths, ends)]
+    return strings, position + size
+
+
+def _payload_digest(payload: bytes | memoryview) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def dump_tokens(tokens: Sequence[Token]) -> bytes:
+    """Serialise ``tokens`` into the compact token-stream format.
+
+    Kinds and lexemes are interned into tables and referenced by ID; line
+    numbers are delta-encoded against the previous token.  Every integer
+    column is stored in the narrowest array type that holds it.  The header
+    carries a checksum of the rest, so a damaged entry is rejected rather
+    than decoded into wrong tokens.
+    """
+    kind_ids: Dict[str, int] = {}
+    lexeme_ids: Dict[str, int] = {}
+    kinds = [kind_ids.setdefault(token.kind, len(kind_ids)) for token in tokens]
+    lexemes = [lexeme_ids.setdefault(token.lexeme, len(lexeme_ids)) for token in tokens]
+    lines = [token.line for token in tokens]
+    line_deltas = [line - previous for line, previous in zip(lines, [0] + lines)]
+    columns = [token.column for token in tokens]
+    payload = b"".join(
+        (
+            _pack_strings(list(kind_ids)),
+            _pack_strings(list(lexeme_ids)),
+            _pack_array(kinds),
+            _pack_array(lexemes),
+            _pack_array(line_deltas),
+            _pack_array(columns),
+        )
+    )
+    header = _CACHE_HEADER.pack(
+        _CACHE_MAGIC, _CACHE_FORMAT, LEXER_VERSION, len(tokens), _payload_digest(payload)
+    )
+    return header + payload
+
+
+def load_tokens(data: bytes) -> List[Token]:
+    """Rebuild the token list serialised by :func:`dump_tokens`.
+
+    Raises :class:`TokenCacheError` for anything but an intact stream
+    written by this lexer version.
+    """
+    view = memoryview(data)
+    try:
+        magic, file_format, version, count, digest = _CACHE_HEADER.unpack_from(view, 0)
+        if magic != _CACHE_MAGIC or file_format != _CACHE_FORMAT:
+            raise TokenCacheError("Not a token stream")
+        if version != LEXER_VERSION:
+            raise TokenCacheError(f"Token stream written by lexer version {version}")
+        position = _CACHE_HEADER.size
+        if _payload_digest(view[position:]) != digest:
+            raise TokenCacheError("Token stream checksum mismatch")
+        kind_table, position = _unpack_strings(view, position)
+        lexeme_table, position = _unpack_strings(view, position)
+        kinds, position = _unpack_array(view, position)
+        lexemes, position = _unpack_array(view, position)
+        line_deltas, position = _unpack_array(view, position)
+        columns, position = _unpack_array(view, position)
+    except TokenCacheError:
+        raise
+    except struct.error as exc:
+        raise TokenCacheError(f"Truncated token stream: {exc}") from None
+    except ValueError as exc:
+        # Array sizes that are not a multiple of the item size, invalid UTF-8.
+        raise TokenCacheError(f"Corrupt token stream: {exc}") from None
+    if position != len(view):
+        raise TokenCacheError("Trailing data after the token stream")
+    if not len(kinds) == len(lexemes) == len(line_deltas) == len(columns) == count:
+        raise TokenCacheError("Token stream arrays disagree on the token count")
+    if count and (max(kinds) >= len(kind_table) or max(lexemes) >= len(lexeme_table)):
+        raise TokenCacheError("Token stream refers to strings missing from its tables")
+
+    # Tokens are assembled through ``tuple.__new__`` so the whole rebuild stays
+    # in C; calling ``Token`` per element would dominate the load time.  The
+    # collector is paused meanwhile: the new tuples only reference strings and
+    # ints, yet each generation-0 pass would rescan them.
+    rows = zip(
+        map(kind_table.__getitem__, kinds),
+        map(lexeme_table.__getitem__, lexemes),
+        accumulate(line_deltas),
+        columns,
+    )
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return list(map(tuple.__new__, repeat(Token, count), rows))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Atomically replace ``path`` with ``data``.
+
+    Readers never see a partly written file, and processes that already
+    mapped the old file keep their (unlinked) copy instead of seeing it
+    change underneath them.  The temporary file is removed if writing fails.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def token_cache_key(source: str) -> str:
+    """Return the cache key for ``source`` under the current lexer version."""
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return f"{digest}.v{LEXER_VERSION}"
+
+
+def lex_cached(source: str, cache_dir: str) -> List[Token]:
+    """Tokenise ``source``, reusing a serialised stream from ``cache_dir``."""
+    path = os.path.join(cache_dir, token_cache_key(source) + ".tok")
+    try:
+        with open(path, "rb") as handle:
+            return load_tokens(handle.read())
+    except (OSError, TokenCacheError):
+        pass
+
+    tokens = tokenize(source)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_atomic(path, dump_tokens(tokens))
+    except OSError:
+        # The cache is an optimisation only; an unwritable directory must not
+        # turn into a lexing failure.
+        pass
+    return tokens
+
+
+def lex_file(path: str, cache_dir: str | None = None) -> List[Token]:
+    """Convenience helper to tokenise a file path.
+
+    When ``cache_dir`` (or the ``SUBC_TOKEN_CACHE`` environment variable) names
+    a directory, token streams are cached there keyed by the source content
+    hash and :data:`LEXER_VERSION`.
+    """
     with open(path, "r", encoding="utf-8") as handle:
-        return tokenize(handle.read())
+        source = handle.read()
+    return lex_source(source, cache_dir)
+
+
+def lex_source(source: str, cache_dir: str | None = None) -> List[Token]:
+    """Tokenise ``source``, using the token cache exactly as :func:`lex_file` does."""
+    if cache_dir is None:
+        cache_dir = os.environ.get(TOKEN_CACHE_ENV) or None
+    if cache_dir is None:
+        return tokenize(source)
+    return lex_cached(source, cache_dir)
 
 
 def _emit(tokens: Iterable[Token]) -> None:
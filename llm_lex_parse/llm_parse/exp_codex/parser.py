@@ -3,16 +3,47 @@
 
 from __future__ import annotations
 
+import argparse
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
+import gc
+import hashlib
+from itertools import compress
+import multiprocessing
+from operator import itemgetter
+import os
 import pathlib
 import sys
-from typing import Dict, Iterable, Iterator, List, Mapping, MutableMapping, Sequence, Set, Tuple
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 try:
     from . import lexer  # type: ignore
+    from . import reduction_log  # type: ignore
+    from . import result_cache  # type: ignore
+    from . import syntax_tree  # type: ignore
+    from . import table_file  # type: ignore
 except ImportError:  # pragma: no cover - fallback for script execution
     sys.path.append(str(pathlib.Path(__file__).resolve().parent))
     import lexer  # type: ignore
+    import reduction_log  # type: ignore
+    import result_cache  # type: ignore
+    import syntax_tree  # type: ignore
+    import table_file  # type: ignore
 
 
 Token = lexer.Token
@@ -21,6 +52,10 @@ LexerError = lexer.LexerError
 EPSILON = "epsilon"
 EOF_SYMBOL = "EOF"
 START_SYMBOL = "program'"
+# Nonterminals that can be parsed on their own.  Each gets an augmented
+# production ``X' -> X`` and its own start state in the shared automaton;
+# ``program`` comes first so it keeps production 0 and state 0.
+ENTRY_POINTS: Tuple[str, ...] = ("program", "stmt", "expr", "ext_def")
 
 
 @dataclass(frozen=True)
@@ -132,10 +167,19 @@ def _build_productions() -> List[Production]:
     productions.append(Production(0, START_SYMBOL, ("program",)))
     for lhs, rhs in RAW_PRODUCTIONS:
         productions.append(Production(len(productions), lhs, rhs))
+    # The other augmented productions go last so the indices above (and
+    # PRODUCTION_PRECEDENCE_OVERRIDE) do not move.
+    for entry in ENTRY_POINTS[1:]:
+        productions.append(Production(len(productions), f"{entry}'", (entry,)))
     return productions
 
 
 PRODUCTIONS: List[Production] = _build_productions()
+AUGMENTED_PRODUCTIONS: Dict[str, int] = {
+    production.rhs[0]: production.index
+    for production in PRODUCTIONS
+    if production.lhs.endswith("'")
+}
 NONTERMINALS: Set[str] = {production.lhs for production in PRODUCTIONS}
 SYMBOLS_BY_LHS: Dict[str, List[int]] = {}
 for production in PRODUCTIONS:
@@ -286,13 +330,18 @@ def _goto(items: Iterable[Item], symbol: str) -> frozenset[Item]:
     return _closure(moved)
 
 
-def _build_lr1_automaton() -> Tuple[List[frozenset[Item]], List[Dict[str, int]]]:
-    start_item = Item(0, 0, EOF_SYMBOL)
-    initial_state = _closure([start_item])
-
-    states: List[frozenset[Item]] = [initial_state]
-    transitions: List[Dict[str, int]] = [{}]
-    state_index: Dict[frozenset[Item], int] = {initial_state: 0}
+def _build_lr1_automaton() -> Tuple[
+    List[frozenset[Item]], List[Dict[str, int]], Dict[str, int]
+]:
+    states: List[frozenset[Item]] = []
+    transitions: List[Dict[str, int]] = []
+    state_index: Dict[frozenset[Item], int] = {}
+    start_states: Dict[str, int] = {}
+    for entry in ENTRY_POINTS:
+        initial_state = _closure([Item(AUGMENTED_PRODUCTIONS[entry], 0, EOF_SYMBOL)])
+        start_states[entry] = state_index[initial_state] = len(states)
+        states.append(initial_state)
+        transitions.append({})
 
     for index, state in enumerate(states):
         transitions[index] = {}
@@ -306,10 +355,10 @@ def _build_lr1_automaton() -> Tuple[List[frozenset[Item]], List[Dict[str, int]]]
                 transitions.append({})
             transitions[index][symbol] = state_index[next_state]
 
-    return states, transitions
+    return states, transitions, start_states
 
 
-STATES, TRANSITIONS = _build_lr1_automaton()
+STATES, TRANSITIONS, START_STATES = _build_lr1_automaton()
 
 
 class ParserConstructionError(RuntimeError):
@@ -370,7 +419,7 @@ def _build_tables() -> Tuple[Dict[int, Dict[str, Tuple[str, int | None]]], Dict[
             next_symbol = item.next_symbol(PRODUCTIONS)
             if next_symbol is None:
                 production = PRODUCTIONS[item.production_index]
-                if production.lhs == START_SYMBOL and item.lookahead == EOF_SYMBOL:
+                if production.lhs.endswith("'") and item.lookahead == EOF_SYMBOL:
                     _register_action(action, state_index, EOF_SYMBOL, ("accept", None))
                 else:
                     _register_action(
@@ -394,6 +443,44 @@ def _build_tables() -> Tuple[Dict[int, Dict[str, Tuple[str, int | None]]], Dict[
 ACTION_TABLE, GOTO_TABLE = _build_tables()
 
 
+def _compile_fast_tables() -> Tuple[
+    List[Dict[str, int]], List[int], List[Dict[int, int]]
+]:
+    """Flatten ACTION/GOTO into the integer form used by :func:`_fast_drive`.
+
+    Actions become plain ints: a shift is the target state (``>= 0``) and a
+    reduction by production ``p`` is ``~p``.  Accept, for every entry
+    point, is encoded as reducing the augmented production 0.  GOTO is re-keyed by production so a
+    reduction needs a single lookup on the uncovered state.
+    """
+    actions: List[Dict[str, int]] = []
+    for state in range(len(STATES)):
+        row: Dict[str, int] = {}
+        for symbol, (action, value) in ACTION_TABLE.get(state, {}).items():
+            if action == "shift":
+                row[symbol] = value
+            elif action == "reduce":
+                row[symbol] = ~value
+            else:
+                row[symbol] = ~0
+        actions.append(row)
+
+    lengths = [len(production.rhs) for production in PRODUCTIONS]
+    gotos: List[Dict[int, int]] = []
+    for production in PRODUCTIONS:
+        gotos.append(
+            {
+                state: targets[production.lhs]
+                for state, targets in GOTO_TABLE.items()
+                if production.lhs in targets
+            }
+        )
+    return actions, lengths, gotos
+
+
+_FAST_ACTIONS, _REDUCE_LENGTHS, _REDUCE_GOTOS = _compile_fast_tables()
+
+
 def _format_symbol(symbol: str) -> str:
     if symbol in NONTERMINALS:
         return symbol
@@ -409,10 +496,29 @@ def _format_reduction(production: Production) -> str:
     return f"{production.lhs}->{rhs_text}"
 
 
-class ParseError(RuntimeError):
-    def __init__(self, message: str, token: Token):
-        super().__init__(message)
-        self.token = token
+REDUCTION_TEXTS: Tuple[str, ...] = tuple(_format_reduction(production) for production in PRODUCTIONS)
+_REDUCTION_LINES: Tuple[str, ...] = tuple(f"{text}\n" for text in REDUCTION_TEXTS)
+GRAMMAR_FINGERPRINT: bytes = reduction_log.grammar_fingerprint(REDUCTION_TEXTS)
+
+
+# Defined next to the table file reader so processes using exported tables
+# can raise it without importing this module.
+ParseError = table_file.ParseError
+
+
+def export_tables(path: str) -> None:
+    """Write the fast tables to ``path`` in the flat :mod:`table_file` layout."""
+    terminals = sorted({symbol for row in _FAST_ACTIONS for symbol in row})
+    data = table_file.encode_tables(
+        terminals,
+        [_format_symbol(symbol) for symbol in terminals],
+        _FAST_ACTIONS,
+        _REDUCE_LENGTHS,
+        _REDUCE_GOTOS,
+        REDUCTION_TEXTS,
+        START_STATES,
+    )
+    table_file.write_tables(path, data)
 
 
 def _expected_symbols(state: int) -> List[str]:
@@ -421,10 +527,118 @@ def _expected_symbols(state: int) -> List[str]:
     return formatted
 
 
-def parse(tokens: Sequence[Token]) -> None:
-    stack: List[int] = [0]
+def text_emitter(write: Callable[[str], object]) -> Callable[[int], None]:
+    """Return an ``on_reduce`` callback writing text-format reductions."""
+    lines = _REDUCTION_LINES
+
+    def emit(production_index: int) -> None:
+        write(lines[production_index])
+
+    return emit
+
+
+def parse(
+    tokens: Sequence[Token],
+    on_reduce: Callable[[int], object] | None = None,
+    start: str = "program",
+) -> None:
+    """Parse ``tokens``, reporting each reduction by production index.
+
+    Without ``on_reduce`` the reductions are printed to stdout in the text
+    format of ``llm_parse/output.txt``.  ``start`` selects the nonterminal
+    the whole token stream must derive, one of :data:`ENTRY_POINTS`.
+    """
+    if on_reduce is None:
+        on_reduce = text_emitter(sys.stdout.write)
+    _run(tokens, on_reduce, _start_state(start))
+
+
+def check(tokens: Sequence[Token], start: str = "program") -> None:
+    """Validate ``tokens`` without reporting reductions.
+
+    Raises :class:`ParseError` for the first syntax error, exactly as
+    :func:`parse` would.
+    """
+    _run(tokens, None, _start_state(start))
+
+
+def _start_state(start: str) -> int:
+    try:
+        return START_STATES[start]
+    except KeyError:
+        raise ValueError(
+            f"Unknown start symbol {start!r}; expected one of {', '.join(ENTRY_POINTS)}"
+        ) from None
+
+
+def _run(
+    tokens: Sequence[Token], on_reduce: Callable[[int], object] | None, start_state: int = 0
+) -> None:
+    """Parse on the fast path, re-running the instrumented driver on failure.
+
+    The fast driver keeps no diagnostic state.  When it stops short of
+    accepting, :func:`_diagnostic_drive` replays the same tokens without
+    reporting reductions (they were already reported up to the error) and
+    raises the detailed :class:`ParseError`.
+    """
+    if _fast_drive(tokens, on_reduce, start_state):
+        return
+    _diagnostic_drive(tokens, None, start_state)
+    raise ParserConstructionError("Fast driver rejected input accepted by the diagnostic driver")
+
+
+def _fast_drive(
+    tokens: Sequence[Token], on_reduce: Callable[[int], object] | None, start_state: int = 0
+) -> bool:
+    """Run the LR automaton; return ``False`` instead of diagnosing errors."""
+    actions = _FAST_ACTIONS
+    lengths = _REDUCE_LENGTHS
+    gotos = _REDUCE_GOTOS
+    stack: List[int] = [start_state]
+    push = stack.append
+    state = start_state
+    index = 0
+    # Only the table and token lookups are guarded, so that a KeyError or
+    # IndexError raised by ``on_reduce`` propagates instead of passing for a
+    # syntax error.  A missing GOTO entry or a token stream without EOF is
+    # left to the diagnostic driver to describe.
+    try:
+        kind = tokens[0].kind
+    except IndexError:
+        return False
+    while True:
+        action = actions[state].get(kind)
+        if action is None:
+            return False
+        if action >= 0:
+            push(action)
+            state = action
+            index += 1
+            try:
+                kind = tokens[index].kind
+            except IndexError:
+                return False
+            continue
+        production_index = ~action
+        if not production_index:
+            return True
+        if on_reduce is not None:
+            on_reduce(production_index)
+        length = lengths[production_index]
+        if length:
+            del stack[-length:]
+        try:
+            state = gotos[production_index][stack[-1]]
+        except KeyError:
+            return False
+        push(state)
+
+
+def _diagnostic_drive(
+    tokens: Sequence[Token], on_reduce: Callable[[int], object] | None, start_state: int = 0
+) -> None:
+    stack: List[int] = [start_state]
     index = 0
-    output = sys.stdout
 
     while True:
         state = stack[-1]
@@ -432,14 +646,7 @@ def parse(tokens: Sequence[Token]) -> None:
         action_entry = ACTION_TABLE.get(state, {}).get(token.kind)
 
         if action_entry is None:
-            expected = _expected_symbols(state)
-            expected_text = ", ".join(expected) if expected else "EOF"
-            lexeme = token.lexeme or token.kind
-            message = (
-                f"SyntaxError: expected {expected_text} before {lexeme} "
-                f"at line {token.line}, column {token.column}"
-            )
-            raise ParseError(message, token)
+            raise _syntax_error(state, token)
 
         action, value = action_entry
 
@@ -452,7 +659,8 @@ def parse(tokens: Sequence[Token]) -> None:
         if action == "reduce":
             assert isinstance(value, int)
             production = PRODUCTIONS[value]
-            print(_format_reduction(production), file=output)
+            if on_reduce is not None:
+                on_reduce(value)
 
             rhs_length = len(production.rhs)
             for _ in range(rhs_length):
@@ -473,13 +681,896 @@ def parse(tokens: Sequence[Token]) -> None:
         raise ParserConstructionError(f"Unknown parser action '{action}'")
 
 
+def _syntax_error(state: int, token: Token) -> ParseError:
+    expected = _expected_symbols(state)
+    expected_text = ", ".join(expected) if expected else "EOF"
+    lexeme = token.lexeme or token.kind
+    message = (
+        f"SyntaxError: expected {expected_text} before {lexeme} "
+        f"at line {token.line}, column {token.column}"
+    )
+    return ParseError(message, token)
+
+
+# Error recovery -----------------------------------------------------------
+#
+# Panic mode on the LR stack: after a syntax error the input is discarded up
+# to the next ``;`` or ``}``.  A ``}`` is taken to close the innermost open
+# ``{``: the stack is popped back to the state after that brace and parsing
+# resumes at the ``}``, which the grammar always accepts there.  Otherwise
+# the synchronising token is consumed and the stack popped to the nearest
+# state expecting one of ``_RECOVERY_SYMBOLS``; the parser carries on as if
+# that nonterminal had just been parsed, i.e. as if the grammar had
+# ``stmt -> error ;`` style productions, without adding them (which would
+# change every reduction index).
+
+DEFAULT_MAX_ERRORS = 100
+_SYNC_KINDS = frozenset({";", "}"})
+_RECOVERY_SYMBOLS = ("stmt", "def", "ext_def")
+# States entered by shifting ``{`` (compound statements and struct bodies).
+_OPEN_BRACE_STATES = frozenset(
+    row["{"] for row in _FAST_ACTIONS if row.get("{", -1) >= 0
+)
+# Tokens that must be shifted after a recovery before another error is
+# reported; errors sooner than that are usually knock-on effects.
+_ERROR_QUIET_SHIFTS = 3
+
+
+def parse_recovering(
+    tokens: Sequence[Token],
+    on_reduce: Callable[[int], object] | None = None,
+    start: str = "program",
+    max_errors: int = DEFAULT_MAX_ERRORS,
+) -> List[ParseError]:
+    """Parse ``tokens``, recovering from syntax errors; return the errors found.
+
+    The first error is the one :func:`parse` would raise.  After each error
+    the parser resynchronises at the next ``;`` or ``}`` and keeps going, so
+    one pass reports up to ``max_errors`` errors.  Every recovery consumes
+    at least one token, so the parse always terminates.  ``on_reduce`` sees
+    every reduction performed, including those after a recovery; past the
+    first error they no longer form a derivation of the input.
+    """
+    if max_errors < 1:
+        raise ValueError("max_errors must be at least 1")
+    return _recovering_drive(tokens, on_reduce, _start_state(start), max_errors)
+
+
+def _recovering_drive(
+    tokens: Sequence[Token],
+    on_reduce: Callable[[int], object] | None,
+    start_state: int,
+    max_errors: int,
+) -> List[ParseError]:
+    actions = _FAST_ACTIONS
+    lengths = _REDUCE_LENGTHS
+    gotos = _REDUCE_GOTOS
+    errors: List[ParseError] = []
+    stack: List[int] = [start_state]
+    push = stack.append
+    state = start_state
+    index = 0
+    # Shifts left before errors are reported again.
+    quiet = 0
+    resumed = -1
+    kind = tokens[0].kind
+    while True:
+        action = actions[state].get(kind)
+        if action is None:
+            if not quiet:
+                errors.append(_syntax_error(state, tokens[index]))
+                if len(errors) >= max_errors:
+                    return errors
+            if kind == EOF_SYMBOL:
+                return errors
+            index = resumed = _recover(tokens, index, stack, resumed)
+            state = stack[-1]
+            kind = tokens[index].kind
+            quiet = _ERROR_QUIET_SHIFTS
+            continue
+        if action >= 0:
+            push(action)
+            state = action
+            index += 1
+            kind = tokens[index].kind
+            if quiet:
+                quiet -= 1
+            continue
+        production_index = ~action
+        if not production_index:
+            return errors
+        if on_reduce is not None:
+            on_reduce(production_index)
+        length = lengths[production_index]
+        if length:
+            del stack[-length:]
+        state = gotos[production_index][stack[-1]]
+        push(state)
+
+
+def _recover(tokens: Sequence[Token], index: int, stack: List[int], resumed: int) -> int:
+    """Resynchronise after an error at ``tokens[index]``; return where to resume.
+
+    Adjusts ``stack`` as described above for the first synchronising token
+    at or after ``index`` that allows it.  The position returned is always
+    beyond ``resumed``, the previous recovery's, so the parse terminates.
+    Without any synchronising token the stack is left alone and the parse
+    resumes at the final EOF, which reports it as an error or accepts.
+    """
+    actions = _FAST_ACTIONS
+    last = len(tokens) - 1
+    while index < last:
+        kind = tokens[index].kind
+        if kind not in _SYNC_KINDS:
+            index += 1
+            continue
+        if kind == "}" and index > resumed:
+            for depth in range(len(stack) - 1, 0, -1):
+                if stack[depth] in _OPEN_BRACE_STATES:
+                    del stack[depth + 1 :]
+                    return index
+        index += 1
+        follower = tokens[index].kind
+        for depth in range(len(stack) - 1, -1, -1):
+            targets = GOTO_TABLE.get(stack[depth], {})
+            for symbol in _RECOVERY_SYMBOLS:
+                target = targets.get(symbol)
+                if target is not None and follower in actions[target]:
+                    del stack[depth + 1 :]
+                    stack.append(target)
+                    return index
+    return last
+
+
+def build_tree(tokens: Sequence[Token], start: str = "program") -> syntax_tree.SyntaxTree:
+    """Parse ``tokens`` into an arena-backed :class:`syntax_tree.SyntaxTree`.
+
+    Raises :class:`ParseError` for the first syntax error, exactly as
+    :func:`parse` would.
+    """
+    start_state = _start_state(start)
+    arena = _tree_drive(tokens, start_state)
+    if arena is None:
+        _run(tokens, None, start_state)
+        raise ParserConstructionError("Tree driver rejected input accepted by the parser")
+    return syntax_tree.SyntaxTree(*arena)
+
+
+def _tree_drive(
+    tokens: Sequence[Token], start_state: int = 0
+) -> Optional[Tuple["array[int]", ...]]:
+    """:func:`_fast_drive`, appending a tree node per shift and per reduction.
+
+    ``nodes`` parallels the state stack.  Whenever a node is pushed, the
+    node beneath it gets it as its next sibling; if they later become
+    children of the same reduction that link is final, and otherwise the
+    reduction's own node overwrites it when pushed.
+    """
+    actions = _FAST_ACTIONS
+    lengths = _REDUCE_LENGTHS
+    gotos = _REDUCE_GOTOS
+    leaf = syntax_tree.TOKEN
+    none = syntax_tree.NO_NODE
+    productions = array("i")
+    first_children = array("i")
+    next_siblings = array("i")
+    starts = array("i")
+    ends = array("i")
+    add_production = productions.append
+    add_first_child = first_children.append
+    add_next_sibling = next_siblings.append
+    add_start = starts.append
+    add_end = ends.append
+    states: List[int] = [start_state]
+    nodes: List[int] = []
+    state = start_state
+    index = 0
+    node = 0
+    try:
+        kind = tokens[0].kind
+    except IndexError:
+        return None
+    while True:
+        action = actions[state].get(kind)
+        if action is None:
+            return None
+        if action >= 0:
+            add_production(leaf)
+            add_first_child(none)
+            add_start(index)
+            index += 1
+            add_end(index)
+            state = action
+            try:
+                kind = tokens[index].kind
+            except IndexError:
+                return None
+        else:
+            production_index = ~action
+            if not production_index:
+                return productions, first_children, next_siblings, starts, ends
+            length = lengths[production_index]
+            add_production(production_index)
+            if length:
+                first = nodes[-length]
+                add_first_child(first)
+                add_start(starts[first])
+                del nodes[-length:], states[-length:]
+            else:
+                add_first_child(none)
+                add_start(index)
+            add_end(index)
+            try:
+                state = gotos[production_index][states[-1]]
+            except KeyError:
+                return None
+        add_next_sibling(none)
+        if nodes:
+            next_siblings[nodes[-1]] = node
+        nodes.append(node)
+        node += 1
+        states.append(state)
+
+
+def build_shared_tree(
+    tokens: Sequence[Token], table: syntax_tree.SubtreeTable, start: str = "program"
+) -> int:
+    """Parse ``tokens`` into ``table``, returning the ID of the root node.
+
+    Every token and every reduction is interned, so subtrees this file
+    shares with anything already in ``table`` cost no new nodes.  Raises
+    :class:`ParseError` for the first syntax error, exactly as :func:`parse`
+    would; nodes interned before the error stay in the table.
+    """
+    start_state = _start_state(start)
+    root = _shared_drive(tokens, table, start_state)
+    if root is None:
+        _run(tokens, None, start_state)
+        raise ParserConstructionError("Shared tree driver rejected input accepted by the parser")
+    return root
+
+
+def _shared_drive(
+    tokens: Sequence[Token], table: syntax_tree.SubtreeTable, start_state: int = 0
+) -> Optional[int]:
+    """:func:`_fast_drive`, interning a node per shift and per reduction."""
+    actions = _FAST_ACTIONS
+    lengths = _REDUCE_LENGTHS
+    gotos = _REDUCE_GOTOS
+    leaf = syntax_tree.TOKEN
+    intern = table.intern
+    states: List[int] = [start_state]
+    nodes: List[int] = []
+    state = start_state
+    index = 0
+    try:
+        token = tokens[0]
+    except IndexError:
+        return None
+    while True:
+        action = actions[state].get(token.kind)
+        if action is None:
+            return None
+        if action >= 0:
+            nodes.append(intern((leaf, token.kind, token.lexeme)))
+            index += 1
+            try:
+                token = tokens[index]
+            except IndexError:
+                return None
+            state = action
+        else:
+            production_index = ~action
+            if not production_index:
+                return nodes[-1]
+            length = lengths[production_index]
+            if length:
+                key = (production_index, *nodes[-length:])
+                del nodes[-length:], states[-length:]
+            else:
+                key = (production_index,)
+            nodes.append(intern(key))
+            try:
+                state = gotos[production_index][states[-1]]
+            except KeyError:
+                return None
+        states.append(state)
+
+
+# Parallel parsing ---------------------------------------------------------
+#
+# A program is a flat ext_def_list, so its reduction log is
+#
+#     ext_def_list->epsilon
+#     <reductions of ext_def 1>  ext_def_list->ext_def_list ext_def
+#     ...
+#     <reductions of ext_def n>  ext_def_list->ext_def_list ext_def
+#     program->ext_def_list
+#
+# and each ext_def's reductions do not depend on its neighbours.  Workers
+# parse runs of ext_defs from the ``ext_def`` entry point and the pieces are
+# stitched back in order.  Workers are forked so they inherit the tables and
+# the token list instead of rebuilding or unpickling them.
+
+_EXT_DEF_STARTS = frozenset({"TYPE", "VOID", "STRUCT", EOF_SYMBOL})
+_STRUCTURAL_KINDS = frozenset({"{", "}", ";"})
+_TOKEN_KIND = itemgetter(0)
+_TOKEN_LEXEME = itemgetter(1)
+_EXT_DEF_LIST_EMPTY = next(
+    p.index for p in PRODUCTIONS if p.lhs == "ext_def_list" and not p.rhs
+)
+_EXT_DEF_LIST_APPEND = next(
+    p.index for p in PRODUCTIONS if p.lhs == "ext_def_list" and p.rhs
+)
+_PROGRAM = next(p.index for p in PRODUCTIONS if p.lhs == "program")
+
+_batch_tokens: Sequence[Token] = ()
+
+
+def split_ext_defs(tokens: Sequence[Token]) -> Optional[List[int]]:
+    """Return the end offset of each top-level ext_def in ``tokens``.
+
+    A definition ends at a ``;`` outside braces, or at the ``}`` closing a
+    function body, recognised by the next token starting another definition
+    (after a struct body only ``;``, ``*`` or an ID can follow).  Returns
+    ``None`` when the stream does not split cleanly up to its EOF token; the
+    caller then parses sequentially and reports whatever is wrong.
+    """
+    return _split_kinds(list(map(_TOKEN_KIND, tokens)))
+
+
+def _split_kinds(kinds: Sequence[str]) -> Optional[List[int]]:
+    last = len(kinds) - 1
+    if last < 0 or kinds[last] != EOF_SYMBOL:
+        return None
+    ends: List[int] = []
+    depth = 0
+    # Only braces and semicolons matter; selecting them in C keeps the loop
+    # below to a fraction of the stream.
+    for index in compress(range(last), map(_STRUCTURAL_KINDS.__contains__, kinds)):
+        kind = kinds[index]
+        if kind == "{":
+            depth += 1
+        elif kind == "}":
+            depth -= 1
+            if depth == 0 and kinds[index + 1] in _EXT_DEF_STARTS:
+                ends.append(index + 1)
+            elif depth < 0:
+                return None
+        elif depth == 0:
+            ends.append(index + 1)
+    if depth or (ends[-1] if ends else 0) != last:
+        return None
+    return ends
+
+
+def _parse_ext_def_batch(bounds: Sequence[int]) -> Optional[bytes]:
+    """Parse ext_defs ``bounds[i]:bounds[i + 1]`` of the inherited token list.
+
+    Returns the stitched reductions of the batch, each definition followed
+    by ``ext_def_list->ext_def_list ext_def``, or ``None`` on a syntax error.
+    """
+    tokens = _batch_tokens
+    eof = [tokens[-1]]
+    start_state = START_STATES["ext_def"]
+    log = bytearray()
+    append = log.append
+    for start, end in zip(bounds, bounds[1:]):
+        if not _fast_drive(list(tokens[start:end]) + eof, append, start_state):
+            return None
+        append(_EXT_DEF_LIST_APPEND)
+    return bytes(log)
+
+
+def _plan_batches(ends: List[int], total: int, batches: int) -> List[List[int]]:
+    """Group consecutive ext_defs into about ``batches`` runs of similar size."""
+    target = max(1, total // batches)
+    plan: List[List[int]] = []
+    current = [0]
+    for end in ends:
+        current.append(end)
+        if end - current[0] >= target:
+            plan.append(current)
+            current = [end]
+    if len(current) > 1:
+        plan.append(current)
+    return plan
+
+
+def parse_parallel(
+    tokens: Sequence[Token],
+    on_reduce: Callable[[int], object] | None = None,
+    workers: int = 2,
+) -> None:
+    """Parse a whole program with its top-level definitions split across processes.
+
+    The reductions reported, and any :class:`ParseError`, are identical to
+    :func:`parse`.  Nothing is reported until every batch has parsed; if one
+    fails, or the stream does not split cleanly, the program is parsed again
+    sequentially so the error and the reductions before it come out exactly
+    as they would have.  Needs the ``fork`` start method; elsewhere, and
+    with ``workers <= 1``, the batches run in this process.
+    """
+    global _batch_tokens
+
+    if on_reduce is None:
+        on_reduce = text_emitter(sys.stdout.write)
+    if len(REDUCTION_TEXTS) > 0x100:  # pragma: no cover - batches use one byte per reduction
+        raise ParserConstructionError("Too many productions for byte-packed batch logs")
+
+    ends = split_ext_defs(tokens)
+    results: List[Optional[bytes]] = [None]
+    if ends is not None:
+        plan = _plan_batches(ends, len(tokens), max(1, workers) * 4)
+        _batch_tokens = tokens
+        try:
+            if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+                with ProcessPoolExecutor(workers, mp_context=context) as executor:
+                    results = list(executor.map(_parse_ext_def_batch, plan))
+            else:
+                results = [_parse_ext_def_batch(bounds) for bounds in plan]
+        finally:
+            _batch_tokens = ()
+
+    if None in results:
+        _run(tokens, on_reduce)
+        return
+
+    on_reduce(_EXT_DEF_LIST_EMPTY)
+    for log in results:
+        for production_index in log:
+            on_reduce(production_index)
+    on_reduce(_PROGRAM)
+
+
+def _ext_def_digest(kinds: Sequence[str], lexemes: Sequence[str]) -> bytes:
+    """Digest of a definition's token kinds and lexemes (positions do not matter)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\0".join(kinds).encode("utf-8"))
+    digest.update(b"\1")
+    digest.update("\0".join(lexemes).encode("utf-8"))
+    return digest.digest()
+
+
+class IncrementalParser:
+    """Reparse programs, reusing the reductions of unchanged top-level definitions.
+
+    Each ext_def's reductions depend only on its own tokens (see
+    :func:`parse_parallel`), so they are cached per definition under
+    :func:`_ext_def_digest`.  A reparse only runs the automaton over new or
+    changed definitions and splices the cached segments around them.  The
+    reductions reported, and any :class:`ParseError`, are identical to
+    :func:`parse`.  At most ``max_segments`` segments are kept, the least
+    recently used being dropped first.  ``reused`` and ``parsed`` count the
+    definitions of the last call taken from the cache and parsed.
+    """
+
+    def __init__(self, max_segments: int = 100_000) -> None:
+        if len(REDUCTION_TEXTS) > 0x100:  # pragma: no cover - segments use one byte per reduction
+            raise ParserConstructionError("Too many productions for byte-packed segments")
+        self.max_segments = max_segments
+        self._segments: OrderedDict[bytes, bytes] = OrderedDict()
+        self.reused = 0
+        self.parsed = 0
+
+    def parse(
+        self, tokens: Sequence[Token], on_reduce: Callable[[int], object] | None = None
+    ) -> None:
+        """Parse the program ``tokens`` like :func:`parse` with ``start="program"``."""
+        if on_reduce is None:
+            on_reduce = text_emitter(sys.stdout.write)
+        log = self.reductions(tokens)
+        if log is None:
+            # Let the sequential parser report the error and the reductions
+            # before it.
+            _run(tokens, on_reduce)
+            return
+        for production_index in log:
+            on_reduce(production_index)
+
+    def reductions(self, tokens: Sequence[Token]) -> Optional[bytes]:
+        """Return the whole reduction log, or ``None`` if ``tokens`` do not parse cleanly."""
+        kinds = list(map(_TOKEN_KIND, tokens))
+        ends = _split_kinds(kinds)
+        if ends is None:
+            return None
+        lexemes = list(map(_TOKEN_LEXEME, tokens))
+        segments = self._segments
+        eof = [tokens[-1]]
+        start_state = START_STATES["ext_def"]
+        log = bytearray([_EXT_DEF_LIST_EMPTY])
+        reused = parsed = 0
+        start = 0
+        for end in ends:
+            key = _ext_def_digest(kinds[start:end], lexemes[start:end])
+            segment = segments.get(key)
+            if segment is None:
+                piece = bytearray()
+                if not _fast_drive(list(tokens[start:end]) + eof, piece.append, start_state):
+                    return None
+                segment = segments[key] = bytes(piece)
+                parsed += 1
+            else:
+                segments.move_to_end(key)
+                reused += 1
+            log += segment
+            log.append(_EXT_DEF_LIST_APPEND)
+            start = end
+        log.append(_PROGRAM)
+        while len(segments) > self.max_segments:
+            segments.popitem(last=False)
+        self.reused = reused
+        self.parsed = parsed
+        return bytes(log)
+
+
+class SyntaxNode:
+    """Interior node of the concrete syntax tree kept by :class:`IncrementalLRParser`.
+
+    ``production`` is the production reduced to build the node, ``state``
+    the LR state exposed beneath it when it was pushed, ``size`` the number
+    of tokens it spans and ``children`` its right-hand side: nodes for
+    nonterminals, token kinds for terminals.  Positions are implicit in the
+    sizes, so nodes after an edit never need updating.
+    """
+
+    __slots__ = ("production", "state", "size", "children")
+
+    def __init__(self, production: int, state: int, size: int, children: List[object]) -> None:
+        self.production = production
+        self.state = state
+        self.size = size
+        self.children = children
+
+
+class IncrementalLRParser:
+    """Program parser that reuses unchanged subtrees of its previous parse.
+
+    After an edit described by a :class:`lexer.TokenSplice` (see
+    :class:`lexer.IncrementalLexer`), the old tree is offered to the LR
+    driver as input alongside the new tokens, in the style of Wagner and
+    Graham.  A subtree whose tokens, and the lookahead token after them, are
+    unchanged is shifted whole when the parser is in the state the subtree
+    was originally pushed from: the automaton is deterministic, so it would
+    have rebuilt exactly that subtree.  Otherwise the subtree is broken into
+    its children.  The tree, and :meth:`reductions`, always equal what a
+    full :func:`parse` derives.  ``reused_nodes``, ``reused_tokens`` and
+    ``shifted_tokens`` describe the last call.
+    """
+
+    def __init__(self) -> None:
+        self.tree: Optional[SyntaxNode] = None
+        self._token_count = 0
+        self.reused_nodes = 0
+        self.reused_tokens = 0
+        self.shifted_tokens = 0
+
+    def parse(
+        self, tokens: Sequence[Token], splice: Optional[lexer.TokenSplice] = None
+    ) -> SyntaxNode:
+        """Parse the program ``tokens``, reusing the previous tree around ``splice``.
+
+        Without ``splice``, or before a first successful parse, everything is
+        parsed from scratch.  A syntax error raises :class:`ParseError`
+        exactly as :func:`parse` would and discards the tree.
+        """
+        old = self.tree if splice is not None else None
+        if old is not None and len(tokens) != self._token_count + splice.added - splice.removed:
+            raise ValueError("Token splice does not match the previously parsed stream")
+        self.tree = None
+        # The tree is acyclic; collections triggered by its allocations would
+        # only rescan it (compare lexer.load_tokens).
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            tree = self._drive(tokens, old, splice)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        if tree is None:
+            _run(tokens, None)
+            raise ParserConstructionError(
+                "Incremental driver rejected input accepted by the parser"
+            )
+        self.tree = tree
+        self._token_count = len(tokens)
+        return tree
+
+    def reductions(self) -> Iterator[int]:
+        """Yield the production indices of the tree in reduction (post-)order."""
+        if self.tree is None:
+            return
+        stack = [(self.tree, iter(self.tree.children))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if type(child) is SyntaxNode:
+                    stack.append((child, iter(child.children)))
+                    break
+            else:
+                stack.pop()
+                yield node.production
+
+    def _drive(
+        self,
+        tokens: Sequence[Token],
+        old: Optional[SyntaxNode],
+        splice: Optional[lexer.TokenSplice],
+    ) -> Optional[SyntaxNode]:
+        actions = _FAST_ACTIONS
+        lengths = _REDUCE_LENGTHS
+        gotos = _REDUCE_GOTOS
+        states: List[int] = [0]
+        nodes: List[object] = []
+        sizes: List[int] = []
+        state = 0
+        position = 0
+        reused_nodes = reused_tokens = shifted = 0
+
+        # Old subtrees not yet passed, the next one last, each with its start
+        # as an old token index.  New tokens ``edit_start:fresh_end`` replace
+        # old ``edit_start:old_resume``; later ones are old ones moved by
+        # ``delta``.
+        pending: List[Tuple[object, int]] = []
+        edit_start = fresh_end = old_resume = delta = 0
+        if old is not None and splice is not None:
+            pending.append((old, 0))
+            edit_start = splice.start
+            fresh_end = splice.start + splice.added
+            old_resume = splice.start + splice.removed
+            delta = splice.added - splice.removed
+
+        def next_subtree(target: int) -> Optional[SyntaxNode]:
+            """Return the reusable old subtree starting at ``target``, if any."""
+            while pending:
+                node, start = pending[-1]
+                if type(node) is not SyntaxNode:
+                    if start < target:
+                        pending.pop()
+                        continue
+                    return None
+                end = start + node.size
+                if start < target and end <= target:
+                    pending.pop()
+                    continue
+                if start > target:
+                    return None
+                # Reusable only if neither its tokens nor its lookahead token
+                # (the one at ``end``) were touched.
+                if start == target and (end < edit_start or start >= old_resume):
+                    return node
+                break_down()
+            return None
+
+        def break_down() -> None:
+            node, start = pending.pop()
+            child_start = start + node.size  # type: ignore[attr-defined]
+            for child in reversed(node.children):  # type: ignore[attr-defined]
+                child_start -= child.size if type(child) is SyntaxNode else 1
+                pending.append((child, child_start))
+
+        while True:
+            try:
+                kind = tokens[position].kind
+            except IndexError:
+                return None
+            action = actions[state].get(kind)
+            if pending and not edit_start <= position < fresh_end:
+                node = next_subtree(position if position < edit_start else position - delta)
+                if node is not None:
+                    if node.state == state:
+                        pending.pop()
+                        nodes.append(node)
+                        sizes.append(node.size)
+                        try:
+                            state = gotos[node.production][state]
+                        except KeyError:
+                            return None
+                        states.append(state)
+                        position += node.size
+                        reused_nodes += 1
+                        reused_tokens += node.size
+                        continue
+                    if action is None or action >= 0:
+                        # Pending reductions may still reach the
+                        # subtree's state; a shift means it cannot be
+                        # reused as a whole.
+                        break_down()
+                        continue
+            if action is None:
+                return None
+            if action >= 0:
+                nodes.append(kind)
+                sizes.append(1)
+                states.append(action)
+                state = action
+                position += 1
+                shifted += 1
+                continue
+            production_index = ~action
+            if not production_index:
+                break
+            length = lengths[production_index]
+            if length:
+                children = nodes[-length:]
+                size = sum(sizes[-length:])
+                del nodes[-length:], sizes[-length:], states[-length:]
+            else:
+                children = []
+                size = 0
+            nodes.append(SyntaxNode(production_index, states[-1], size, children))
+            sizes.append(size)
+            try:
+                state = gotos[production_index][states[-1]]
+            except KeyError:
+                return None
+            states.append(state)
+        self.reused_nodes = reused_nodes
+        self.reused_tokens = reused_tokens
+        self.shifted_tokens = shifted
+        tree = nodes[-1] if nodes else None
+        return tree if type(tree) is SyntaxNode else None
+
+
+def open_result_cache(
+    path: str, max_bytes: int = result_cache.DEFAULT_MAX_BYTES
+) -> result_cache.ResultCache:
+    """Open a :class:`result_cache.ResultCache` keyed to this grammar."""
+    return result_cache.ResultCache(path, GRAMMAR_FINGERPRINT, max_bytes)
+
+
+def parse_cached(
+    source: str,
+    cache: result_cache.ResultCache,
+    start: str = "program",
+    jobs: int = 1,
+    token_cache: str | None = None,
+) -> result_cache.CachedResult:
+    """Return the outcome of lexing and parsing ``source``, from ``cache`` if possible.
+
+    A hit skips both :func:`lexer.tokenize` and :func:`parse`; a miss lexes
+    (through ``token_cache``), parses with ``jobs`` workers and stores the
+    result.  Lexer and syntax errors are cached like successful parses.
+    """
+    _start_state(start)
+    key = cache.key(source, start)
+    result = cache.get(key)
+    if result is None:
+        result = _parse_result(source, start, jobs, token_cache)
+        cache.put(key, result)
+    return result
+
+
+def _parse_result(
+    source: str, start: str, jobs: int, token_cache: str | None
+) -> result_cache.CachedResult:
+    if len(REDUCTION_TEXTS) > 0x100:  # pragma: no cover - cached logs use one byte per reduction
+        raise ParserConstructionError("Too many productions for byte-packed cached logs")
+    try:
+        tokens = lexer.lex_source(source, token_cache)
+    except LexerError as exc:
+        return result_cache.CachedResult(2, f"LexerError: {exc}", b"")
+    reductions = bytearray()
+    errors = _parse_with(tokens, reductions.append, start, jobs)
+    if errors:
+        return result_cache.CachedResult(3, str(errors[0]), bytes(reductions))
+    return result_cache.CachedResult(0, "", bytes(reductions))
+
+
+def parse_many(
+    sources: Iterable[str],
+    workers: int = 4,
+    start: str = "program",
+    token_cache: str | None = None,
+) -> Iterator[result_cache.CachedResult]:
+    """Lex and parse each source on a pool of ``workers`` threads.
+
+    Results come back in the order of ``sources``, each as the
+    :class:`result_cache.CachedResult` :func:`parse_cached` would return.
+    The tables are module globals built at import and only read afterwards,
+    and every call keeps its parse stack local, so threads need no locking.
+    On a free-threaded build the parses run in parallel; with the GIL they
+    interleave.
+    """
+    _start_state(start)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            partial(_parse_result, start=start, jobs=1, token_cache=token_cache), sources
+        )
+
+
+def _build_arg_parser(prog: str) -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(prog=prog, description="subC LR(1) parser.")
+    arg_parser.add_argument("source", help="subC source file")
+    arg_parser.add_argument(
+        "--format",
+        choices=("text", "binary", "tree"),
+        default="text",
+        help="reduction log format (binary logs are decoded by reduction_log.py); "
+        "'tree' writes a syntax_tree.py file instead",
+    )
+    arg_parser.add_argument(
+        "-o",
+        "--output",
+        metavar="PATH",
+        help="write the reduction log to PATH instead of stdout",
+    )
+    arg_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only validate the input; print nothing unless there is an error",
+    )
+    arg_parser.add_argument(
+        "--start",
+        choices=ENTRY_POINTS,
+        default="program",
+        help="nonterminal the input must derive (default: program)",
+    )
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="parse top-level definitions in N worker processes (program only)",
+    )
+    arg_parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=1,
+        metavar="N",
+        help="report up to N syntax errors, resynchronising at ';' and '}' (default: 1)",
+    )
+    arg_parser.add_argument(
+        "--token-cache",
+        metavar="DIR",
+        help=f"reuse serialised token streams from DIR (default: ${lexer.TOKEN_CACHE_ENV})",
+    )
+    arg_parser.add_argument(
+        "--result-cache",
+        metavar="PATH",
+        help="reuse whole parse results from the database PATH "
+        f"(default: ${result_cache.RESULT_CACHE_ENV})",
+    )
+    arg_parser.add_argument(
+        "--result-cache-size",
+        type=int,
+        default=result_cache.DEFAULT_MAX_BYTES,
+        metavar="BYTES",
+        help="evict least recently used results beyond BYTES (default: 256 MiB)",
+    )
+    return arg_parser
+
+
 def main(argv: Sequence[str]) -> int:
-    if len(argv) != 2:
-        print(f"Usage: {argv[0]} <source-file>", file=sys.stderr)
-        return 1
+    arg_parser = _build_arg_parser(argv[0])
+    args = arg_parser.parse_args(argv[1:])
+    if args.jobs > 1 and args.start != "program":
+        arg_parser.error("--jobs only applies to --start program")
+    if args.jobs > 1 and args.format == "tree":
+        arg_parser.error("--jobs does not apply to --format tree")
+    if args.max_errors < 1:
+        arg_parser.error("--max-errors must be at least 1")
+    if args.max_errors > 1 and (args.jobs > 1 or args.format == "tree"):
+        arg_parser.error("--max-errors only applies to single-process text and binary logs")
+
+    cache_path = args.result_cache or os.environ.get(result_cache.RESULT_CACHE_ENV) or None
+    # Cached results hold reductions and the first error only, and not the
+    # tokens a tree file needs.
+    if cache_path is not None and args.format != "tree" and args.max_errors == 1:
+        try:
+            with open(args.source, "r", encoding="utf-8") as handle:
+                source = handle.read()
+        except OSError as exc:
+            print(f"Could not read input file: {exc}", file=sys.stderr)
+            return 1
+        with open_result_cache(cache_path, args.result_cache_size) as cache:
+            result = parse_cached(source, cache, args.start, args.jobs, args.token_cache)
+        return _replay_result(result, args)
 
     try:
-        tokens = lexer.lex_file(argv[1])
+        tokens = lexer.lex_file(args.source, args.token_cache)
     except OSError as exc:
         print(f"Could not read input file: {exc}", file=sys.stderr)
         return 1
@@ -487,12 +1578,123 @@ def main(argv: Sequence[str]) -> int:
         print(f"LexerError: {exc}", file=sys.stderr)
         return 2
 
+    if args.check:
+        return _report_errors(_parse_with(tokens, None, args.start, args.jobs, args.max_errors))
+
+    if args.format == "binary":
+        return _parse_to_binary(tokens, args.output, args.start, args.jobs, args.max_errors)
+    if args.format == "tree":
+        return _parse_to_tree(tokens, args.output, args.start)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            return _parse_to_text(tokens, handle.write, args.start, args.jobs, args.max_errors)
+    return _parse_to_text(tokens, sys.stdout.write, args.start, args.jobs, args.max_errors)
+
+
+def _replay_result(result: result_cache.CachedResult, args: argparse.Namespace) -> int:
+    """Produce exactly the output and exit status of an uncached run."""
+    if result.status == 2 or args.check:
+        if result.diagnostic:
+            print(result.diagnostic, file=sys.stderr)
+        return result.status
+
+    if args.format == "binary":
+        stream = sys.stdout.buffer if args.output is None else open(args.output, "wb")
+        try:
+            with reduction_log.ReductionLogWriter(stream, REDUCTION_TEXTS) as writer:
+                for production_index in result.reductions:
+                    writer.append(production_index)
+        finally:
+            if args.output is not None:
+                stream.close()
+    else:
+        text = "".join(map(_REDUCTION_LINES.__getitem__, result.reductions))
+        if args.output is None:
+            sys.stdout.write(text)
+        else:
+            with open(args.output, "w", encoding="utf-8") as handle:
+                handle.write(text)
+    if result.diagnostic:
+        print(result.diagnostic, file=sys.stderr)
+    return result.status
+
+
+def _parse_with(
+    tokens: Sequence[Token],
+    on_reduce: Callable[[int], object] | None,
+    start: str,
+    jobs: int,
+    max_errors: int = 1,
+) -> List[ParseError]:
+    """Parse ``tokens`` the way the options ask for; return the syntax errors."""
+    if max_errors > 1:
+        return parse_recovering(tokens, on_reduce, start, max_errors)
     try:
-        parse(tokens)
+        if jobs > 1:
+            # parse_parallel prints the log when given no callback.
+            parse_parallel(tokens, on_reduce or _discard, jobs)
+        else:
+            _run(tokens, on_reduce, _start_state(start))
     except ParseError as exc:
+        return [exc]
+    return []
+
+
+def _discard(production_index: int) -> None:
+    """Reduction callback for checks, which keep no log."""
+
+
+def _report_errors(errors: Sequence[ParseError]) -> int:
+    for error in errors:
+        print(str(error), file=sys.stderr)
+    return 3 if errors else 0
+
+
+def _parse_to_text(
+    tokens: Sequence[Token],
+    write: Callable[[str], object],
+    start: str = "program",
+    jobs: int = 1,
+    max_errors: int = 1,
+) -> int:
+    return _report_errors(_parse_with(tokens, text_emitter(write), start, jobs, max_errors))
+
+
+def _parse_to_binary(
+    tokens: Sequence[Token],
+    path: str | None,
+    start: str = "program",
+    jobs: int = 1,
+    max_errors: int = 1,
+) -> int:
+    if path is None:
+        stream = sys.stdout.buffer
+    else:
+        stream = open(path, "wb")
+    try:
+        # The log is finalised even on a syntax error so the reductions
+        # emitted before the error stay decodable, as in the text format.
+        with reduction_log.ReductionLogWriter(stream, REDUCTION_TEXTS) as writer:
+            errors = _parse_with(tokens, writer.append, start, jobs, max_errors)
+    finally:
+        if path is not None:
+            stream.close()
+    return _report_errors(errors)
+
+
+def _parse_to_tree(tokens: Sequence[Token], path: str | None, start: str = "program") -> int:
+    try:
+        tree = build_tree(tokens, start)
+    except ParseError as exc:
+        # Unlike the logs, a tree cannot be written up to the error.
         print(str(exc), file=sys.stderr)
         return 3
-
+    if path is None:
+        sys.stdout.buffer.write(syntax_tree.encode_tree(tree, tokens, GRAMMAR_FINGERPRINT))
+        sys.stdout.buffer.flush()
+    else:
+        syntax_tree.write_tree(path, tree, tokens, GRAMMAR_FINGERPRINT)
     return 0
 
 
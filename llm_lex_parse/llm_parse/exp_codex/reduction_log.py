@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Compact binary encoding of parser reduction logs.
+
+The text log printed by ``parser.py`` repeats strings such as
+``binary->unary`` once per reduction.  The binary format stores each
+reduction as a varint-encoded production index instead.  The header carries
+the production texts together with a SHA-256 fingerprint over them, so a log
+can be decoded back to the exact text format without rebuilding the parser
+tables.  A sparse offset index is appended after the body to allow random
+access by reduction index.
+
+Layout (all fixed-width integers are little-endian)::
+
+    magic        8 bytes   b"SUBCRLOG"
+    version      u16
+    fingerprint  32 bytes  sha256 over the production texts
+    productions  varint count, then (varint length, utf-8 text) per production
+    body         one varint production index per reduction
+    index        u32 interval, u32 entry count, u64 body offset per entry
+    footer       u64 reduction count, u64 index position, 8 bytes b"SUBCRIDX"
+"""
+
+from __future__ import annotations
+
+from array import array
+import hashlib
+import struct
+import sys
+from typing import BinaryIO, Callable, Iterator, List, Sequence, Tuple
+
+MAGIC = b"SUBCRLOG"
+INDEX_MAGIC = b"SUBCRIDX"
+VERSION = 1
+DEFAULT_INDEX_INTERVAL = 4096
+
+_HEADER = struct.Struct("<8sH32s")
+_INDEX_HEADER = struct.Struct("<II")
+_FOOTER = struct.Struct("<QQ8s")
+
+
+class ReductionLogError(ValueError):
+    """Raised when a binary reduction log is malformed."""
+
+
+def grammar_fingerprint(reduction_texts: Sequence[str]) -> bytes:
+    """Return the SHA-256 digest identifying a grammar's production list."""
+    digest = hashlib.sha256()
+    for index, text in enumerate(reduction_texts):
+        digest.update(f"{index}\t{text}\n".encode("utf-8"))
+    return digest.digest()
+
+
+def encode_varint(value: int) -> bytes:
+    if value < 0:
+        raise ValueError("varints encode non-negative integers only")
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _decode_varint(data: bytes | memoryview, position: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if position >= len(data):
+            raise ReductionLogError("Truncated varint")
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+class ReductionLogWriter:
+    """Stream production indices into the binary reduction log format."""
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        reduction_texts: Sequence[str],
+        index_interval: int = DEFAULT_INDEX_INTERVAL,
+    ) -> None:
+        if index_interval <= 0:
+            raise ValueError("index_interval must be positive")
+        self._stream = stream
+        self._codes: List[bytes] = [encode_varint(i) for i in range(len(reduction_texts))]
+        self._single_byte = len(reduction_texts) <= 0x80
+        self._interval = index_interval
+        self._offsets = array("Q")
+        self._written = 0
+        self._count = 0
+
+        header = bytearray(_HEADER.pack(MAGIC, VERSION, grammar_fingerprint(reduction_texts)))
+        header += encode_varint(len(reduction_texts))
+        for text in reduction_texts:
+            encoded = text.encode("utf-8")
+            header += encode_varint(len(encoded))
+            header += encoded
+        self._stream.write(header)
+        self._body_start = len(header)
+
+        # ``append`` is the per-reduction hot path handed to ``parser.parse``;
+        # a closure over a pending block keeps it to a list append and a
+        # length check.  Blocks coincide with offset index intervals.
+        pending: List[int] = []
+        pending_append = pending.append
+        flush_block = self._flush_block
+
+        def append(production_index: int) -> None:
+            pending_append(production_index)
+            if len(pending) >= index_interval:
+                flush_block()
+
+        self._pending = pending
+        self.append: Callable[[int], None] = append
+
+    @property
+    def count(self) -> int:
+        return self._count + len(self._pending)
+
+    def _flush_block(self) -> None:
+        pending = self._pending
+        if not pending:
+            return
+        if self._single_byte:
+            block = bytes(pending)
+        else:
+            block = b"".join(map(self._codes.__getitem__, pending))
+        self._offsets.append(self._written)
+        self._stream.write(block)
+        self._written += len(block)
+        self._count += len(pending)
+        pending.clear()
+
+    def close(self) -> None:
+        """Write the offset index and footer; the stream itself stays open."""
+        self._flush_block()
+        index_position = self._body_start + self._written
+        if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+            self._offsets.byteswap()
+        self._stream.write(_INDEX_HEADER.pack(self._interval, len(self._offsets)))
+        self._stream.write(self._offsets.tobytes())
+        self._stream.write(_FOOTER.pack(self._count, index_position, INDEX_MAGIC))
+        self._stream.flush()
+
+    def __enter__(self) -> "ReductionLogWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class ReductionLog:
+    """Read-only view of a binary reduction log held in memory."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = memoryview(data)
+        if len(data) < _HEADER.size + _FOOTER.size:
+            raise ReductionLogError("File too short for a reduction log")
+
+        magic, version, fingerprint = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ReductionLogError("Not a reduction log (bad magic)")
+        if version != VERSION:
+            raise ReductionLogError(f"Unsupported reduction log version {version}")
+
+        footer_position = len(data) - _FOOTER.size
+        position = _HEADER.size
+        production_count, position = _decode_varint(data, position)
+        texts: List[str] = []
+        for _ in range(production_count):
+            length, position = _decode_varint(data, position)
+            if position + length > footer_position:
+                raise ReductionLogError("Production table runs past the end of the log")
+            try:
+                texts.append(bytes(data[position : position + length]).decode("utf-8"))
+            except UnicodeDecodeError as exc:
+                raise ReductionLogError(f"Production text is not UTF-8: {exc}") from None
+            position += length
+        if grammar_fingerprint(texts) != fingerprint:
+            raise ReductionLogError("Grammar fingerprint does not match production table")
+
+        count, index_position, index_magic = _FOOTER.unpack_from(data, footer_position)
+        if index_magic != INDEX_MAGIC:
+            raise ReductionLogError("Missing offset index footer (truncated log?)")
+        offsets_start = index_position + _INDEX_HEADER.size
+        if not position <= index_position <= footer_position - _INDEX_HEADER.size:
+            raise ReductionLogError("Offset index position lies outside the log")
+        interval, entries = _INDEX_HEADER.unpack_from(data, index_position)
+        if interval == 0 or offsets_start + 8 * entries != footer_position:
+            raise ReductionLogError("Offset index does not fit between body and footer")
+        body_size = index_position - position
+        if entries != -(-count // interval) or (production_count <= 0x80 and count != body_size):
+            raise ReductionLogError("Reduction count does not match the body and index")
+        offsets = array("Q")
+        offsets.frombytes(data[offsets_start:footer_position])
+        if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+            offsets.byteswap()
+        if any(offset >= body_size for offset in offsets):
+            raise ReductionLogError("Offset index points past the end of the body")
+        body = data[position:index_position]
+        # Varint bodies are checked as they are decoded.
+        if production_count <= 0x80 and body_size and max(body) >= production_count:
+            raise ReductionLogError("Body refers to a production missing from the table")
+
+        self.fingerprint: bytes = fingerprint
+        self.reduction_texts: Tuple[str, ...] = tuple(texts)
+        self._body = self._data[position:index_position]
+        self._count = count
+        self._interval = interval
+        self._offsets = offsets
+        self._single_byte = production_count <= 0x80
+
+    @classmethod
+    def open(cls, path: str) -> "ReductionLog":
+        with open(path, "rb") as handle:
+            return cls(handle.read())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, reduction: int) -> int:
+        """Return the production index of the ``reduction``-th reduction."""
+        if reduction < 0:
+            reduction += self._count
+        if not 0 <= reduction < self._count:
+            raise IndexError("reduction index out of range")
+        body = self._body
+        if self._single_byte:
+            return body[reduction]
+        block, skip = divmod(reduction, self._interval)
+        position = self._offsets[block]
+        try:
+            for _ in range(skip):
+                while body[position] >= 0x80:
+                    position += 1
+                position += 1
+        except IndexError:
+            raise ReductionLogError("Truncated reduction log body") from None
+        return self._production(_decode_varint(body, position)[0])
+
+    def _production(self, value: int) -> int:
+        if value >= len(self.reduction_texts):
+            raise ReductionLogError(f"Body refers to missing production {value}")
+        return value
+
+    def text(self, reduction: int) -> str:
+        return self.reduction_texts[self[reduction]]
+
+    def __iter__(self) -> Iterator[int]:
+        body = self._body
+        if self._single_byte:
+            # Every production index fits in a single varint byte.
+            return iter(body.tobytes())
+        return self._iter_varints(body)
+
+    def _iter_varints(self, body: memoryview) -> Iterator[int]:
+        production = self._production
+        position = 0
+        end = len(body)
+        decoded = 0
+        while position < end:
+            value, position = _decode_varint(body, position)
+            yield production(value)
+            decoded += 1
+        if decoded != self._count:
+            raise ReductionLogError(f"Body holds {decoded} reductions, footer says {self._count}")
+
+    def write_text(self, stream) -> None:
+        """Write the log in the text format produced by ``parser.py``."""
+        lines = [text + "\n" for text in self.reduction_texts]
+        stream.writelines(map(lines.__getitem__, self))
+
+
+def main(argv: Sequence[str]) -> int:
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog=argv[0], description="Decode a binary reduction log to the text format."
+    )
+    arg_parser.add_argument("log", help="binary reduction log written by parser.py --format=binary")
+    arg_parser.add_argument(
+        "--at",
+        type=int,
+        metavar="N",
+        action="append",
+        help="print only the N-th reduction (0-based); may be repeated",
+    )
+    arg_parser.add_argument(
+        "--info", action="store_true", help="print the header summary instead of reductions"
+    )
+    args = arg_parser.parse_args(argv[1:])
+
+    try:
+        log = ReductionLog.open(args.log)
+    except OSError as exc:
+        print(f"Could not read input file: {exc}", file=sys.stderr)
+        return 1
+    except ReductionLogError as exc:
+        print(f"ReductionLogError: {exc}", file=sys.stderr)
+        return 2
+
+    if args.info:
+        print(f"fingerprint\t{log.fingerprint.hex()}")
+        print(f"productions\t{len(log.reduction_texts)}")
+        print(f"reductions\t{len(log)}")
+        return 0
+
+    try:
+        if args.at:
+            for reduction in args.at:
+                if not -len(log) <= reduction < len(log):
+                    print(f"Reduction index out of range (log has {len(log)})", file=sys.stderr)
+                    return 1
+                print(log.text(reduction))
+            return 0
+        log.write_text(sys.stdout)
+    except ReductionLogError as exc:
+        # Body bytes are only checked as they are decoded.
+        print(f"ReductionLogError: {exc}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
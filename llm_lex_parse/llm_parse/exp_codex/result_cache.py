@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of parse results.
+
+Identical sources (vendored copies, reruns, files unchanged across commits)
+always produce the same reductions and diagnostic.  :class:`ResultCache`
+keeps those outcomes in a SQLite database keyed by the SHA-256 of the
+source, the start symbol, the grammar fingerprint and
+:data:`lexer.LEXER_VERSION`, so a hit needs neither ``tokenize`` nor
+``parse``.  A change to the grammar or the scanner changes every key; stale
+entries are never read again and age out through eviction.
+
+The database holds at most ``max_bytes`` of results; the least recently
+used entries are evicted first.  Hit, miss and eviction counts are kept in
+the database and reported by :meth:`ResultCache.stats` and ``result_cache.py
+stats``.  The cache is an optimisation only: a database that cannot be
+opened or written behaves like an empty cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import hashlib
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+from typing import Optional, Sequence
+
+try:
+    from . import lexer  # type: ignore
+except ImportError:  # pragma: no cover - fallback for script execution
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    import lexer  # type: ignore
+
+RESULT_CACHE_ENV = "SUBC_RESULT_CACHE"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Charged per entry on top of its log and diagnostic, roughly the key and
+# row overhead in SQLite.
+ENTRY_OVERHEAD = 128
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    diagnostic TEXT NOT NULL,
+    reductions BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+-- Running total of results.size, kept by put and eviction so neither has
+-- to sum the table.  Databases written before it existed are summed once.
+INSERT OR IGNORE INTO counters SELECT 'bytes', COALESCE(SUM(size), 0) FROM results
+    WHERE NOT EXISTS (SELECT 1 FROM counters WHERE name = 'bytes');
+"""
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    """Outcome of lexing and parsing one source.
+
+    ``status`` and ``diagnostic`` are the exit code and stderr message of
+    ``parser.py`` (0 and ``""`` on success).  ``reductions`` holds one
+    production index per byte, up to the syntax error if there was one.
+    """
+
+    status: int
+    diagnostic: str
+    reductions: bytes
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
+class ResultCache:
+    """SQLite-backed parse results for one grammar, bounded by ``max_bytes``.
+
+    Safe to share between processes; each process (including forked
+    children) opens its own connection on first use.
+    """
+
+    def __init__(self, path: str, fingerprint: bytes, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.path = path
+        self.max_bytes = max_bytes
+        self._salt = f"{fingerprint.hex()}.v{lexer.LEXER_VERSION}"
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        # Counts for this instance; the database keeps the running totals.
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def key(self, source: str, start: str = "program") -> str:
+        """Return the cache key for parsing ``source`` from ``start``."""
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        return f"{digest}.{start}.{self._salt}"
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """Return the cached result for ``key`` and mark it recently used."""
+        try:
+            connection = self._connect()
+            with connection:
+                row = connection.execute(
+                    "SELECT status, diagnostic, reductions FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    connection.execute(
+                        "UPDATE counters SET value = value + 1 WHERE name = 'misses'"
+                    )
+                else:
+                    connection.execute(
+                        "UPDATE results SET last_used = ? WHERE key = ?", (time.time_ns(), key)
+                    )
+                    connection.execute(
+                        "UPDATE counters SET value = value + 1 WHERE name = 'hits'"
+                    )
+        except (OSError, sqlite3.Error):
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResult(row[0], row[1], bytes(row[2]))
+
+    def put(self, key: str, result: CachedResult) -> None:
+        """Store ``result`` under ``key``, evicting old entries to stay within budget."""
+        size = len(result.reductions) + len(result.diagnostic.encode("utf-8")) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        try:
+            connection = self._connect()
+            with connection:
+                # Writing first takes the write lock, so the size of a row
+                # being replaced cannot change before it is subtracted.
+                connection.execute(
+                    "UPDATE counters SET value = value + ? WHERE name = 'bytes'", (size,)
+                )
+                replaced = connection.execute(
+                    "SELECT size FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if replaced is not None:
+                    connection.execute(
+                        "UPDATE counters SET value = value - ? WHERE name = 'bytes'", replaced
+                    )
+                connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, result.status, result.diagnostic, result.reductions, size, time.time_ns()),
+                )
+                self._evict(connection)
+        except (OSError, sqlite3.Error):
+            pass
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        (total,) = connection.execute(
+            "SELECT value FROM counters WHERE name = 'bytes'"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        freed = evicted = 0
+        # Oldest first, in batches, until the budget holds again.
+        while total > self.max_bytes:
+            rows = connection.execute(
+                "SELECT key, size FROM results ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                victims.append((key,))
+                total -= size
+                freed += size
+            connection.executemany("DELETE FROM results WHERE key = ?", victims)
+            evicted += len(victims)
+        connection.execute("UPDATE counters SET value = value - ? WHERE name = 'bytes'", (freed,))
+        connection.execute(
+            "UPDATE counters SET value = value + ? WHERE name = 'evictions'", (evicted,)
+        )
+
+    def stats(self) -> CacheStats:
+        """Return the totals recorded in the database by every user of it."""
+        connection = self._connect()
+        counters = dict(connection.execute("SELECT name, value FROM counters"))
+        (entries,) = connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        return CacheStats(
+            counters["hits"],
+            counters["misses"],
+            counters["evictions"],
+            entries,
+            counters["bytes"],
+            self.max_bytes,
+        )
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM results")
+            connection.execute("UPDATE counters SET value = 0")
+        connection.execute("VACUUM")
+
+
+def main(argv: Sequence[str]) -> int:
+    """Report on or empty a result cache database."""
+    arg_parser = argparse.ArgumentParser(prog=argv[0], description="subC parse result cache.")
+    arg_parser.add_argument("command", choices=("stats", "clear"))
+    arg_parser.add_argument(
+        "--result-cache",
+        metavar="PATH",
+        default=os.environ.get(RESULT_CACHE_ENV),
+        help=f"cache database (default: ${RESULT_CACHE_ENV})",
+    )
+    args = arg_parser.parse_args(argv[1:])
+    if not args.result_cache:
+        arg_parser.error("no cache database given")
+    if not os.path.exists(args.result_cache):
+        print(f"Could not open result cache: {args.result_cache} does not exist", file=sys.stderr)
+        return 1
+
+    # The fingerprint only affects keys, which neither command uses.
+    cache = ResultCache(args.result_cache, b"")
+    try:
+        if args.command == "clear":
+            cache.clear()
+            return 0
+        stats = cache.stats()
+    except sqlite3.Error as exc:
+        print(f"Could not read result cache: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        cache.close()
+    lookups = stats.hits + stats.misses
+    print(f"entries\t{stats.entries}")
+    print(f"bytes\t{stats.bytes}")
+    print(f"hits\t{stats.hits}")
+    print(f"misses\t{stats.misses}")
+    print(f"evictions\t{stats.evictions}")
+    print(f"hit_rate\t{stats.hits / lookups if lookups else 0.0:.3f}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
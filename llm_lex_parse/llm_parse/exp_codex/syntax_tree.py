@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""Compact concrete syntax trees for the exp_codex parser.
+
+``parser.build_tree`` records the parse as a :class:`SyntaxTree`: one arena
+of parallel ``int32`` arrays instead of a Python object per node.  Node ``n``
+has
+
+``productions[n]``
+    the production reduced to build it, or :data:`TOKEN` for a leaf holding
+    one token;
+``first_children[n]`` / ``next_siblings[n]``
+    its leftmost child and its right neighbour, or :data:`NO_NODE`;
+``starts[n]`` / ``ends[n]``
+    the half-open range of token indices it spans (a leaf spans one token,
+    an empty production spans none).
+
+Nodes are numbered in the order the parser creates them: each token leaf
+when it is shifted and each interior node when its production is reduced.
+Interior nodes therefore appear in reduction-log order and the root is the
+last node.  Every shift and every reduction appends exactly one node and
+sets at most one sibling link, so building the tree costs O(1) per parser
+action on top of parsing.
+
+:func:`encode_tree` stores a tree and its tokens in a flat file, written
+atomically by :func:`write_tree`, that :meth:`MappedSyntaxTree.open` maps
+read-only and walks in place, so tools running over the same corpus again
+never reparse it.  Layout (integers little-endian, arrays 4-byte aligned)::
+
+    magic        8 bytes   b"SUBCTREE"
+    version      u16, 2 bytes padding
+    fingerprint  32 bytes  reduction_log.grammar_fingerprint of the grammar
+    counts       u32 nodes, tokens, strings, string bytes
+    nodes        i32 [nodes] each of productions, first_children,
+                 next_siblings, starts, ends
+    tokens       i32 [tokens] each of kind and lexeme (string indices),
+                 line and column
+    strings      u32 [strings + 1] byte offsets, then the utf-8 text of
+                 every distinct kind and lexeme, padded to 4 bytes
+
+:class:`SubtreeTable` is the position-free alternative for whole corpora:
+``parser.build_shared_tree`` hash-conses every subtree into it, so identical
+subtrees share one node ID across all files parsed into the table.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from itertools import compress
+import mmap
+import pathlib
+import struct
+import sys
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from . import lexer  # type: ignore
+except ImportError:  # pragma: no cover - fallback for script execution
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    import lexer  # type: ignore
+
+Token = lexer.Token
+
+# ``productions`` value of a token leaf.
+TOKEN = -1
+# ``first_children`` / ``next_siblings`` value for "none".
+NO_NODE = -1
+
+MAGIC = b"SUBCTREE"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sH2x32s")
+_COUNTS = struct.Struct("<IIII")
+
+
+# ``SubtreeTable`` last-use batch of a slot whose node was evicted.
+_FREE_SLOT = -1
+
+
+class TreeFileError(ValueError):
+    """Raised when a syntax tree file is malformed or for another grammar."""
+
+
+class SyntaxTree:
+    """Arena-backed syntax tree; see the module docstring for the layout.
+
+    The arrays may be any integer sequences of equal length (``array`` while
+    building); nodes are plain ``int`` indices into them.
+    """
+
+    def __init__(
+        self,
+        productions: Sequence[int],
+        first_children: Sequence[int],
+        next_siblings: Sequence[int],
+        starts: Sequence[int],
+        ends: Sequence[int],
+    ) -> None:
+        count = len(productions)
+        if not count or any(
+            len(column) != count for column in (first_children, next_siblings, starts, ends)
+        ):
+            raise ValueError("Syntax tree arrays must be non-empty and of equal length")
+        self.productions = productions
+        self.first_children = first_children
+        self.next_siblings = next_siblings
+        self.starts = starts
+        self.ends = ends
+        self.root = count - 1
+
+    def __len__(self) -> int:
+        return len(self.productions)
+
+    @property
+    def columns(self) -> Tuple[Sequence[int], ...]:
+        """The node arrays in file order."""
+        return self.productions, self.first_children, self.next_siblings, self.starts, self.ends
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the node arrays (4 per field per node for ``int32``)."""
+        return sum(len(column) * getattr(column, "itemsize", 4) for column in self.columns)
+
+    def production(self, node: int) -> int:
+        return self.productions[node]
+
+    def is_token(self, node: int) -> bool:
+        return self.productions[node] == TOKEN
+
+    def span(self, node: int) -> Tuple[int, int]:
+        """Return the ``(start, end)`` token indices covered by ``node``."""
+        return self.starts[node], self.ends[node]
+
+    def first_child(self, node: int) -> int:
+        return self.first_children[node]
+
+    def next_sibling(self, node: int) -> int:
+        return self.next_siblings[node]
+
+    def children(self, node: int) -> Iterator[int]:
+        """Yield the children of ``node`` from left to right."""
+        next_siblings = self.next_siblings
+        child = self.first_children[node]
+        while child != NO_NODE:
+            yield child
+            child = next_siblings[child]
+
+    def preorder(self, node: int | None = None) -> Iterator[int]:
+        """Yield ``node`` (default: the root) and its descendants, parents first."""
+        first_children = self.first_children
+        next_siblings = self.next_siblings
+        stack: List[int] = [self.root if node is None else node]
+        while stack:
+            current = stack.pop()
+            yield current
+            child = first_children[current]
+            if child != NO_NODE:
+                # Push right to left so the leftmost child is visited first.
+                siblings: List[int] = []
+                while child != NO_NODE:
+                    siblings.append(child)
+                    child = next_siblings[child]
+                siblings.reverse()
+                stack.extend(siblings)
+
+    def tokens(self, node: int | None = None) -> range:
+        """Return the token indices under ``node`` (default: the root)."""
+        node = self.root if node is None else node
+        return range(self.starts[node], self.ends[node])
+
+    def reductions(self) -> Iterator[int]:
+        """Yield the production indices in reduction-log order."""
+        productions = self.productions
+        return compress(productions, (production != TOKEN for production in productions))
+
+
+class SubtreeTable:
+    """Hash-consed syntax tree nodes shared by every file parsed into the table.
+
+    A node is identified by its key: ``(TOKEN, kind, lexeme)`` for a token
+    leaf and ``(production, *child_ids)`` for an interior node.  Children
+    are interned before their parent, so equal keys mean equal subtrees and
+    :meth:`intern` returns the existing ID for a repeated one.  Nodes carry
+    no positions; the same ``x + 1`` in a thousand files is one node.
+
+    Files are grouped into batches (:meth:`next_batch`).  Each node records
+    the last batch that interned it, which is never earlier than for any of
+    its parents.  When the table holds more than ``max_nodes`` nodes,
+    :meth:`next_batch` evicts everything not used by the most recent batches
+    that fit, keeping at least the batch just finished.  IDs of evicted
+    nodes are reused, so a root ID stays valid only while its batch is kept.
+    """
+
+    def __init__(self, max_nodes: Optional[int] = None) -> None:
+        if max_nodes is not None and max_nodes < 0:
+            raise ValueError("max_nodes must not be negative")
+        self.max_nodes = max_nodes
+        self.batch = 0
+        self._ids: Dict[tuple, int] = {}
+        self._keys: List[Optional[tuple]] = []
+        # Batch of each node's last use, or _FREE_SLOT.
+        self._last_used = array("i")
+        self._free: List[int] = []
+        # Nodes requested (as many as unshared trees would hold) and created.
+        self.lookups = 0
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def intern(self, key: tuple) -> int:
+        """Return the ID of the node ``key`` describes, adding it if it is new."""
+        self.lookups += 1
+        node = self._ids.get(key)
+        if node is None:
+            self.created += 1
+            if self._free:
+                node = self._free.pop()
+                self._keys[node] = key
+            else:
+                node = len(self._keys)
+                self._keys.append(key)
+                self._last_used.append(self.batch)
+            self._ids[key] = node
+        self._last_used[node] = self.batch
+        return node
+
+    def production(self, node: int) -> int:
+        return self._key(node)[0]
+
+    def is_token(self, node: int) -> bool:
+        return self._key(node)[0] == TOKEN
+
+    def token(self, node: int) -> Tuple[str, str]:
+        """Return the ``(kind, lexeme)`` of a token leaf."""
+        key = self._key(node)
+        if key[0] != TOKEN:
+            raise ValueError(f"Node {node} is not a token")
+        return key[1], key[2]
+
+    def children(self, node: int) -> Tuple[int, ...]:
+        key = self._key(node)
+        return () if key[0] == TOKEN else key[1:]
+
+    def _key(self, node: int) -> tuple:
+        key = self._keys[node]
+        if key is None:
+            raise KeyError(f"Node {node} has been evicted")
+        return key
+
+    def reductions(self, root: int) -> Iterator[int]:
+        """Yield the production indices under ``root`` in reduction-log order."""
+        keys = self._keys
+        stack = [(root, 1)]
+        while stack:
+            node, child = stack.pop()
+            key = keys[node]
+            if key[0] == TOKEN:  # type: ignore[index]
+                continue
+            if child < len(key):  # type: ignore[arg-type]
+                stack.append((node, child + 1))
+                stack.append((key[child], 1))  # type: ignore[index]
+            else:
+                yield key[0]  # type: ignore[index]
+
+    def leaves(self, root: int) -> Iterator[Tuple[str, str]]:
+        """Yield the ``(kind, lexeme)`` of every token under ``root`` in order."""
+        keys = self._keys
+        stack = [root]
+        while stack:
+            key = keys[stack.pop()]
+            if key[0] == TOKEN:  # type: ignore[index]
+                yield key[1], key[2]  # type: ignore[index]
+            else:
+                stack.extend(reversed(key[1:]))  # type: ignore[index]
+
+    def next_batch(self) -> int:
+        """Finish the current batch, evicting old batches beyond ``max_nodes``.
+
+        Returns the number of nodes evicted.
+        """
+        evicted = 0
+        if self.max_nodes is not None and len(self._ids) > self.max_nodes:
+            evicted = self._evict_before(self._cutoff())
+        self.batch += 1
+        return evicted
+
+    def _cutoff(self) -> int:
+        """Return the oldest batch whose nodes, with all newer ones, fit in ``max_nodes``."""
+        per_batch = Counter(self._last_used)
+        per_batch.pop(_FREE_SLOT, None)
+        kept = 0
+        cutoff = self.batch
+        for batch in sorted(per_batch, reverse=True):
+            kept += per_batch[batch]
+            if kept > self.max_nodes and batch < self.batch:  # type: ignore[operator]
+                break
+            cutoff = batch
+        return cutoff
+
+    def _evict_before(self, cutoff: int) -> int:
+        keys = self._keys
+        last_used = self._last_used
+        free = _FREE_SLOT
+        # Batches count up from 0, so this skips free slots.
+        victims = [node for node, batch in enumerate(last_used) if 0 <= batch < cutoff]
+        for node in victims:
+            del self._ids[keys[node]]
+            keys[node] = None
+            last_used[node] = free
+        self._free.extend(reversed(victims))
+        self.evicted += len(victims)
+        return len(victims)
+
+
+def _int32_bytes(values: Sequence[int]) -> bytes:
+    packed = values if isinstance(values, array) and values.typecode == "i" else array("i", values)
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        packed = array("i", packed)
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _int32_view(view: memoryview) -> Sequence[int]:
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        values = array("i", view.tobytes())
+        values.byteswap()
+        return values
+    return view.cast("i")
+
+
+def encode_tree(tree: SyntaxTree, tokens: Sequence[Token], fingerprint: bytes) -> bytes:
+    """Serialise ``tree`` and the ``tokens`` it was parsed from into the flat layout.
+
+    ``fingerprint`` identifies the grammar the production indices refer to
+    (``parser.GRAMMAR_FINGERPRINT``).  Kinds and lexemes are interned into
+    one string table.
+    """
+    string_ids: Dict[str, int] = {}
+    kinds = [string_ids.setdefault(token.kind, len(string_ids)) for token in tokens]
+    lexemes = [string_ids.setdefault(token.lexeme, len(string_ids)) for token in tokens]
+    encoded = [text.encode("utf-8") for text in string_ids]
+    offsets = [0]
+    for text in encoded:
+        offsets.append(offsets[-1] + len(text))
+
+    data = bytearray(_HEADER.pack(MAGIC, VERSION, fingerprint))
+    data += _COUNTS.pack(len(tree), len(tokens), len(encoded), offsets[-1])
+    for column in tree.columns:
+        data += _int32_bytes(column)
+    data += _int32_bytes(kinds)
+    data += _int32_bytes(lexemes)
+    data += _int32_bytes([token.line for token in tokens])
+    data += _int32_bytes([token.column for token in tokens])
+    data += _int32_bytes(offsets)
+    data += b"".join(encoded)
+    data += b"\0" * (-len(data) % 4)
+    return bytes(data)
+
+
+def write_tree(path: str, tree: SyntaxTree, tokens: Sequence[Token], fingerprint: bytes) -> None:
+    """Atomically replace ``path`` with the :func:`encode_tree` file of ``tree``."""
+    lexer.write_atomic(path, encode_tree(tree, tokens, fingerprint))
+
+
+class MappedSyntaxTree(SyntaxTree):
+    """A :class:`SyntaxTree` read in place from an :func:`encode_tree` buffer.
+
+    The node and token arrays are ``memoryview`` casts into the buffer, so
+    opening a file costs the same whatever its size and nothing is copied
+    until it is read.  Strings are decoded on first use.
+    """
+
+    def __init__(self, data: bytes | mmap.mmap, fingerprint: Optional[bytes] = None) -> None:
+        self._buffer = data
+        view = memoryview(data)
+        if len(view) < _HEADER.size + _COUNTS.size:
+            raise TreeFileError("File too short for a syntax tree file")
+        magic, version, file_fingerprint = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise TreeFileError("Not a syntax tree file (bad magic)")
+        if version != VERSION:
+            raise TreeFileError(f"Unsupported syntax tree version {version}")
+        if fingerprint is not None and file_fingerprint != fingerprint:
+            raise TreeFileError("Syntax tree was written for a different grammar")
+        nodes, tokens, strings, string_bytes = _COUNTS.unpack_from(view, _HEADER.size)
+
+        position = _HEADER.size + _COUNTS.size
+        sizes = (nodes,) * 5 + (tokens,) * 4 + (strings + 1,)
+        if len(view) != position + 4 * sum(sizes) + string_bytes + (-string_bytes % 4):
+            raise TreeFileError("Syntax tree size does not match header counts")
+        arrays = []
+        for size in sizes:
+            arrays.append(_int32_view(view[position : position + 4 * size]))
+            position += 4 * size
+        try:
+            super().__init__(*arrays[:5])
+        except ValueError:
+            raise TreeFileError("Syntax tree file has no nodes") from None
+        self.fingerprint: bytes = file_fingerprint
+        self.token_kinds, self.token_lexemes, self.token_lines, self.token_columns = arrays[5:9]
+        self._offsets = arrays[9]
+        self._text = view[position : position + string_bytes]
+        self._strings: List[Optional[str]] = [None] * strings
+
+    @classmethod
+    def open(cls, path: str, fingerprint: Optional[bytes] = None) -> "MappedSyntaxTree":
+        """Map ``path`` read-only, rejecting trees for a grammar other than ``fingerprint``."""
+        with open(path, "rb") as handle:
+            try:
+                mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise TreeFileError("File too short for a syntax tree file") from None
+        return cls(mapping, fingerprint)
+
+    @property
+    def token_count(self) -> int:
+        return len(self.token_kinds)
+
+    @property
+    def string_count(self) -> int:
+        return len(self._strings)
+
+    def string(self, index: int) -> str:
+        text = self._strings[index]
+        if text is None:
+            text = str(self._text[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+            self._strings[index] = text
+        return text
+
+    def token_kind(self, index: int) -> str:
+        return self.string(self.token_kinds[index])
+
+    def token_lexeme(self, index: int) -> str:
+        return self.string(self.token_lexemes[index])
+
+    def token(self, index: int) -> Token:
+        """Return token ``index`` of the parsed stream as a :class:`lexer.Token`."""
+        return Token(
+            self.token_kind(index),
+            self.token_lexeme(index),
+            self.token_lines[index],
+            self.token_columns[index],
+        )
+
+
+def main(argv: Sequence[str]) -> int:
+    """Print the header summary of a syntax tree file."""
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog=argv[0], description="Inspect a subC syntax tree file."
+    )
+    arg_parser.add_argument("tree", help="file written by 'parser.py --format tree'")
+    args = arg_parser.parse_args(argv[1:])
+    try:
+        tree = MappedSyntaxTree.open(args.tree)
+    except OSError as exc:
+        print(f"Could not read syntax tree file: {exc}", file=sys.stderr)
+        return 1
+    except TreeFileError as exc:
+        print(f"TreeFileError: {exc}", file=sys.stderr)
+        return 2
+    print(f"fingerprint\t{tree.fingerprint.hex()}")
+    print(f"nodes\t{len(tree)}")
+    print(f"tokens\t{tree.token_count}")
+    print(f"strings\t{tree.string_count}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""Flat, mmap-able file format for the exp_codex LR(1) parse tables.
+
+Forked workers share the dict-based tables built by ``parser.py`` only until
+they touch them: every lookup writes reference counts (and the cyclic GC
+writes object headers), so the pages holding the dicts are gradually copied
+into each worker.  This module stores the fast tables as plain ``int32``
+matrices instead.  A process maps the file read-only and indexes it through
+``memoryview`` casts, so every process on a host shares one physical copy,
+and it never has to import ``parser.py`` or build the automaton.
+
+Layout (all integers little-endian, arrays 4-byte aligned)::
+
+    magic        8 bytes   b"SUBCTABL"
+    version      u16, 2 bytes padding
+    fingerprint  32 bytes  reduction_log.grammar_fingerprint of the productions
+    counts       u32 states, terminals, productions, entry points
+    strings      u32 length + utf-8 text, padded to 4 bytes, for each
+                 terminal kind, terminal display name, reduction text and
+                 entry point name (in that order)
+    starts       i32 start state per entry point
+    lengths      i32 right-hand side length per production
+    action       i32 [state][terminal]: shift target (>= 0), ~production for
+                 a reduction, ~0 to accept, ERROR for no action
+    goto         i32 [production][state]: state after reducing production
+                 on top of ``state``, ERROR where undefined
+"""
+
+from __future__ import annotations
+
+import mmap
+import pathlib
+import struct
+import sys
+from array import array
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple
+
+try:
+    from . import lexer, reduction_log  # type: ignore
+except ImportError:  # pragma: no cover - fallback for script execution
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    import lexer  # type: ignore
+    import reduction_log  # type: ignore
+
+
+Token = lexer.Token
+
+MAGIC = b"SUBCTABL"
+VERSION = 1
+ERROR = -0x80000000
+
+_HEADER = struct.Struct("<8sH2x32s")
+_COUNTS = struct.Struct("<IIII")
+_LENGTH = struct.Struct("<I")
+
+
+class TableFileError(ValueError):
+    """Raised when a parse table file is malformed."""
+
+
+class ParseError(RuntimeError):
+    def __init__(self, message: str, token: Token):
+        super().__init__(message)
+        self.token = token
+
+
+def _pad(buffer: bytearray) -> None:
+    buffer += b"\0" * (-len(buffer) % 4)
+
+
+def _int32_bytes(values: Sequence[int]) -> bytes:
+    packed = array("i", values)
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def encode_tables(
+    terminals: Sequence[str],
+    terminal_names: Sequence[str],
+    actions: Sequence[Mapping[str, int]],
+    reduce_lengths: Sequence[int],
+    reduce_gotos: Sequence[Mapping[int, int]],
+    reduction_texts: Sequence[str],
+    start_states: Mapping[str, int],
+) -> bytes:
+    """Serialise the integer tables of ``parser.py`` into the flat layout."""
+    states = len(actions)
+    column = {symbol: index for index, symbol in enumerate(terminals)}
+    action_matrix = [ERROR] * (states * len(terminals))
+    for state, row in enumerate(actions):
+        base = state * len(terminals)
+        for symbol, action in row.items():
+            action_matrix[base + column[symbol]] = action
+    goto_matrix = [ERROR] * (len(reduce_gotos) * states)
+    for production, targets in enumerate(reduce_gotos):
+        base = production * states
+        for state, target in targets.items():
+            goto_matrix[base + state] = target
+
+    data = bytearray(_HEADER.pack(MAGIC, VERSION, reduction_log.grammar_fingerprint(reduction_texts)))
+    data += _COUNTS.pack(states, len(terminals), len(reduction_texts), len(start_states))
+    for text in (*terminals, *terminal_names, *reduction_texts, *start_states):
+        encoded = text.encode("utf-8")
+        data += _LENGTH.pack(len(encoded))
+        data += encoded
+        _pad(data)
+    data += _int32_bytes(list(start_states.values()))
+    data += _int32_bytes(reduce_lengths)
+    data += _int32_bytes(action_matrix)
+    data += _int32_bytes(goto_matrix)
+    return bytes(data)
+
+
+def write_tables(path: str, data: bytes) -> None:
+    """Replace ``path`` with the table file ``data`` (see :func:`lexer.write_atomic`)."""
+    lexer.write_atomic(path, data)
+
+
+class ParseTables:
+    """Parse tables read from a flat table file, usually a shared mapping."""
+
+    def __init__(self, data: bytes | mmap.mmap) -> None:
+        self._buffer = data
+        view = memoryview(data)
+        if len(view) < _HEADER.size + _COUNTS.size:
+            raise TableFileError("File too short for a parse table file")
+        magic, version, fingerprint = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise TableFileError("Not a parse table file (bad magic)")
+        if version != VERSION:
+            raise TableFileError(f"Unsupported parse table version {version}")
+        states, terminals, productions, entries = _COUNTS.unpack_from(view, _HEADER.size)
+        if not (states and terminals and productions and entries):
+            raise TableFileError("Parse table file has an empty table")
+
+        position = _HEADER.size + _COUNTS.size
+        strings: List[str] = []
+        try:
+            for _ in range(2 * terminals + productions + entries):
+                (length,) = _LENGTH.unpack_from(view, position)
+                position += _LENGTH.size
+                strings.append(bytes(view[position : position + length]).decode("utf-8"))
+                position += length + (-length % 4)
+        except (struct.error, UnicodeDecodeError) as exc:
+            raise TableFileError(f"Corrupt string table: {exc}") from None
+        kinds = strings[:terminals]
+        names = strings[terminals : 2 * terminals]
+        texts = strings[2 * terminals : 2 * terminals + productions]
+        entry_names = strings[2 * terminals + productions :]
+        if reduction_log.grammar_fingerprint(texts) != fingerprint:
+            raise TableFileError("Grammar fingerprint does not match production table")
+
+        sizes = (entries, productions, states * terminals, productions * states)
+        if len(view) != position + 4 * sum(sizes):
+            raise TableFileError("Table size does not match header counts")
+        arrays = []
+        for size in sizes:
+            arrays.append(self._int32_view(view[position : position + 4 * size]))
+            position += 4 * size
+        starts, lengths, actions, gotos = arrays
+        # Row views into the mapping: a few hundred small objects per process
+        # instead of a copy of the tables, and one subscript per lookup.
+        self._actions = [actions[row : row + terminals] for row in range(0, len(actions), terminals)]
+        self._gotos = [gotos[row : row + states] for row in range(0, len(gotos), states)]
+
+        self.fingerprint: bytes = fingerprint
+        self.terminals: Tuple[str, ...] = tuple(kinds)
+        self.reduction_texts: Tuple[str, ...] = tuple(texts)
+        self.start_states: Dict[str, int] = dict(zip(entry_names, starts))
+        self.state_count = states
+        self._names = names
+        self._lengths = lengths
+        self._columns = {kind: index for index, kind in enumerate(kinds)}
+        self._lines = [text + "\n" for text in texts]
+
+    @staticmethod
+    def _int32_view(view: memoryview) -> Sequence[int]:
+        if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+            values = array("i", view.tobytes())
+            values.byteswap()
+            return values
+        return view.cast("i")
+
+    @classmethod
+    def open(cls, path: str) -> "ParseTables":
+        """Map ``path`` read-only; the pages are shared by every process mapping it."""
+        with open(path, "rb") as handle:
+            try:
+                mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise TableFileError("File too short for a parse table file") from None
+        return cls(mapping)
+
+    def text_emitter(self, write: Callable[[str], object]) -> Callable[[int], None]:
+        """Return an ``on_reduce`` callback writing text-format reductions."""
+        lines = self._lines
+
+        def emit(production_index: int) -> None:
+            write(lines[production_index])
+
+        return emit
+
+    def parse(
+        self,
+        tokens: Sequence[Token],
+        on_reduce: Callable[[int], object] | None = None,
+        start: str = "program",
+    ) -> None:
+        """Parse ``tokens`` exactly like ``parser.parse``, reductions and errors included."""
+        if on_reduce is None:
+            on_reduce = self.text_emitter(sys.stdout.write)
+        self._drive(tokens, on_reduce, start)
+
+    def check(self, tokens: Sequence[Token], start: str = "program") -> None:
+        self._drive(tokens, None, start)
+
+    def _drive(
+        self, tokens: Sequence[Token], on_reduce: Callable[[int], object] | None, start: str
+    ) -> None:
+        try:
+            state = self.start_states[start]
+        except KeyError:
+            raise ValueError(
+                f"Unknown start symbol {start!r}; expected one of {', '.join(self.start_states)}"
+            ) from None
+        actions = self._actions
+        gotos = self._gotos
+        lengths = self._lengths
+        columns = self._columns
+        stack: List[int] = [state]
+        push = stack.append
+        index = 0
+        column = columns.get(tokens[0].kind)
+        while True:
+            action = ERROR if column is None else actions[state][column]
+            if action >= 0:
+                push(action)
+                state = action
+                index += 1
+                column = columns.get(tokens[index].kind)
+                continue
+            if action == ERROR:
+                raise self._syntax_error(state, tokens[index])
+            production_index = ~action
+            if not production_index:
+                return
+            if on_reduce is not None:
+                on_reduce(production_index)
+            length = lengths[production_index]
+            if length:
+                del stack[-length:]
+            state = gotos[production_index][stack[-1]]
+            push(state)
+
+    def _syntax_error(self, state: int, token: Token) -> ParseError:
+        row = self._actions[state]
+        expected = sorted(name for name, action in zip(self._names, row) if action != ERROR)
+        expected_text = ", ".join(expected) if expected else "EOF"
+        lexeme = token.lexeme or token.kind
+        return ParseError(
+            f"SyntaxError: expected {expected_text} before {lexeme} "
+            f"at line {token.line}, column {token.column}",
+            token,
+        )
+
+
+def main(argv: Sequence[str]) -> int:
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog=argv[0], description="Export or use flat, mmap-able subC parse tables."
+    )
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="build the tables with parser.py and write them")
+    export.add_argument("tables", help="output table file")
+    use = commands.add_parser("parse", help="parse a source file with an exported table file")
+    use.add_argument("tables", help="table file written by 'export'")
+    use.add_argument("source", help="subC source file")
+    use.add_argument("--check", action="store_true", help="only validate the input")
+    use.add_argument("--start", default="program", help="nonterminal the input must derive")
+    info = commands.add_parser("info", help="print a table file's header summary")
+    info.add_argument("tables")
+    args = arg_parser.parse_args(argv[1:])
+
+    if args.command == "export":
+        try:
+            from . import parser  # type: ignore
+        except ImportError:  # pragma: no cover - script execution
+            import parser  # type: ignore
+        try:
+            parser.export_tables(args.tables)
+        except OSError as exc:
+            print(f"Could not write table file: {exc}", file=sys.stderr)
+            return 1
+        return 0
+
+    try:
+        tables = ParseTables.open(args.tables)
+    except OSError as exc:
+        print(f"Could not read table file: {exc}", file=sys.stderr)
+        return 1
+    except TableFileError as exc:
+        print(f"TableFileError: {exc}", file=sys.stderr)
+        return 2
+
+    if args.command == "info":
+        print(f"fingerprint\t{tables.fingerprint.hex()}")
+        print(f"states\t{tables.state_count}")
+        print(f"terminals\t{len(tables.terminals)}")
+        print(f"productions\t{len(tables.reduction_texts)}")
+        print(f"entry_points\t{', '.join(tables.start_states)}")
+        return 0
+
+    try:
+        tokens = lexer.lex_file(args.source)
+    except OSError as exc:
+        print(f"Could not read input file: {exc}", file=sys.stderr)
+        return 1
+    except lexer.LexerError as exc:
+        print(f"LexerError: {exc}", file=sys.stderr)
+        return 2
+    try:
+        if args.check:
+            tables.check(tokens, args.start)
+        else:
+            tables.parse(tokens, start=args.start)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    except ParseError as exc:
+        print(str(exc), file=sys.stderr)
+        return 3
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
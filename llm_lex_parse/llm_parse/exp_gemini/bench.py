@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Benchmarks for the exp_gemini parser.
+
+``parser_4.py`` only carries a hand-written fragment of the tables and fails
+on any function body, so it cannot parse a large input at all.  To measure
+what its driver costs, ``drivers`` runs a copy of the parser_4 loop (string
+actions, re-quoted punctuation, slicing reductions) over the generated
+tables re-encoded in parser_4's format, and compares it with ``parser.parse``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import pathlib
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+import parser  # noqa: E402
+import table_gen  # noqa: E402
+from lexer import Token, tokenize  # noqa: E402
+
+_EXPRESSIONS = (
+    "a + b * c",
+    "(x - 1) * (y + 2) / 3",
+    "p->next->value % 7",
+    "s.items[i + 1] == k || !done && count < limit",
+    "f(a, b, c) + g()",
+    "-*ptr + &value[2]",
+    "i++ + --j",
+    "'c' != name[0]",
+    "NULL == node",
+)
+
+_STATEMENTS = (
+    "x = {e};",
+    "if ({e}) x = 1; else y = 2;",
+    "while ({e}) {{ i = i + 1; }}",
+    "for (i = 0; i < n; i++) {{ total = total + {e}; }}",
+    "return {e};",
+    "{{ int t; t = {e}; }}",
+    "if ({e}) {{ break; }}",
+    ";",
+)
+
+
+def generate_program(functions: int, statements: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: List[str] = ["struct node { int value; struct node *next; };", "int table[64];"]
+    for index in range(functions):
+        body = [
+            "    " + rng.choice(_STATEMENTS).format(e=rng.choice(_EXPRESSIONS))
+            for _ in range(statements)
+        ]
+        parts.append(
+            f"int f{index}(int a, int b, char *name) {{\n"
+            "    int x; int y; int i;\n" + "\n".join(body) + "\n    return x;\n}"
+        )
+    return "\n\n".join(parts) + "\n"
+
+
+def legacy_tables() -> Tuple[Dict[int, Dict[str, str]], Dict[int, Dict[str, int]]]:
+    """Re-encode the generated tables in parser_4's ACTION/GOTO format."""
+    quoted = {
+        table_gen.token_kind(symbol): symbol
+        for _, rhs in table_gen.GRAMMAR
+        for symbol in rhs
+        if symbol.startswith("'")
+    }
+    action: Dict[int, Dict[str, str]] = {}
+    for state, row in enumerate(parser.ACTION):
+        action[state] = {}
+        for kind, entry in row.items():
+            if entry == parser.ACCEPT:
+                text = "acc"
+            elif entry >= 0:
+                text = f"s{entry}"
+            else:
+                text = f"r{~entry}"
+            action[state][quoted.get(kind, kind)] = text
+    goto: Dict[int, Dict[str, int]] = {}
+    for symbol, targets in parser.GOTO.items():
+        for state, target in targets.items():
+            goto.setdefault(state, {})[symbol] = target
+    return action, goto
+
+
+_PUNCTUATION = ["(", ")", "[", "]", "{", "}", ".", ",", "!", "*", "/", "%", "+", "-", "&", ";", "="]
+
+
+def legacy_parse(tokens: List[Token], action_table, goto_table, write: Callable[[str], object]) -> int:
+    """The parser_4.py driver loop, minus its file handling."""
+    grammar = table_gen.GRAMMAR
+    tokens = tokens + [Token("$", "$", -1, -1)]
+    stack: List[Tuple[int, str]] = [(0, "")]
+    token_idx = 0
+
+    while True:
+        state = stack[-1][0]
+        token = tokens[token_idx]
+        action = action_table.get(state, {}).get(token.kind)
+
+        if token.kind in _PUNCTUATION:
+            action = action_table.get(state, {}).get(f"'{token.kind}'")
+
+        if action is None:
+            return 1
+
+        if action.startswith("s"):
+            new_state = int(action[1:])
+            stack.append((new_state, token.lexeme))
+            token_idx += 1
+        elif action.startswith("r"):
+            rule_num = int(action[1:])
+            lhs, rhs = grammar[rule_num]
+            if rhs:
+                stack = stack[: -len(rhs)]
+            write(f"{lhs}->{' '.join(rhs) if rhs else 'epsilon'}\n")
+            state = stack[-1][0]
+            goto_state = goto_table.get(state, {}).get(lhs)
+            if goto_state is None:
+                return 1
+            stack.append((goto_state, lhs))
+        elif action == "acc":
+            return 0
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _load_source(args: argparse.Namespace) -> str:
+    if args.source:
+        with open(args.source, "r", encoding="utf-8") as handle:
+            return handle.read()
+    return generate_program(args.functions, args.statements)
+
+
+def bench_drivers(args: argparse.Namespace) -> None:
+    source = _load_source(args)
+    tokens = list(tokenize(source))
+    action_table, goto_table = legacy_tables()
+
+    legacy_log = io.StringIO()
+    assert legacy_parse(tokens, action_table, goto_table, legacy_log.write) == 0
+    log = io.StringIO()
+    parser.parse(tokens, log.write)
+    assert log.getvalue() == legacy_log.getvalue(), "drivers disagree"
+
+    sink = io.StringIO().write
+    lex_time = _best_of(args.repeat, lambda: list(tokenize(source)))
+    legacy_time = _best_of(args.repeat, lambda: legacy_parse(tokens, action_table, goto_table, sink))
+    new_time = _best_of(args.repeat, lambda: parser.parse(tokens, sink))
+
+    print(f"tokens\t{len(tokens)}")
+    print(f"reductions\t{log.getvalue().count(chr(10))}")
+    print(f"lex_s\t{lex_time:.4f}")
+    print(f"parser_4_driver_s\t{legacy_time:.4f}\t{len(tokens) / legacy_time / 1e6:.2f} Mtok/s")
+    print(f"parser_s\t{new_time:.4f}\t{len(tokens) / new_time / 1e6:.2f} Mtok/s")
+    print(f"speedup\t{legacy_time / new_time:.2f}x")
+
+
+SUBCOMMANDS = {
+    "drivers": bench_drivers,
+}
+
+
+def main(argv: Sequence[str]) -> int:
+    arg_parser = argparse.ArgumentParser(prog=argv[0], description=__doc__.splitlines()[0])
+    arg_parser.add_argument("benchmark", choices=sorted(SUBCOMMANDS))
+    arg_parser.add_argument("--source", help="benchmark this file instead of a generated program")
+    arg_parser.add_argument("--functions", type=int, default=200)
+    arg_parser.add_argument("--statements", type=int, default=40)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv[1:])
+    SUBCOMMANDS[args.benchmark](args)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main(sys.argv))
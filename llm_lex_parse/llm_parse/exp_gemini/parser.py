@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Parser for subC, driven by the generated tables in parser_tables.py."""
+
+from __future__ import annotations
+
+import sys
+from itertools import chain
+from typing import Callable, Iterable, List
+
+from lexer import Token, tokenize
+from parser_tables import ACTION, GOTO, REDUCE_LENGTHS, REDUCE_LHS, REDUCTIONS
+
+ACCEPT = ~0
+END_KIND = "$"
+
+# Per production: GOTO row of its left-hand side and the log line it prints.
+_REDUCE_GOTO = [GOTO[lhs] for lhs in REDUCE_LHS]
+_REDUCTION_LINES = [text + "\n" for text in REDUCTIONS]
+
+
+class ParseError(Exception):
+    def __init__(self, message: str, token: Token) -> None:
+        super().__init__(message)
+        self.token = token
+
+
+def parse(tokens: Iterable[Token], write: Callable[[str], object]) -> None:
+    """Parse ``tokens``, passing each reduction line to ``write``."""
+    action_rows = ACTION
+    reduce_goto = _REDUCE_GOTO
+    reduce_lengths = REDUCE_LENGTHS
+    lines = _REDUCTION_LINES
+    stack: List[int] = [0]
+    push = stack.append
+    last = Token(END_KIND, "end of input", 1, 1)
+
+    for token in chain(tokens, (None,)):
+        if token is None:
+            token = Token(END_KIND, "end of input", last.line, last.column + len(last.lexeme))
+        last = token
+        kind = token.kind
+        while True:
+            action = action_rows[stack[-1]].get(kind)
+            if action is None:
+                expected = ", ".join(sorted(action_rows[stack[-1]]))
+                raise ParseError(
+                    f"SyntaxError: expected {expected} before {token.lexeme} "
+                    f"at line {token.line}, column {token.column}",
+                    token,
+                )
+            if action >= 0:
+                push(action)
+                break
+            if action == ACCEPT:
+                return
+            production = ~action
+            write(lines[production])
+            length = reduce_lengths[production]
+            if length:
+                del stack[-length:]
+            push(reduce_goto[production][stack[-1]])
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 2:
+        print(f"Usage: {argv[0]} <source-file>", file=sys.stderr)
+        return 1
+
+    try:
+        with open(argv[1], "r", encoding="utf-8") as handle:
+            source = handle.read()
+    except OSError as exc:
+        print(f"Could not read input file: {exc}", file=sys.stderr)
+        return 1
+
+    try:
+        parse(tokenize(source), sys.stdout.write)
+    except ParseError as exc:
+        sys.stdout.flush()
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,338 @@
+# Generated by table_gen.py from the parser_spec.md grammar. Do not edit.
+"""LALR(1) tables for the exp_gemini parser.
+
+ACTION[state][token kind] is a shift target (>= 0), ~p to reduce by
+production p, or ~0 to accept.  GOTO[nonterminal][state] is the state
+entered after reducing to that nonterminal.
+"""
+
+REDUCTIONS = (
+    "program'->program",  # 0
+    'program->ext_def_list',  # 1
+    'ext_def_list->ext_def_list ext_def',  # 2
+    'ext_def_list->epsilon',  # 3
+    "ext_def->type_specifier pointers ID ';'",  # 4
+    "ext_def->type_specifier pointers ID '[' INTEGER_CONST ']' ';'",  # 5
+    "ext_def->struct_specifier ';'",  # 6
+    'ext_def->func_decl compound_stmt',  # 7
+    'type_specifier->TYPE',  # 8
+    'type_specifier->VOID',  # 9
+    'type_specifier->struct_specifier',  # 10
+    "struct_specifier->STRUCT ID '{' def_list '}'",  # 11
+    'struct_specifier->STRUCT ID',  # 12
+    "func_decl->type_specifier pointers ID '(' ')'",  # 13
+    "func_decl->type_specifier pointers ID '(' VOID ')'",  # 14
+    "func_decl->type_specifier pointers ID '(' param_list ')'",  # 15
+    "pointers->'*'",  # 16
+    'pointers->epsilon',  # 17
+    'param_list->param_decl',  # 18
+    "param_list->param_list ',' param_decl",  # 19
+    'param_decl->type_specifier pointers ID',  # 20
+    "param_decl->type_specifier pointers ID '[' INTEGER_CONST ']'",  # 21
+    'def_list->def_list def',  # 22
+    'def_list->epsilon',  # 23
+    "def->type_specifier pointers ID ';'",  # 24
+    "def->type_specifier pointers ID '[' INTEGER_CONST ']' ';'",  # 25
+    "compound_stmt->'{' def_list stmt_list '}'",  # 26
+    'stmt_list->stmt_list stmt',  # 27
+    'stmt_list->epsilon',  # 28
+    "stmt->expr ';'",  # 29
+    'stmt->compound_stmt',  # 30
+    "stmt->RETURN ';'",  # 31
+    "stmt->RETURN expr ';'",  # 32
+    "stmt->';'",  # 33
+    "stmt->IF '(' expr ')' stmt",  # 34
+    "stmt->IF '(' expr ')' stmt ELSE stmt",  # 35
+    "stmt->WHILE '(' expr ')' stmt",  # 36
+    "stmt->FOR '(' expr_e ';' expr_e ';' expr_e ')' stmt",  # 37
+    "stmt->BREAK ';'",  # 38
+    "stmt->CONTINUE ';'",  # 39
+    'expr_e->expr',  # 40
+    'expr_e->epsilon',  # 41
+    "expr->unary '=' expr",  # 42
+    'expr->binary',  # 43
+    'binary->binary RELOP binary',  # 44
+    'binary->binary EQUOP binary',  # 45
+    "binary->binary '+' binary",  # 46
+    "binary->binary '-' binary",  # 47
+    "binary->binary '*' binary",  # 48
+    "binary->binary '/' binary",  # 49
+    "binary->binary '%' binary",  # 50
+    'binary->unary',  # 51
+    'binary->binary LOGICAL_AND binary',  # 52
+    'binary->binary LOGICAL_OR binary',  # 53
+    "unary->'(' expr ')'",  # 54
+    'unary->INTEGER_CONST',  # 55
+    'unary->CHAR_CONST',  # 56
+    'unary->STRING',  # 57
+    'unary->ID',  # 58
+    "unary->'-' unary",  # 59
+    "unary->'!' unary",  # 60
+    'unary->unary INCOP',  # 61
+    'unary->unary DECOP',  # 62
+    'unary->INCOP unary',  # 63
+    'unary->DECOP unary',  # 64
+    "unary->'&' unary",  # 65
+    "unary->'*' unary",  # 66
+    "unary->unary '[' expr ']'",  # 67
+    "unary->unary '.' ID",  # 68
+    'unary->unary STRUCTOP ID',  # 69
+    "unary->unary '(' args ')'",  # 70
+    "unary->unary '(' ')'",  # 71
+    'unary->SYM_NULL',  # 72
+    'args->expr',  # 73
+    "args->args ',' expr",  # 74
+)
+
+REDUCE_LHS = (
+    "program'",
+    'program',
+    'ext_def_list',
+    'ext_def_list',
+    'ext_def',
+    'ext_def',
+    'ext_def',
+    'ext_def',
+    'type_specifier',
+    'type_specifier',
+    'type_specifier',
+    'struct_specifier',
+    'struct_specifier',
+    'func_decl',
+    'func_decl',
+    'func_decl',
+    'pointers',
+    'pointers',
+    'param_list',
+    'param_list',
+    'param_decl',
+    'param_decl',
+    'def_list',
+    'def_list',
+    'def',
+    'def',
+    'compound_stmt',
+    'stmt_list',
+    'stmt_list',
+    'stmt',
+    'stmt',
+    'stmt',
+    'stmt',
+    'stmt',
+    'stmt',
+    'stmt',
+    'stmt',
+    'stmt',
+    'stmt',
+    'stmt',
+    'expr_e',
+    'expr_e',
+    'expr',
+    'expr',
+    'binary',
+    'binary',
+    'binary',
+    'binary',
+    'binary',
+    'binary',
+    'binary',
+    'binary',
+    'binary',
+    'binary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'unary',
+    'args',
+    'args',
+)
+
+REDUCE_LENGTHS = (1, 1, 2, 0, 4, 7, 2, 2, 1, 1, 1, 5, 2, 5, 6, 6, 1, 0, 1, 3, 3, 6, 2, 0, 4, 7, 4, 2, 0, 2, 1, 2, 3, 1, 5, 7, 5, 9, 2, 2, 1, 0, 3, 1, 3, 3, 3, 3, 3, 3, 3, 1, 3, 3, 3, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 4, 3, 3, 4, 3, 1, 1, 3)
+
+ACTION = (
+    {'$': -4, 'STRUCT': -4, 'TYPE': -4, 'VOID': -4},  # 0
+    {'$': -2, 'STRUCT': 3, 'TYPE': 4, 'VOID': 5},  # 1
+    {'$': -1},  # 2
+    {'ID': 10},  # 3
+    {'*': -9, 'ID': -9},  # 4
+    {'*': -10, 'ID': -10},  # 5
+    {'$': -3, 'STRUCT': -3, 'TYPE': -3, 'VOID': -3},  # 6
+    {'{': 11},  # 7
+    {'*': -11, ';': 13, 'ID': -11},  # 8
+    {'*': 14, 'ID': -18},  # 9
+    {'*': -13, ';': -13, 'ID': -13, '{': 16},  # 10
+    {'!': -24, '&': -24, '(': -24, '*': -24, '-': -24, ';': -24, 'BREAK': -24, 'CHAR_CONST': -24, 'CONTINUE': -24, 'DECOP': -24, 'FOR': -24, 'ID': -24, 'IF': -24, 'INCOP': -24, 'INTEGER_CONST': -24, 'RETURN': -24, 'STRING': -24, 'STRUCT': -24, 'SYM_NULL': -24, 'TYPE': -24, 'VOID': -24, 'WHILE': -24, '{': -24, '}': -24},  # 11
+    {'$': -8, 'STRUCT': -8, 'TYPE': -8, 'VOID': -8},  # 12
+    {'$': -7, 'STRUCT': -7, 'TYPE': -7, 'VOID': -7},  # 13
+    {'ID': -17},  # 14
+    {'ID': 18},  # 15
+    {'STRUCT': -24, 'TYPE': -24, 'VOID': -24, '}': -24},  # 16
+    {'!': -29, '&': -29, '(': -29, '*': -29, '-': -29, ';': -29, 'BREAK': -29, 'CHAR_CONST': -29, 'CONTINUE': -29, 'DECOP': -29, 'FOR': -29, 'ID': -29, 'IF': -29, 'INCOP': -29, 'INTEGER_CONST': -29, 'RETURN': -29, 'STRING': -29, 'STRUCT': 3, 'SYM_NULL': -29, 'TYPE': 4, 'VOID': 5, 'WHILE': -29, '{': -29, '}': -29},  # 17
+    {'(': 24, ';': 25, '[': 26},  # 18
+    {'STRUCT': 3, 'TYPE': 4, 'VOID': 5, '}': 27},  # 19
+    {'!': -23, '&': -23, '(': -23, '*': -23, '-': -23, ';': -23, 'BREAK': -23, 'CHAR_CONST': -23, 'CONTINUE': -23, 'DECOP': -23, 'FOR': -23, 'ID': -23, 'IF': -23, 'INCOP': -23, 'INTEGER_CONST': -23, 'RETURN': -23, 'STRING': -23, 'STRUCT': -23, 'SYM_NULL': -23, 'TYPE': -23, 'VOID': -23, 'WHILE': -23, '{': -23, '}': -23},  # 20
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, ';': 33, 'BREAK': 35, 'CHAR_CONST': 36, 'CONTINUE': 37, 'DECOP': 38, 'FOR': 39, 'ID': 40, 'IF': 41, 'INCOP': 42, 'INTEGER_CONST': 43, 'RETURN': 44, 'STRING': 45, 'SYM_NULL': 46, 'WHILE': 47, '{': 11, '}': 34},  # 21
+    {'*': -11, 'ID': -11},  # 22
+    {'*': 14, 'ID': -18},  # 23
+    {')': 54, 'STRUCT': 3, 'TYPE': 4, 'VOID': 55},  # 24
+    {'$': -5, 'STRUCT': -5, 'TYPE': -5, 'VOID': -5},  # 25
+    {'INTEGER_CONST': 59},  # 26
+    {'*': -12, ';': -12, 'ID': -12},  # 27
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 28
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 29
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 30
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 31
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 32
+    {'!': -34, '&': -34, '(': -34, '*': -34, '-': -34, ';': -34, 'BREAK': -34, 'CHAR_CONST': -34, 'CONTINUE': -34, 'DECOP': -34, 'ELSE': -34, 'FOR': -34, 'ID': -34, 'IF': -34, 'INCOP': -34, 'INTEGER_CONST': -34, 'RETURN': -34, 'STRING': -34, 'SYM_NULL': -34, 'WHILE': -34, '{': -34, '}': -34},  # 33
+    {'!': -27, '$': -27, '&': -27, '(': -27, '*': -27, '-': -27, ';': -27, 'BREAK': -27, 'CHAR_CONST': -27, 'CONTINUE': -27, 'DECOP': -27, 'ELSE': -27, 'FOR': -27, 'ID': -27, 'IF': -27, 'INCOP': -27, 'INTEGER_CONST': -27, 'RETURN': -27, 'STRING': -27, 'STRUCT': -27, 'SYM_NULL': -27, 'TYPE': -27, 'VOID': -27, 'WHILE': -27, '{': -27, '}': -27},  # 34
+    {';': 65},  # 35
+    {'%': -57, '(': -57, ')': -57, '*': -57, '+': -57, ',': -57, '-': -57, '.': -57, '/': -57, ';': -57, '=': -57, 'DECOP': -57, 'EQUOP': -57, 'INCOP': -57, 'LOGICAL_AND': -57, 'LOGICAL_OR': -57, 'RELOP': -57, 'STRUCTOP': -57, '[': -57, ']': -57},  # 36
+    {';': 66},  # 37
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 38
+    {'(': 68},  # 39
+    {'%': -59, '(': -59, ')': -59, '*': -59, '+': -59, ',': -59, '-': -59, '.': -59, '/': -59, ';': -59, '=': -59, 'DECOP': -59, 'EQUOP': -59, 'INCOP': -59, 'LOGICAL_AND': -59, 'LOGICAL_OR': -59, 'RELOP': -59, 'STRUCTOP': -59, '[': -59, ']': -59},  # 40
+    {'(': 69},  # 41
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 42
+    {'%': -56, '(': -56, ')': -56, '*': -56, '+': -56, ',': -56, '-': -56, '.': -56, '/': -56, ';': -56, '=': -56, 'DECOP': -56, 'EQUOP': -56, 'INCOP': -56, 'LOGICAL_AND': -56, 'LOGICAL_OR': -56, 'RELOP': -56, 'STRUCTOP': -56, '[': -56, ']': -56},  # 43
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, ';': 71, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 44
+    {'%': -58, '(': -58, ')': -58, '*': -58, '+': -58, ',': -58, '-': -58, '.': -58, '/': -58, ';': -58, '=': -58, 'DECOP': -58, 'EQUOP': -58, 'INCOP': -58, 'LOGICAL_AND': -58, 'LOGICAL_OR': -58, 'RELOP': -58, 'STRUCTOP': -58, '[': -58, ']': -58},  # 45
+    {'%': -73, '(': -73, ')': -73, '*': -73, '+': -73, ',': -73, '-': -73, '.': -73, '/': -73, ';': -73, '=': -73, 'DECOP': -73, 'EQUOP': -73, 'INCOP': -73, 'LOGICAL_AND': -73, 'LOGICAL_OR': -73, 'RELOP': -73, 'STRUCTOP': -73, '[': -73, ']': -73},  # 46
+    {'(': 73},  # 47
+    {'%': 74, ')': -44, '*': 75, '+': 76, ',': -44, '-': 77, '/': 78, ';': -44, 'EQUOP': 79, 'LOGICAL_AND': 80, 'LOGICAL_OR': 81, 'RELOP': 82, ']': -44},  # 48
+    {'!': -31, '&': -31, '(': -31, '*': -31, '-': -31, ';': -31, 'BREAK': -31, 'CHAR_CONST': -31, 'CONTINUE': -31, 'DECOP': -31, 'ELSE': -31, 'FOR': -31, 'ID': -31, 'IF': -31, 'INCOP': -31, 'INTEGER_CONST': -31, 'RETURN': -31, 'STRING': -31, 'SYM_NULL': -31, 'WHILE': -31, '{': -31, '}': -31},  # 49
+    {';': 83},  # 50
+    {'!': -28, '&': -28, '(': -28, '*': -28, '-': -28, ';': -28, 'BREAK': -28, 'CHAR_CONST': -28, 'CONTINUE': -28, 'DECOP': -28, 'FOR': -28, 'ID': -28, 'IF': -28, 'INCOP': -28, 'INTEGER_CONST': -28, 'RETURN': -28, 'STRING': -28, 'SYM_NULL': -28, 'WHILE': -28, '{': -28, '}': -28},  # 51
+    {'%': -52, '(': 84, ')': -52, '*': -52, '+': -52, ',': -52, '-': -52, '.': 85, '/': -52, ';': -52, '=': 86, 'DECOP': 88, 'EQUOP': -52, 'INCOP': 89, 'LOGICAL_AND': -52, 'LOGICAL_OR': -52, 'RELOP': -52, 'STRUCTOP': 90, '[': 87, ']': -52},  # 52
+    {'ID': 91},  # 53
+    {'{': -14},  # 54
+    {')': 92, '*': -10, 'ID': -10},  # 55
+    {')': -19, ',': -19},  # 56
+    {')': 93, ',': 94},  # 57
+    {'*': 14, 'ID': -18},  # 58
+    {']': 96},  # 59
+    {'%': -61, '(': 84, ')': -61, '*': -61, '+': -61, ',': -61, '-': -61, '.': 85, '/': -61, ';': -61, '=': -61, 'DECOP': 88, 'EQUOP': -61, 'INCOP': 89, 'LOGICAL_AND': -61, 'LOGICAL_OR': -61, 'RELOP': -61, 'STRUCTOP': 90, '[': 87, ']': -61},  # 60
+    {'%': -66, '(': 84, ')': -66, '*': -66, '+': -66, ',': -66, '-': -66, '.': 85, '/': -66, ';': -66, '=': -66, 'DECOP': 88, 'EQUOP': -66, 'INCOP': 89, 'LOGICAL_AND': -66, 'LOGICAL_OR': -66, 'RELOP': -66, 'STRUCTOP': 90, '[': 87, ']': -66},  # 61
+    {')': 97},  # 62
+    {'%': -67, '(': 84, ')': -67, '*': -67, '+': -67, ',': -67, '-': -67, '.': 85, '/': -67, ';': -67, '=': -67, 'DECOP': 88, 'EQUOP': -67, 'INCOP': 89, 'LOGICAL_AND': -67, 'LOGICAL_OR': -67, 'RELOP': -67, 'STRUCTOP': 90, '[': 87, ']': -67},  # 63
+    {'%': -60, '(': 84, ')': -60, '*': -60, '+': -60, ',': -60, '-': -60, '.': 85, '/': -60, ';': -60, '=': -60, 'DECOP': 88, 'EQUOP': -60, 'INCOP': 89, 'LOGICAL_AND': -60, 'LOGICAL_OR': -60, 'RELOP': -60, 'STRUCTOP': 90, '[': 87, ']': -60},  # 64
+    {'!': -39, '&': -39, '(': -39, '*': -39, '-': -39, ';': -39, 'BREAK': -39, 'CHAR_CONST': -39, 'CONTINUE': -39, 'DECOP': -39, 'ELSE': -39, 'FOR': -39, 'ID': -39, 'IF': -39, 'INCOP': -39, 'INTEGER_CONST': -39, 'RETURN': -39, 'STRING': -39, 'SYM_NULL': -39, 'WHILE': -39, '{': -39, '}': -39},  # 65
+    {'!': -40, '&': -40, '(': -40, '*': -40, '-': -40, ';': -40, 'BREAK': -40, 'CHAR_CONST': -40, 'CONTINUE': -40, 'DECOP': -40, 'ELSE': -40, 'FOR': -40, 'ID': -40, 'IF': -40, 'INCOP': -40, 'INTEGER_CONST': -40, 'RETURN': -40, 'STRING': -40, 'SYM_NULL': -40, 'WHILE': -40, '{': -40, '}': -40},  # 66
+    {'%': -65, '(': 84, ')': -65, '*': -65, '+': -65, ',': -65, '-': -65, '.': 85, '/': -65, ';': -65, '=': -65, 'DECOP': 88, 'EQUOP': -65, 'INCOP': 89, 'LOGICAL_AND': -65, 'LOGICAL_OR': -65, 'RELOP': -65, 'STRUCTOP': 90, '[': 87, ']': -65},  # 67
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, ';': -42, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 68
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 69
+    {'%': -64, '(': 84, ')': -64, '*': -64, '+': -64, ',': -64, '-': -64, '.': 85, '/': -64, ';': -64, '=': -64, 'DECOP': 88, 'EQUOP': -64, 'INCOP': 89, 'LOGICAL_AND': -64, 'LOGICAL_OR': -64, 'RELOP': -64, 'STRUCTOP': 90, '[': 87, ']': -64},  # 70
+    {'!': -32, '&': -32, '(': -32, '*': -32, '-': -32, ';': -32, 'BREAK': -32, 'CHAR_CONST': -32, 'CONTINUE': -32, 'DECOP': -32, 'ELSE': -32, 'FOR': -32, 'ID': -32, 'IF': -32, 'INCOP': -32, 'INTEGER_CONST': -32, 'RETURN': -32, 'STRING': -32, 'SYM_NULL': -32, 'WHILE': -32, '{': -32, '}': -32},  # 71
+    {';': 101},  # 72
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 73
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 74
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 75
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 76
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 77
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 78
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 79
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 80
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 81
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 82
+    {'!': -30, '&': -30, '(': -30, '*': -30, '-': -30, ';': -30, 'BREAK': -30, 'CHAR_CONST': -30, 'CONTINUE': -30, 'DECOP': -30, 'ELSE': -30, 'FOR': -30, 'ID': -30, 'IF': -30, 'INCOP': -30, 'INTEGER_CONST': -30, 'RETURN': -30, 'STRING': -30, 'SYM_NULL': -30, 'WHILE': -30, '{': -30, '}': -30},  # 83
+    {'!': 28, '&': 29, '(': 30, ')': 113, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 84
+    {'ID': 116},  # 85
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 86
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 87
+    {'%': -63, '(': -63, ')': -63, '*': -63, '+': -63, ',': -63, '-': -63, '.': -63, '/': -63, ';': -63, '=': -63, 'DECOP': -63, 'EQUOP': -63, 'INCOP': -63, 'LOGICAL_AND': -63, 'LOGICAL_OR': -63, 'RELOP': -63, 'STRUCTOP': -63, '[': -63, ']': -63},  # 88
+    {'%': -62, '(': -62, ')': -62, '*': -62, '+': -62, ',': -62, '-': -62, '.': -62, '/': -62, ';': -62, '=': -62, 'DECOP': -62, 'EQUOP': -62, 'INCOP': -62, 'LOGICAL_AND': -62, 'LOGICAL_OR': -62, 'RELOP': -62, 'STRUCTOP': -62, '[': -62, ']': -62},  # 89
+    {'ID': 119},  # 90
+    {';': 120, '[': 121},  # 91
+    {'{': -15},  # 92
+    {'{': -16},  # 93
+    {'STRUCT': 3, 'TYPE': 4, 'VOID': 5},  # 94
+    {'ID': 123},  # 95
+    {';': 124},  # 96
+    {'%': -55, '(': -55, ')': -55, '*': -55, '+': -55, ',': -55, '-': -55, '.': -55, '/': -55, ';': -55, '=': -55, 'DECOP': -55, 'EQUOP': -55, 'INCOP': -55, 'LOGICAL_AND': -55, 'LOGICAL_OR': -55, 'RELOP': -55, 'STRUCTOP': -55, '[': -55, ']': -55},  # 97
+    {')': -41, ';': -41},  # 98
+    {';': 125},  # 99
+    {')': 126},  # 100
+    {'!': -33, '&': -33, '(': -33, '*': -33, '-': -33, ';': -33, 'BREAK': -33, 'CHAR_CONST': -33, 'CONTINUE': -33, 'DECOP': -33, 'ELSE': -33, 'FOR': -33, 'ID': -33, 'IF': -33, 'INCOP': -33, 'INTEGER_CONST': -33, 'RETURN': -33, 'STRING': -33, 'SYM_NULL': -33, 'WHILE': -33, '{': -33, '}': -33},  # 101
+    {')': 127},  # 102
+    {'%': -51, ')': -51, '*': -51, '+': -51, ',': -51, '-': -51, '/': -51, ';': -51, 'EQUOP': -51, 'LOGICAL_AND': -51, 'LOGICAL_OR': -51, 'RELOP': -51, ']': -51},  # 103
+    {'%': -52, '(': 84, ')': -52, '*': -52, '+': -52, ',': -52, '-': -52, '.': 85, '/': -52, ';': -52, 'DECOP': 88, 'EQUOP': -52, 'INCOP': 89, 'LOGICAL_AND': -52, 'LOGICAL_OR': -52, 'RELOP': -52, 'STRUCTOP': 90, '[': 87, ']': -52},  # 104
+    {'%': -49, ')': -49, '*': -49, '+': -49, ',': -49, '-': -49, '/': -49, ';': -49, 'EQUOP': -49, 'LOGICAL_AND': -49, 'LOGICAL_OR': -49, 'RELOP': -49, ']': -49},  # 105
+    {'%': 74, ')': -47, '*': 75, '+': -47, ',': -47, '-': -47, '/': 78, ';': -47, 'EQUOP': -47, 'LOGICAL_AND': -47, 'LOGICAL_OR': -47, 'RELOP': -47, ']': -47},  # 106
+    {'%': 74, ')': -48, '*': 75, '+': -48, ',': -48, '-': -48, '/': 78, ';': -48, 'EQUOP': -48, 'LOGICAL_AND': -48, 'LOGICAL_OR': -48, 'RELOP': -48, ']': -48},  # 107
+    {'%': -50, ')': -50, '*': -50, '+': -50, ',': -50, '-': -50, '/': -50, ';': -50, 'EQUOP': -50, 'LOGICAL_AND': -50, 'LOGICAL_OR': -50, 'RELOP': -50, ']': -50},  # 108
+    {'%': 74, ')': -46, '*': 75, '+': 76, ',': -46, '-': 77, '/': 78, ';': -46, 'EQUOP': -46, 'LOGICAL_AND': -46, 'LOGICAL_OR': -46, 'RELOP': 82, ']': -46},  # 109
+    {'%': 74, ')': -53, '*': 75, '+': 76, ',': -53, '-': 77, '/': 78, ';': -53, 'EQUOP': 79, 'LOGICAL_AND': -53, 'LOGICAL_OR': -53, 'RELOP': 82, ']': -53},  # 110
+    {'%': 74, ')': -54, '*': 75, '+': 76, ',': -54, '-': 77, '/': 78, ';': -54, 'EQUOP': 79, 'LOGICAL_AND': 80, 'LOGICAL_OR': -54, 'RELOP': 82, ']': -54},  # 111
+    {'%': 74, ')': -45, '*': 75, '+': 76, ',': -45, '-': 77, '/': 78, ';': -45, 'EQUOP': -45, 'LOGICAL_AND': -45, 'LOGICAL_OR': -45, 'RELOP': -45, ']': -45},  # 112
+    {'%': -72, '(': -72, ')': -72, '*': -72, '+': -72, ',': -72, '-': -72, '.': -72, '/': -72, ';': -72, '=': -72, 'DECOP': -72, 'EQUOP': -72, 'INCOP': -72, 'LOGICAL_AND': -72, 'LOGICAL_OR': -72, 'RELOP': -72, 'STRUCTOP': -72, '[': -72, ']': -72},  # 113
+    {')': 128, ',': 129},  # 114
+    {')': -74, ',': -74},  # 115
+    {'%': -69, '(': -69, ')': -69, '*': -69, '+': -69, ',': -69, '-': -69, '.': -69, '/': -69, ';': -69, '=': -69, 'DECOP': -69, 'EQUOP': -69, 'INCOP': -69, 'LOGICAL_AND': -69, 'LOGICAL_OR': -69, 'RELOP': -69, 'STRUCTOP': -69, '[': -69, ']': -69},  # 116
+    {')': -43, ',': -43, ';': -43, ']': -43},  # 117
+    {']': 130},  # 118
+    {'%': -70, '(': -70, ')': -70, '*': -70, '+': -70, ',': -70, '-': -70, '.': -70, '/': -70, ';': -70, '=': -70, 'DECOP': -70, 'EQUOP': -70, 'INCOP': -70, 'LOGICAL_AND': -70, 'LOGICAL_OR': -70, 'RELOP': -70, 'STRUCTOP': -70, '[': -70, ']': -70},  # 119
+    {'!': -25, '&': -25, '(': -25, '*': -25, '-': -25, ';': -25, 'BREAK': -25, 'CHAR_CONST': -25, 'CONTINUE': -25, 'DECOP': -25, 'FOR': -25, 'ID': -25, 'IF': -25, 'INCOP': -25, 'INTEGER_CONST': -25, 'RETURN': -25, 'STRING': -25, 'STRUCT': -25, 'SYM_NULL': -25, 'TYPE': -25, 'VOID': -25, 'WHILE': -25, '{': -25, '}': -25},  # 120
+    {'INTEGER_CONST': 131},  # 121
+    {')': -20, ',': -20},  # 122
+    {')': -21, ',': -21, '[': 132},  # 123
+    {'$': -6, 'STRUCT': -6, 'TYPE': -6, 'VOID': -6},  # 124
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, ';': -42, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 125
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, ';': 33, 'BREAK': 35, 'CHAR_CONST': 36, 'CONTINUE': 37, 'DECOP': 38, 'FOR': 39, 'ID': 40, 'IF': 41, 'INCOP': 42, 'INTEGER_CONST': 43, 'RETURN': 44, 'STRING': 45, 'SYM_NULL': 46, 'WHILE': 47, '{': 11},  # 126
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, ';': 33, 'BREAK': 35, 'CHAR_CONST': 36, 'CONTINUE': 37, 'DECOP': 38, 'FOR': 39, 'ID': 40, 'IF': 41, 'INCOP': 42, 'INTEGER_CONST': 43, 'RETURN': 44, 'STRING': 45, 'SYM_NULL': 46, 'WHILE': 47, '{': 11},  # 127
+    {'%': -71, '(': -71, ')': -71, '*': -71, '+': -71, ',': -71, '-': -71, '.': -71, '/': -71, ';': -71, '=': -71, 'DECOP': -71, 'EQUOP': -71, 'INCOP': -71, 'LOGICAL_AND': -71, 'LOGICAL_OR': -71, 'RELOP': -71, 'STRUCTOP': -71, '[': -71, ']': -71},  # 128
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 129
+    {'%': -68, '(': -68, ')': -68, '*': -68, '+': -68, ',': -68, '-': -68, '.': -68, '/': -68, ';': -68, '=': -68, 'DECOP': -68, 'EQUOP': -68, 'INCOP': -68, 'LOGICAL_AND': -68, 'LOGICAL_OR': -68, 'RELOP': -68, 'STRUCTOP': -68, '[': -68, ']': -68},  # 130
+    {']': 137},  # 131
+    {'INTEGER_CONST': 138},  # 132
+    {';': 139},  # 133
+    {'!': -35, '&': -35, '(': -35, '*': -35, '-': -35, ';': -35, 'BREAK': -35, 'CHAR_CONST': -35, 'CONTINUE': -35, 'DECOP': -35, 'ELSE': 140, 'FOR': -35, 'ID': -35, 'IF': -35, 'INCOP': -35, 'INTEGER_CONST': -35, 'RETURN': -35, 'STRING': -35, 'SYM_NULL': -35, 'WHILE': -35, '{': -35, '}': -35},  # 134
+    {'!': -37, '&': -37, '(': -37, '*': -37, '-': -37, ';': -37, 'BREAK': -37, 'CHAR_CONST': -37, 'CONTINUE': -37, 'DECOP': -37, 'ELSE': -37, 'FOR': -37, 'ID': -37, 'IF': -37, 'INCOP': -37, 'INTEGER_CONST': -37, 'RETURN': -37, 'STRING': -37, 'SYM_NULL': -37, 'WHILE': -37, '{': -37, '}': -37},  # 135
+    {')': -75, ',': -75},  # 136
+    {';': 141},  # 137
+    {']': 142},  # 138
+    {'!': 28, '&': 29, '(': 30, ')': -42, '*': 31, '-': 32, 'CHAR_CONST': 36, 'DECOP': 38, 'ID': 40, 'INCOP': 42, 'INTEGER_CONST': 43, 'STRING': 45, 'SYM_NULL': 46},  # 139
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, ';': 33, 'BREAK': 35, 'CHAR_CONST': 36, 'CONTINUE': 37, 'DECOP': 38, 'FOR': 39, 'ID': 40, 'IF': 41, 'INCOP': 42, 'INTEGER_CONST': 43, 'RETURN': 44, 'STRING': 45, 'SYM_NULL': 46, 'WHILE': 47, '{': 11},  # 140
+    {'!': -26, '&': -26, '(': -26, '*': -26, '-': -26, ';': -26, 'BREAK': -26, 'CHAR_CONST': -26, 'CONTINUE': -26, 'DECOP': -26, 'FOR': -26, 'ID': -26, 'IF': -26, 'INCOP': -26, 'INTEGER_CONST': -26, 'RETURN': -26, 'STRING': -26, 'STRUCT': -26, 'SYM_NULL': -26, 'TYPE': -26, 'VOID': -26, 'WHILE': -26, '{': -26, '}': -26},  # 141
+    {')': -22, ',': -22},  # 142
+    {')': 145},  # 143
+    {'!': -36, '&': -36, '(': -36, '*': -36, '-': -36, ';': -36, 'BREAK': -36, 'CHAR_CONST': -36, 'CONTINUE': -36, 'DECOP': -36, 'ELSE': -36, 'FOR': -36, 'ID': -36, 'IF': -36, 'INCOP': -36, 'INTEGER_CONST': -36, 'RETURN': -36, 'STRING': -36, 'SYM_NULL': -36, 'WHILE': -36, '{': -36, '}': -36},  # 144
+    {'!': 28, '&': 29, '(': 30, '*': 31, '-': 32, ';': 33, 'BREAK': 35, 'CHAR_CONST': 36, 'CONTINUE': 37, 'DECOP': 38, 'FOR': 39, 'ID': 40, 'IF': 41, 'INCOP': 42, 'INTEGER_CONST': 43, 'RETURN': 44, 'STRING': 45, 'SYM_NULL': 46, 'WHILE': 47, '{': 11},  # 145
+    {'!': -38, '&': -38, '(': -38, '*': -38, '-': -38, ';': -38, 'BREAK': -38, 'CHAR_CONST': -38, 'CONTINUE': -38, 'DECOP': -38, 'ELSE': -38, 'FOR': -38, 'ID': -38, 'IF': -38, 'INCOP': -38, 'INTEGER_CONST': -38, 'RETURN': -38, 'STRING': -38, 'SYM_NULL': -38, 'WHILE': -38, '{': -38, '}': -38},  # 146
+)
+
+GOTO = {
+    'args': {84: 114},
+    'binary': {21: 48, 30: 48, 44: 48, 68: 48, 69: 48, 73: 48, 74: 103, 75: 105, 76: 106, 77: 107, 78: 108, 79: 109, 80: 110, 81: 111, 82: 112, 84: 48, 86: 48, 87: 48, 125: 48, 126: 48, 127: 48, 129: 48, 139: 48, 140: 48, 145: 48},
+    'compound_stmt': {7: 12, 21: 49, 126: 49, 127: 49, 140: 49, 145: 49},
+    'def': {17: 20, 19: 20},
+    'def_list': {11: 17, 16: 19},
+    'expr': {21: 50, 30: 62, 44: 72, 68: 98, 69: 100, 73: 102, 84: 115, 86: 117, 87: 118, 125: 98, 126: 50, 127: 50, 129: 136, 139: 98, 140: 50, 145: 50},
+    'expr_e': {68: 99, 125: 133, 139: 143},
+    'ext_def': {1: 6},
+    'ext_def_list': {0: 1},
+    'func_decl': {1: 7},
+    'param_decl': {24: 56, 94: 122},
+    'param_list': {24: 57},
+    'pointers': {9: 15, 23: 53, 58: 95},
+    'program': {0: 2},
+    "program'": {},
+    'stmt': {21: 51, 126: 134, 127: 135, 140: 144, 145: 146},
+    'stmt_list': {17: 21},
+    'struct_specifier': {1: 8, 17: 22, 19: 22, 24: 22, 94: 22},
+    'type_specifier': {1: 9, 17: 23, 19: 23, 24: 58, 94: 58},
+    'unary': {21: 52, 28: 60, 29: 61, 30: 52, 31: 63, 32: 64, 38: 67, 42: 70, 44: 52, 68: 52, 69: 52, 73: 52, 74: 104, 75: 104, 76: 104, 77: 104, 78: 104, 79: 104, 80: 104, 81: 104, 82: 104, 84: 52, 86: 52, 87: 52, 125: 52, 126: 52, 127: 52, 129: 52, 139: 52, 140: 52, 145: 52},
+}
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""LALR(1) table generator for the exp_gemini parser.
+
+Builds ACTION/GOTO tables for the full grammar of ``parser_spec.md`` and
+writes them to ``parser_tables.py`` as pre-decoded integers, so the driver
+never parses action strings at run time.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+END = "$"
+
+# 0: augmented start; 1-74 follow parser_spec.md section 2.3 in order.
+GRAMMAR: List[Tuple[str, List[str]]] = [
+    ("program'", ["program"]),
+    ("program", ["ext_def_list"]),
+    ("ext_def_list", ["ext_def_list", "ext_def"]),
+    ("ext_def_list", []),
+    ("ext_def", ["type_specifier", "pointers", "ID", "';'"]),
+    ("ext_def", ["type_specifier", "pointers", "ID", "'['", "INTEGER_CONST", "']'", "';'"]),
+    ("ext_def", ["struct_specifier", "';'"]),
+    ("ext_def", ["func_decl", "compound_stmt"]),
+    ("type_specifier", ["TYPE"]),
+    ("type_specifier", ["VOID"]),
+    ("type_specifier", ["struct_specifier"]),
+    ("struct_specifier", ["STRUCT", "ID", "'{'", "def_list", "'}'"]),
+    ("struct_specifier", ["STRUCT", "ID"]),
+    ("func_decl", ["type_specifier", "pointers", "ID", "'('", "')'"]),
+    ("func_decl", ["type_specifier", "pointers", "ID", "'('", "VOID", "')'"]),
+    ("func_decl", ["type_specifier", "pointers", "ID", "'('", "param_list", "')'"]),
+    ("pointers", ["'*'"]),
+    ("pointers", []),
+    ("param_list", ["param_decl"]),
+    ("param_list", ["param_list", "','", "param_decl"]),
+    ("param_decl", ["type_specifier", "pointers", "ID"]),
+    ("param_decl", ["type_specifier", "pointers", "ID", "'['", "INTEGER_CONST", "']'"]),
+    ("def_list", ["def_list", "def"]),
+    ("def_list", []),
+    ("def", ["type_specifier", "pointers", "ID", "';'"]),
+    ("def", ["type_specifier", "pointers", "ID", "'['", "INTEGER_CONST", "']'", "';'"]),
+    ("compound_stmt", ["'{'", "def_list", "stmt_list", "'}'"]),
+    ("stmt_list", ["stmt_list", "stmt"]),
+    ("stmt_list", []),
+    ("stmt", ["expr", "';'"]),
+    ("stmt", ["compound_stmt"]),
+    ("stmt", ["RETURN", "';'"]),
+    ("stmt", ["RETURN", "expr", "';'"]),
+    ("stmt", ["';'"]),
+    ("stmt", ["IF", "'('", "expr", "')'", "stmt"]),
+    ("stmt", ["IF", "'('", "expr", "')'", "stmt", "ELSE", "stmt"]),
+    ("stmt", ["WHILE", "'('", "expr", "')'", "stmt"]),
+    ("stmt", ["FOR", "'('", "expr_e", "';'", "expr_e", "';'", "expr_e", "')'", "stmt"]),
+    ("stmt", ["BREAK", "';'"]),
+    ("stmt", ["CONTINUE", "';'"]),
+    ("expr_e", ["expr"]),
+    ("expr_e", []),
+    ("expr", ["unary", "'='", "expr"]),
+    ("expr", ["binary"]),
+    ("binary", ["binary", "RELOP", "binary"]),
+    ("binary", ["binary", "EQUOP", "binary"]),
+    ("binary", ["binary", "'+'", "binary"]),
+    ("binary", ["binary", "'-'", "binary"]),
+    ("binary", ["binary", "'*'", "binary"]),
+    ("binary", ["binary", "'/'", "binary"]),
+    ("binary", ["binary", "'%'", "binary"]),
+    ("binary", ["unary"]),
+    ("binary", ["binary", "LOGICAL_AND", "binary"]),
+    ("binary", ["binary", "LOGICAL_OR", "binary"]),
+    ("unary", ["'('", "expr", "')'"]),
+    ("unary", ["INTEGER_CONST"]),
+    ("unary", ["CHAR_CONST"]),
+    ("unary", ["STRING"]),
+    ("unary", ["ID"]),
+    ("unary", ["'-'", "unary"]),
+    ("unary", ["'!'", "unary"]),
+    ("unary", ["unary", "INCOP"]),
+    ("unary", ["unary", "DECOP"]),
+    ("unary", ["INCOP", "unary"]),
+    ("unary", ["DECOP", "unary"]),
+    ("unary", ["'&'", "unary"]),
+    ("unary", ["'*'", "unary"]),
+    ("unary", ["unary", "'['", "expr", "']'"]),
+    ("unary", ["unary", "'.'", "ID"]),
+    ("unary", ["unary", "STRUCTOP", "ID"]),
+    ("unary", ["unary", "'('", "args", "')'"]),
+    ("unary", ["unary", "'('", "')'"]),
+    ("unary", ["SYM_NULL"]),
+    ("args", ["expr"]),
+    ("args", ["args", "','", "expr"]),
+]
+
+# parser_spec.md section 2.2, renumbered so a larger level binds tighter.
+PRECEDENCE: Dict[str, Tuple[int, str]] = {
+    "'('": (10, "left"),
+    "'['": (10, "left"),
+    "'.'": (10, "left"),
+    "STRUCTOP": (10, "left"),
+    "INCOP": (10, "left"),
+    "DECOP": (10, "left"),
+    "'!'": (9, "right"),
+    "'&'": (9, "right"),
+    "'*'": (8, "left"),
+    "'/'": (8, "left"),
+    "'%'": (8, "left"),
+    "'+'": (7, "left"),
+    "'-'": (7, "left"),
+    "RELOP": (6, "left"),
+    "EQUOP": (5, "left"),
+    "LOGICAL_AND": (4, "left"),
+    "LOGICAL_OR": (3, "left"),
+    "'='": (2, "right"),
+    "','": (1, "left"),
+}
+
+# Prefix operators share their token with a binary or postfix form, so
+# their productions take the prefix level explicitly (yacc's %prec).
+PREFIX_PRECEDENCE = (9, "right")
+
+Item = Tuple[int, int]
+
+
+def production_precedence(index: int) -> Optional[Tuple[int, str]]:
+    lhs, rhs = GRAMMAR[index]
+    if lhs == "unary" and rhs[1:] == ["unary"]:
+        return PREFIX_PRECEDENCE
+    for symbol in reversed(rhs):
+        if symbol in PRECEDENCE:
+            return PRECEDENCE[symbol]
+    return None
+
+
+def reduction_text(index: int) -> str:
+    lhs, rhs = GRAMMAR[index]
+    return f"{lhs}->{' '.join(rhs) if rhs else 'epsilon'}"
+
+
+def token_kind(symbol: str) -> str:
+    """Return the lexer's token kind for a grammar terminal ("';'" -> ";")."""
+    if len(symbol) == 3 and symbol[0] == symbol[2] == "'":
+        return symbol[1]
+    return symbol
+
+
+def build_tables() -> Tuple[List[Dict[str, int]], Dict[str, Dict[int, int]]]:
+    """Return (ACTION, GOTO).
+
+    ACTION has one dict per state from token kind to an action: a shift
+    target ``>= 0``, ``~p`` to reduce by production ``p``, or ``~0`` to
+    accept.  GOTO maps each nonterminal to ``{state: target}``.
+    """
+    nonterminals = {lhs for lhs, _ in GRAMMAR}
+    by_lhs: Dict[str, List[int]] = {}
+    for index, (lhs, _) in enumerate(GRAMMAR):
+        by_lhs.setdefault(lhs, []).append(index)
+
+    nullable: Set[str] = set()
+    first: Dict[str, Set[str]] = {symbol: set() for symbol in nonterminals}
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs in GRAMMAR:
+            before = (lhs in nullable, len(first[lhs]))
+            for symbol in rhs:
+                if symbol in nonterminals:
+                    first[lhs] |= first[symbol]
+                    if symbol not in nullable:
+                        break
+                else:
+                    first[lhs].add(symbol)
+                    break
+            else:
+                nullable.add(lhs)
+            changed |= before != (lhs in nullable, len(first[lhs]))
+
+    def first_of(symbols: List[str], lookahead: str) -> Set[str]:
+        result: Set[str] = set()
+        for symbol in symbols:
+            if symbol not in nonterminals:
+                result.add(symbol)
+                return result
+            result |= first[symbol]
+            if symbol not in nullable:
+                return result
+        result.add(lookahead)
+        return result
+
+    def closure(items: Set[Tuple[int, int, str]]) -> Set[Tuple[int, int, str]]:
+        result = set(items)
+        work = list(items)
+        while work:
+            prod, dot, lookahead = work.pop()
+            rhs = GRAMMAR[prod][1]
+            if dot >= len(rhs) or rhs[dot] not in nonterminals:
+                continue
+            for follow in first_of(rhs[dot + 1 :], lookahead):
+                for target in by_lhs[rhs[dot]]:
+                    item = (target, 0, follow)
+                    if item not in result:
+                        result.add(item)
+                        work.append(item)
+        return result
+
+    # LR(0) collection, identified by kernel.
+    start: FrozenSet[Item] = frozenset({(0, 0)})
+    kernels: List[FrozenSet[Item]] = [start]
+    state_of: Dict[FrozenSet[Item], int] = {start: 0}
+    transitions: List[Dict[str, int]] = []
+    for kernel in kernels:
+        moves: Dict[str, Set[Item]] = {}
+        for prod, dot, _ in closure({(p, d, "") for p, d in kernel}):
+            rhs = GRAMMAR[prod][1]
+            if dot < len(rhs):
+                moves.setdefault(rhs[dot], set()).add((prod, dot + 1))
+        row: Dict[str, int] = {}
+        for symbol in sorted(moves):
+            target = frozenset(moves[symbol])
+            if target not in state_of:
+                state_of[target] = len(kernels)
+                kernels.append(target)
+            row[symbol] = state_of[target]
+        transitions.append(row)
+
+    # LALR(1) lookaheads by spontaneous generation and propagation
+    # (Dragon book, algorithm 4.63).
+    probe = "#"
+    lookaheads: Dict[Tuple[int, Item], Set[str]] = {
+        (state, item): set() for state, kernel in enumerate(kernels) for item in kernel
+    }
+    lookaheads[(0, (0, 0))].add(END)
+    propagates: Dict[Tuple[int, Item], List[Tuple[int, Item]]] = {}
+    for state, kernel in enumerate(kernels):
+        for item in kernel:
+            targets = propagates.setdefault((state, item), [])
+            for prod, dot, lookahead in closure({(item[0], item[1], probe)}):
+                rhs = GRAMMAR[prod][1]
+                if dot >= len(rhs):
+                    continue
+                moved = (transitions[state][rhs[dot]], (prod, dot + 1))
+                if lookahead == probe:
+                    targets.append(moved)
+                else:
+                    lookaheads[moved].add(lookahead)
+    changed = True
+    while changed:
+        changed = False
+        for source, targets in propagates.items():
+            for target in targets:
+                before = len(lookaheads[target])
+                lookaheads[target] |= lookaheads[source]
+                changed |= len(lookaheads[target]) != before
+
+    action: List[Dict[str, int]] = [{} for _ in kernels]
+    goto: Dict[str, Dict[int, int]] = {symbol: {} for symbol in sorted(nonterminals)}
+    for state, kernel in enumerate(kernels):
+        row = action[state]
+        for symbol, target in transitions[state].items():
+            if symbol in nonterminals:
+                goto[symbol][state] = target
+            else:
+                _set_action(row, symbol, target)
+        items = closure(
+            {(prod, dot, la) for prod, dot in kernel for la in lookaheads[(state, (prod, dot))]}
+        )
+        for prod, dot, lookahead in sorted(items):
+            if dot == len(GRAMMAR[prod][1]):
+                _set_action(row, lookahead, ~prod)
+    return action, goto
+
+
+def _set_action(row: Dict[str, int], symbol: str, entry: int) -> None:
+    """Record an ACTION entry, resolving conflicts as yacc would.
+
+    Shift/reduce conflicts follow PRECEDENCE and default to shift, which
+    binds ``ELSE`` to the nearest ``IF``; reduce/reduce conflicts keep the
+    earlier production.
+    """
+    kind = token_kind(symbol)
+    existing = row.get(kind)
+    if existing is None or existing == entry:
+        row[kind] = entry
+        return
+    if existing < 0 and entry < 0:
+        row[kind] = max(existing, entry)  # ~p is larger for smaller p
+        return
+    shift, reduce = (existing, entry) if existing >= 0 else (entry, existing)
+    token_prec = PRECEDENCE.get(symbol)
+    rule_prec = production_precedence(~reduce)
+    if token_prec is None or rule_prec is None:
+        row[kind] = shift
+    elif token_prec[0] != rule_prec[0]:
+        row[kind] = shift if token_prec[0] > rule_prec[0] else reduce
+    else:
+        row[kind] = shift if token_prec[1] == "right" else reduce
+
+
+def render(action: List[Dict[str, int]], goto: Dict[str, Dict[int, int]]) -> str:
+    lines = [
+        "# Generated by table_gen.py from the parser_spec.md grammar. Do not edit.",
+        '"""LALR(1) tables for the exp_gemini parser.',
+        "",
+        "ACTION[state][token kind] is a shift target (>= 0), ~p to reduce by",
+        "production p, or ~0 to accept.  GOTO[nonterminal][state] is the state",
+        "entered after reducing to that nonterminal.",
+        '"""',
+        "",
+        "REDUCTIONS = (",
+    ]
+    lines += [f"    {reduction_text(index)!r},  # {index}" for index in range(len(GRAMMAR))]
+    lines += [")", "", "REDUCE_LHS = ("]
+    lines += [f"    {lhs!r}," for lhs, _ in GRAMMAR]
+    lines += [")", "", f"REDUCE_LENGTHS = {tuple(len(rhs) for _, rhs in GRAMMAR)!r}", "", "ACTION = ("]
+    for state, row in enumerate(action):
+        entries = ", ".join(f"{kind!r}: {row[kind]}" for kind in sorted(row))
+        lines.append(f"    {{{entries}}},  # {state}")
+    lines += [")", "", "GOTO = {"]
+    for symbol, targets in goto.items():
+        entries = ", ".join(f"{state}: {targets[state]}" for state in sorted(targets))
+        lines.append(f"    {symbol!r}: {{{entries}}},")
+    lines += ["}", ""]
+    return "\n".join(lines)
+
+
+def main(argv: List[str]) -> int:
+    output = pathlib.Path(argv[1]) if len(argv) > 1 else pathlib.Path(__file__).with_name("parser_tables.py")
+    action, goto = build_tables()
+    output.write_text(render(action, goto), encoding="utf-8")
+    print(f"{output}: {len(action)} states, {len(GRAMMAR)} productions", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))